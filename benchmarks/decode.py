@@ -0,0 +1,60 @@
+"""Benchmark JSON decoding and transfer size of the largest recorded responses.
+
+Reads the gzip compressed response bodies recorded in the test cassettes, and reports
+their size on the wire with each content encoding, and the time taken to decode them
+with each JSON backend.
+
+Usage:
+    python -m benchmarks.decode [number of cassettes]
+"""
+import gzip
+import sys
+import timeit
+import zlib
+from pathlib import Path
+
+import yaml
+
+from rundown import decoder
+
+CASSETTE_DIR = Path(__file__).resolve().parent.parent / "tests" / "cassettes"
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def recorded_bodies(n):
+    """Yield the name and decompressed body of the n largest cassettes."""
+    cassettes = sorted(CASSETTE_DIR.glob("*.yaml"), key=lambda p: -p.stat().st_size)
+    for path in cassettes[:n]:
+        with open(path) as f:
+            cassette = yaml.load(f, Loader=yaml.Loader)
+        body = cassette["interactions"][0]["response"]["body"]["string"]
+        yield path.stem, gzip.decompress(body)
+
+
+def main(n=5):
+    backends = sorted(decoder._backends)
+    header = f"{'cassette':<60}{'identity':>10}{'deflate':>10}{'gzip':>10}"
+    header += f"{'br':>10}" if brotli else ""
+    header += "".join(f"{b + ' ms':>12}" for b in backends)
+    print(header)
+
+    for name, body in recorded_bodies(n):
+        row = f"{name[:59]:<60}{len(body):>10}{len(zlib.compress(body)):>10}"
+        row += f"{len(gzip.compress(body)):>10}"
+        if brotli:
+            row += f"{len(brotli.compress(body)):>10}"
+        for b in backends:
+            loads = decoder._backends[b][0]
+            timer = timeit.Timer(lambda: loads(body))
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat=5, number=number)) / number
+            row += f"{best * 1000:>12.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,76 @@
+"""Benchmark the timezone conversion done by resource validators.
+
+Collects every timestamp validated by change_timezone in a recorded events response,
+and reports the time taken to convert them with Arrow, with change_timezone and an
+empty memo, and with change_timezone once the memo is warm. Also reports the time
+taken to parse the whole response.
+
+Usage:
+    python -m benchmarks.timezone [json file] [timezone]
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import arrow
+
+from rundown.lazy import _date_keys
+from rundown.resources.events import Events
+from rundown.resources.validators import _change_timezone, change_timezone
+from rundown.usercontext import user_context
+
+JSON_DIR = Path(__file__).resolve().parent.parent / "tests" / "json"
+DEFAULT_JSON = JSON_DIR / "TestRundown.test_events[MLB-2021-05-12-None-include5].json"
+
+
+def timestamps(obj):
+    """Yield the timestamps in decoded JSON that change_timezone validates."""
+    if isinstance(obj, list):
+        for v in obj:
+            yield from timestamps(v)
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            if k in _date_keys and isinstance(v, str):
+                yield v
+            else:
+                yield from timestamps(v)
+
+
+def best(func, setup=None):
+    """Best time in ms of func over several runs, calling setup before each."""
+    runs = []
+    for _ in range(5):
+        if setup:
+            setup()
+        runs.append(timeit.timeit(func, number=1))
+    return min(runs) * 1000
+
+
+def main(fname=DEFAULT_JSON, timezone="America/Phoenix"):
+    with open(fname) as f:
+        data = json.load(f)
+    dates = list(timestamps(data))
+    print(f"{Path(fname).name}: {len(dates)} timestamps, {len(set(dates))} unique")
+
+    def convert():
+        for d in dates:
+            change_timezone(d)
+
+    def parse():
+        Events(**data)
+
+    with user_context(timezone):
+        rows = [
+            ("arrow", best(lambda: [str(arrow.get(d).to(timezone)) for d in dates])),
+            ("change_timezone, cold", best(convert, _change_timezone.cache_clear)),
+            ("change_timezone, warm", best(convert)),
+            ("Events(**data), cold", best(parse, _change_timezone.cache_clear)),
+            ("Events(**data), warm", best(parse)),
+        ]
+    for name, ms in rows:
+        print(f"{name:<30}{ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
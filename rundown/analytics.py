@@ -0,0 +1,250 @@
+from typing import Optional
+
+from rundown.resources.event import SportsbookLinePeriods
+from rundown.resources.events import Events
+
+"""Module for vectorized odds math over the prices in Events.
+
+Prices are pulled into NumPy arrays shaped (event, affiliate, market, side), and the
+functions in this module operate on whole arrays at once. Prices that aren't published
+are masked. NumPy is an optional dependency, needed only by this module.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MARKETS = ("moneyline", "spread", "total")
+SIDES = ("away", "home", "draw")
+
+# Fields holding the price and the points of each side of each market. Totals use the
+# away and home sides for over and under. None marks sides a market doesn't have.
+_price_fields = {
+    "moneyline": ("moneyline_away", "moneyline_home", "moneyline_draw"),
+    "spread": ("point_spread_away_money", "point_spread_home_money", None),
+    "total": ("total_over_money", "total_under_money", None),
+}
+_point_fields = {
+    "moneyline": (None, None, None),
+    "spread": ("point_spread_away", "point_spread_home", None),
+    "total": ("total_over", "total_under", None),
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("rundown.analytics requires NumPy: pip install numpy")
+
+
+class OddsArrays:
+    """Prices and points of a set of events, as masked arrays.
+
+    Both arrays are shaped (event, affiliate, market, side), indexed by event_ids,
+    affiliates, MARKETS and SIDES. Entries for missing lines, unpublished prices, and
+    sides a market doesn't have are masked.
+
+    Attributes:
+        event_ids (list[str]): Event IDs, in the order of the events.
+        affiliates (list[str]): Sportsbook names, in order of first appearance.
+        prices (numpy.ma.MaskedArray): American odds.
+        points (numpy.ma.MaskedArray): Point spreads and totals. Moneylines are masked.
+
+    Some sportsbooks send moneyline_draw for sports without draws, so use
+    prices[..., :2] for two-way markets.
+    """
+
+    def __init__(self, event_ids: list[str], affiliates: list[str], prices, points):
+        self.event_ids = event_ids
+        self.affiliates = affiliates
+        self.prices = prices
+        self.points = points
+
+    @property
+    def shape(self) -> tuple[int, int, int, int]:
+        return self.prices.shape
+
+    def market(self, market: str) -> int:
+        """Index of market on the market axis."""
+        return MARKETS.index(market)
+
+    def affiliate(self, affiliate: str) -> int:
+        """Index of a sportsbook on the affiliate axis."""
+        return self.affiliates.index(affiliate)
+
+
+def odds_arrays(
+    events: Events,
+    period: Optional[str] = None,
+    affiliates: Optional[list[str]] = None,
+) -> OddsArrays:
+    """Pull the prices of events into arrays.
+
+    Args:
+        events: The events, such as those returned by Rundown.events.
+        period: None for the lines in Event.lines, or a period such as
+            'period_full_game' for the lines in Event.line_periods.
+        affiliates: Sportsbook names to include, in the order wanted. By default every
+            sportsbook with lines for any of the events.
+
+    Raises:
+        ValueError: If period isn't a SportsbookLinePeriods field.
+
+    Returns:
+        OddsArrays holding the prices and points.
+    """
+    _require_numpy()
+    if period is not None and period not in SportsbookLinePeriods.__fields__:
+        raise ValueError(f"{period!r} is not a period of SportsbookLinePeriods.")
+
+    books = []
+    for event in events.events:
+        by_affiliate = (event.line_periods if period else event.lines) or {}
+        if period:
+            by_affiliate = {a: getattr(lp, period) for a, lp in by_affiliate.items()}
+        books.append(by_affiliate)
+    if affiliates is None:
+        affiliates = list(dict.fromkeys(a for book in books for a in book))
+    affiliate_index = {a: i for i, a in enumerate(affiliates)}
+
+    n_markets, n_sides = len(MARKETS), len(SIDES)
+    shape = (len(books), len(affiliates), n_markets, n_sides)
+    # Collect flat indices and values, and fill the arrays with one assignment each.
+    price_index, price_values = [], []
+    point_index, point_values = [], []
+    for e, book in enumerate(books):
+        for affiliate, lines in book.items():
+            a = affiliate_index.get(affiliate)
+            if a is None or lines is None:
+                continue
+            base = (e * len(affiliates) + a) * n_markets
+            for m, market in enumerate(MARKETS):
+                line = getattr(lines, market)
+                if line is None:
+                    continue
+                offset = (base + m) * n_sides
+                for s in range(n_sides):
+                    price_field = _price_fields[market][s]
+                    price = price_field and getattr(line, price_field)
+                    if price is not None:
+                        price_index.append(offset + s)
+                        price_values.append(price)
+                    point_field = _point_fields[market][s]
+                    point = point_field and getattr(line, point_field)
+                    if point is not None:
+                        point_index.append(offset + s)
+                        point_values.append(point)
+
+    return OddsArrays(
+        [event.event_id for event in events.events],
+        affiliates,
+        _masked(shape, price_index, price_values),
+        _masked(shape, point_index, point_values),
+    )
+
+
+def _masked(shape: tuple, index: list[int], values: list[float]):
+    data = np.zeros(shape, dtype=np.float64)
+    mask = np.ones(shape, dtype=bool)
+    data.flat[index] = values
+    mask.flat[index] = False
+    return np.ma.MaskedArray(data, mask=mask)
+
+
+def implied_probability(american):
+    """Implied probability of American odds.
+
+    Args:
+        american: American odds, as an array or masked array. Odds strictly between
+            -100 and 100 aren't valid, and are masked.
+
+    Returns:
+        numpy.ma.MaskedArray: Probabilities, including the sportsbook's vig.
+    """
+    _require_numpy()
+    american = np.ma.asarray(american, dtype=np.float64)
+    american = np.ma.masked_where(abs(american) < 100, american)
+    favourite = american < 0
+    return np.ma.where(favourite, -american / (100 - american), 100 / (american + 100))
+
+
+def overround(probabilities, axis: int = -1):
+    """Amount by which the implied probabilities of a market sum to more than 1.
+
+    Markets with fewer than two sides priced are masked.
+
+    Args:
+        probabilities: Implied probabilities, with the sides of each market on axis.
+        axis: The side axis.
+
+    Returns:
+        numpy.ma.MaskedArray: The overround of each market, with axis removed.
+    """
+    _require_numpy()
+    probabilities = np.ma.asarray(probabilities)
+    total = probabilities.sum(axis=axis)
+    priced = probabilities.count(axis=axis)
+    return np.ma.masked_where(priced < 2, total - 1)
+
+
+def remove_vig(probabilities, axis: int = -1, method: str = "multiplicative"):
+    """Fair probabilities of each side of a market, with the vig removed.
+
+    Args:
+        probabilities: Implied probabilities, with the sides of each market on axis.
+        axis: The side axis.
+        method: 'multiplicative' scales the probabilities so they sum to 1. 'additive'
+            subtracts an equal share of the overround from each side.
+
+    Raises:
+        ValueError: If method isn't 'multiplicative' or 'additive'.
+
+    Returns:
+        numpy.ma.MaskedArray: Fair probabilities, masked for markets with fewer than
+            two sides priced.
+    """
+    _require_numpy()
+    probabilities = np.ma.asarray(probabilities)
+    over = np.ma.expand_dims(overround(probabilities, axis), axis)
+    if method == "multiplicative":
+        fair = probabilities / (over + 1)
+    elif method == "additive":
+        priced = np.expand_dims(probabilities.count(axis=axis), axis)
+        fair = probabilities - over / priced
+    else:
+        raise ValueError("method must be 'multiplicative' or 'additive'.")
+    return np.ma.masked_where(np.ma.getmaskarray(over) | fair.mask, fair)
+
+
+def to_american(probabilities):
+    """American odds with the given probabilities of winning.
+
+    Args:
+        probabilities: Probabilities between 0 and 1. Others are masked.
+
+    Returns:
+        numpy.ma.MaskedArray: American odds.
+    """
+    _require_numpy()
+    p = np.ma.asarray(probabilities, dtype=np.float64)
+    p = np.ma.masked_where((p <= 0) | (p >= 1), p)
+    return np.ma.where(p >= 0.5, -100 * p / (1 - p), 100 * (1 - p) / p)
+
+
+def fair_price(american, axis: int = -1, method: str = "multiplicative"):
+    """No-vig American odds of each side of a market.
+
+    Example:
+        odds = odds_arrays(r.events("MLB", "2021-05-11"))
+        fair = fair_price(odds.prices)
+        pinnacle_ml = fair[:, odds.affiliate("Pinnacle"), odds.market("moneyline")]
+
+    Args:
+        american: American odds, with the sides of each market on axis.
+        axis: The side axis.
+        method: How the vig is removed. See remove_vig.
+
+    Returns:
+        numpy.ma.MaskedArray: Fair American odds.
+    """
+    return to_american(remove_vig(implied_probability(american), axis, method))
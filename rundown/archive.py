@@ -0,0 +1,226 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal, Optional, Union
+
+from rundown.export import _event_columns, _require, _to_arrow, events_columns
+
+"""Module for archiving events to a Parquet dataset partitioned by sport and date."""
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
+
+Kind = Literal["events", "opening_lines", "closing_lines", "events_delta"]
+
+# Columns written to Parquet with dictionary encoding.
+_dictionary_columns = [
+    "kind",
+    "away_team",
+    "home_team",
+    "period",
+    "affiliate_name",
+]
+
+
+def _utc_date(event_date: str) -> str:
+    dt = datetime.fromisoformat(event_date)
+    return dt.astimezone(timezone.utc).date().isoformat()
+
+
+class ParquetArchive:
+    """Thread-safe writer appending events to a partitioned Parquet dataset.
+
+    Rows are those of export.events_columns, plus the kind of response they came from
+    and the time they were captured. They are buffered per partition, and written as
+    a new file once a partition has row_group_size rows, once its oldest buffered rows
+    are max_buffer_age seconds old, or on flush. The age is checked on each write, so
+    while writes keep coming, at most max_buffer_age seconds of rows are lost if the
+    process dies. Rows stay buffered if writing their file fails, and are retried by
+    the next flush.
+
+    Files are laid out as root/sport_id=<id>/date=<UTC event date>/part-*.parquet, so
+    the archive can be read with pyarrow.dataset.dataset(root, partitioning='hive').
+    compact merges the small files of each partition.
+
+    Example:
+        with ParquetArchive("archive") as archive:
+            for events in DeltaPoller(r, ["NBA"]):
+                archive.write(events, "events_delta")
+
+    Args:
+        root: Directory of the dataset. It is created if it doesn't exist.
+        row_group_size: Number of rows per row group, and the number of buffered rows
+            of a partition that triggers a write.
+        max_buffer_age: Seconds after which the buffered rows of a partition are
+            written by the next write, whatever their number. None for no limit.
+        compression: Parquet compression codec.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        row_group_size: int = 50_000,
+        max_buffer_age: Optional[float] = 60,
+        compression: str = "zstd",
+    ):
+        _require(pa, "pyarrow")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.max_buffer_age = max_buffer_age
+        self.compression = compression
+        self._buffers: dict[tuple[int, str], list] = {}
+        self._buffered_rows: dict[tuple[int, str], int] = {}
+        # Monotonic time the oldest buffered rows of each partition were added.
+        self._buffered_since: dict[tuple[int, str], float] = {}
+        self._lock = threading.Lock()
+
+    def write(
+        self, events: Any, kind: Kind = "events", captured_at: Optional[float] = None
+    ):
+        """Add the rows of events to the archive.
+
+        Args:
+            events: resources.Events returned by events, opening_lines, closing_lines
+                or events_delta, with any parse mode.
+            kind: The method events were returned by.
+            captured_at: Epoch time the events were captured. Defaults to now.
+        """
+        data = events_columns(events)
+        n_rows = len(data["event_id"])
+        if not n_rows:
+            return
+        table = _to_arrow(_event_columns, data)
+        captured_at = time.time() if captured_at is None else captured_at
+        table = table.append_column(
+            "kind", pa.array([kind] * n_rows, pa.dictionary(pa.int32(), pa.string()))
+        ).append_column(
+            "captured_at",
+            pa.array(
+                [int(captured_at * 1_000_000)] * n_rows, pa.timestamp("us", tz="UTC")
+            ),
+        )
+
+        # Rows of an event are contiguous, so partition them per event.
+        partitions = {}
+        dates = {}
+        for i, (sport_id, event_date) in enumerate(
+            zip(data["sport_id"], data["event_date"])
+        ):
+            if event_date not in dates:
+                dates[event_date] = _utc_date(event_date)
+            partitions.setdefault((sport_id, dates[event_date]), []).append(i)
+
+        with self._lock:
+            now = time.monotonic()
+            # Every row is buffered before any file is written, so a failed write
+            # leaves the rows of the other partitions buffered too.
+            for key, rows in partitions.items():
+                self._buffers.setdefault(key, []).append(table.take(rows))
+                self._buffered_rows[key] = self._buffered_rows.get(key, 0) + len(rows)
+                self._buffered_since.setdefault(key, now)
+            for key in list(self._buffers):
+                full = self._buffered_rows[key] >= self.row_group_size
+                old = (
+                    self.max_buffer_age is not None
+                    and now - self._buffered_since[key] >= self.max_buffer_age
+                )
+                if full or old:
+                    self._flush_partition(key)
+
+    def flush(self):
+        """Write every buffered row."""
+        with self._lock:
+            for key in list(self._buffers):
+                self._flush_partition(key)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> "ParquetArchive":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def partition_dir(self, sport_id: int, date: str) -> Path:
+        """Directory of the files of a partition."""
+        return self.root / f"sport_id={sport_id}" / f"date={date}"
+
+    def compact(self, min_file_size: int = 8 * 1024 * 1024) -> int:
+        """Merge the small files of each partition into one file.
+
+        Buffered rows are written first. Files smaller than min_file_size bytes are
+        read and rewritten as a single file, which replaces them. Partitions with
+        fewer than two small files are left alone.
+
+        Returns:
+            The number of files removed.
+        """
+        self.flush()
+        removed = 0
+        with self._lock:
+            for partition in self.root.glob("sport_id=*/date=*"):
+                small = [
+                    f
+                    for f in sorted(partition.glob("*.parquet"))
+                    if f.stat().st_size < min_file_size
+                ]
+                if len(small) < 2:
+                    continue
+                # Read the files alone, without the columns of the partition path.
+                table = pa.concat_tables(pq.ParquetFile(f).read() for f in small)
+                self._write_file(partition, table, prefix="compacted")
+                # The compacted file is in place before the small files are removed,
+                # so an interrupted compaction duplicates rows rather than losing them.
+                for f in small:
+                    f.unlink()
+                removed += len(small)
+        return removed
+
+    def read(self, filter: Optional[Any] = None) -> "pa.Table":
+        """Read the archive, or the rows matching a pyarrow.dataset filter expression.
+
+        Buffered rows are not included until they are flushed.
+        """
+        dataset = ds.dataset(self.root, format="parquet", partitioning="hive")
+        return dataset.to_table(filter=filter)
+
+    def _flush_partition(self, key: tuple[int, str]):
+        tables = self._buffers.get(key)
+        if tables:
+            table = pa.concat_tables(tables).drop_columns(["sport_id"])
+            self._write_file(self.partition_dir(*key), table)
+        # The rows are only dropped once written, so a failed write can be retried.
+        self._buffers.pop(key, None)
+        self._buffered_rows.pop(key, None)
+        self._buffered_since.pop(key, None)
+
+    def _write_file(self, partition: Path, table: "pa.Table", prefix: str = "part"):
+        partition.mkdir(parents=True, exist_ok=True)
+        name = f"{prefix}-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+        # Dataset readers skip files starting with '.', so the file is only seen once
+        # it is complete.
+        tmp = partition / f".{name}"
+        try:
+            pq.write_table(
+                table,
+                tmp,
+                row_group_size=self.row_group_size,
+                compression=self.compression,
+                use_dictionary=_dictionary_columns,
+            )
+            os.replace(tmp, partition / name)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
@@ -0,0 +1,562 @@
+from typing import Any, Union, Optional, Literal
+from collections.abc import AsyncIterator, Callable, Iterable
+import asyncio
+from functools import wraps
+
+import httpx
+
+from rundown import decoder, stream
+from rundown.rundown import _ClientBase
+from rundown.cache import ResponseCache
+from rundown.modelcache import ModelCache
+from rundown.store import HistoricalStore
+from rundown.retry import RetryPolicy
+from rundown.ratelimit import FileTokenBucket, TokenBucket
+from rundown.resources.sportsbook import Sportsbook
+from rundown.resources.sport import Sport
+from rundown.resources.date import Date, Epoch
+from rundown.resources.team import BaseTeam
+from rundown.resources.events import Events
+from rundown.resources.event import Event
+from rundown.resources.line import Moneyline, Spread, Total
+from rundown.resources.lineperiods import LinePeriods
+from rundown.resources.schedule import Schedule
+from rundown.usercontext import user_context
+from rundown.singleflight import AsyncSingleFlight
+from rundown.stream import AsyncEventStream
+
+"""Module containing the asyncio client for the Rundown API."""
+
+
+def _with_timezone_context(f: Callable) -> Callable:
+    """Decorator for coroutine methods that use self.timezone.
+
+    The timezone is set for the duration of the awaited call, so concurrent calls made
+    from different tasks each parse their response with their own timezone.
+
+    Args:
+        f: The coroutine function being given timezone context.
+
+    Returns:
+        The wrapped coroutine function with timezone context.
+    """
+
+    @wraps(f)
+    async def inner(self, *args, **kwargs):
+        offset = kwargs["offset"] if "offset" in kwargs else None
+        with user_context(self._context_timezone(offset)):
+            return await f(self, *args, **kwargs)
+
+    return inner
+
+
+class AsyncRundown(_ClientBase):
+    """The Rundown REST API client for use with asyncio.
+
+    Has the same methods as Rundown, except they are coroutines. Responses are parsed
+    into the same resources. Identical requests made at the same time from different
+    tasks share a single round-trip and parsed result, as with Rundown.
+
+    Args:
+        api_key: The API key to use.
+        api_provider: The API provider. Must be either 'rundown' or 'rapidapi'
+            (case insensitive).
+        timezone: Your preferred timezone. See Rundown for accepted formats.
+        max_connections: Maximum number of concurrent connections to the API.
+        cache: Optional cache for API responses. See rundown.cache.ResponseCache.
+        store: Optional on-disk store for responses that never change. See
+            rundown.store.HistoricalStore.
+        retry: When to retry failed requests. See Rundown.
+        timeout: Seconds to wait for the server to respond.
+        max_keepalive_connections: Maximum number of idle connections kept alive.
+        keepalive_expiry: Seconds an idle connection is kept alive for.
+        rate_limiter: Whether to limit the rate of requests. See Rundown.
+        model_cache: Optional cache of parsed events. See Rundown.
+
+    Example:
+        async with AsyncRundown(api_key, timezone="US/Pacific") as r:
+            nba, mlb = await asyncio.gather(
+                r.events("NBA", "2021-05-11"), r.events("MLB", "2021-05-11")
+            )
+
+    Attributes:
+        sport_names (dict[str, int]): Sports names and their IDs.
+        timezone (str): Your preferred timezone.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_provider: Literal["rapidapi", "rundown"] = "rapidapi",
+        timezone: str = "local",
+        max_connections: int = 100,
+        cache: Optional[ResponseCache] = None,
+        store: Optional[HistoricalStore] = None,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float = 30,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5,
+        rate_limiter: Union[bool, TokenBucket] = False,
+        model_cache: Optional[ModelCache] = None,
+    ):
+        super().__init__(
+            api_key,
+            api_provider,
+            timezone,
+            cache,
+            store,
+            retry,
+            rate_limiter,
+            model_cache,
+        )
+        self._singleflight = AsyncSingleFlight()
+        self._client = httpx.AsyncClient(
+            headers={**self._auth.headers, "Accept-Encoding": decoder.ACCEPT_ENCODING},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncRundown":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def _rate_limit(self, method, *args):
+        """Call a method of the rate limiter.
+
+        FileTokenBucket locks and reads a file, so it is called in a thread to keep
+        the event loop free.
+        """
+        if isinstance(self._rate_limiter, FileTokenBucket):
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def _with_store(self, method, *args):
+        """Call a method that may read or write the store.
+
+        HistoricalStore queries SQLite and compresses responses, so with a store the
+        method is called in a thread to keep the event loop free.
+        """
+        if self._store is not None:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def _get(
+        self, url: str, stream: bool = False, **params: Union[str, int, list[str]]
+    ) -> httpx.Response:
+        """Make get request, retrying according to the retry policy.
+
+        If stream is True, the response body is not downloaded until it is read, and
+        the response must be closed.
+
+        Raises:
+            httpx.HTTPStatusError: If the response still has a retryable status code,
+                such as 429 or 502, when no retries are left or Retry-After asks for a
+                longer wait than the policy allows.
+            httpx.TransportError: If the last attempt failed to connect or timed out.
+        """
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                await asyncio.sleep(await self._rate_limit(self._rate_limiter.reserve))
+            try:
+                request = self._client.build_request("GET", url, params=params)
+                res = await self._client.send(request, stream=stream)
+            except httpx.TransportError:
+                if not self._retry.can_retry(attempt):
+                    raise
+                delay = self._retry.backoff(attempt)
+            else:
+                if self._rate_limiter is not None:
+                    await self._rate_limit(self._rate_limiter.update, res.headers)
+                if res.status_code not in self._retry.status_forcelist:
+                    return res
+                if not self._retry.can_retry(attempt):
+                    res.raise_for_status()
+                delay = self._retry.backoff(attempt, res.headers.get("Retry-After"))
+                if delay is None:
+                    # The server asked to wait longer than the policy allows.
+                    res.raise_for_status()
+                await res.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _build_url_and_get_json(
+        self, *segments: Union[str, int], **params: Union[str, int, list[str]]
+    ) -> dict:
+        """Build URL from segments and make get request to API."""
+        url = self._build_url(*segments)
+        params = self._clean_params(**params)
+        # Identical concurrent requests share a single round-trip.
+        self._json = await self._singleflight.do(
+            ("json", ResponseCache.key(url, params)),
+            lambda: self._fetch_json(segments, url, params),
+        )
+        return self._json
+
+    async def _fetch_json(
+        self, segments: tuple[Union[str, int], ...], url: str, params: dict
+    ) -> dict:
+        """Get the response from the cache or the store, or else from the API."""
+        data = await self._with_store(self._get_cached_json, segments, url, params)
+        if data is None:
+            res = await self._get(url, **params)
+            data = decoder.loads(res.content)
+            await self._with_store(self._cache_json, segments, url, params, data)
+        return data
+
+    async def _get_events(
+        self,
+        sport: Union[int, str],
+        lines_type: str,
+        date: str,
+        offset: Optional[int],
+        *include: Literal["all_periods", "scores"],
+    ) -> dict:
+        offset = self._validate_offset(offset)
+        sport_id = self._validate_sport(sport)
+        data = await self._build_url_and_get_json(
+            "sports", sport_id, lines_type, date, offset=offset, include=include
+        )
+        return data
+
+    async def _get_and_parse_events(
+        self,
+        sport: Union[int, str],
+        lines_type: str,
+        date: str,
+        offset: Optional[int],
+        *include: Literal["all_periods", "scores"],
+        parse: str = "full",
+    ) -> Events:
+        """Get and parse events. Identical concurrent calls share one Events object."""
+
+        async def get_and_parse():
+            data = await self._get_events(sport, lines_type, date, offset, *include)
+            return self._parse_events(data, parse)
+
+        key = self._events_key(sport, lines_type, date, offset, *include, parse=parse)
+        return await self._singleflight.do(key, get_and_parse)
+
+    def _iter_events(
+        self,
+        sport: Union[int, str],
+        lines_type: str,
+        date: str,
+        offset: Optional[int],
+        *include: Literal["all_periods", "scores"],
+    ) -> AsyncEventStream:
+        """Stream events, which are parsed in the timezone given by offset."""
+        timezone = self._context_timezone(offset)
+        offset = self._validate_offset(offset)
+        sport_id = self._validate_sport(sport)
+        segments = ("sports", sport_id, lines_type, date)
+        params = self._clean_params(offset=offset, include=include)
+        return AsyncEventStream(self._stream_json(segments, params), timezone)
+
+    async def _stream_json(
+        self, segments: tuple[Union[str, int], ...], params: dict
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Parse the response incrementally, unless it is cached or stored. See
+        Rundown._stream_json.
+        """
+        url = self._build_url(*segments)
+        data = await self._with_store(self._get_cached_json, segments, url, params)
+        if data is not None:
+            for item in stream.dict_items(data):
+                yield item
+            return
+        res = await self._get(url, stream=True, **params)
+        try:
+            async for item in stream.aiter_items(res.aiter_bytes(stream.CHUNK_SIZE)):
+                yield item
+        finally:
+            await res.aclose()
+
+    async def sports(
+        self, *, parse: Literal["full", "lazy", "raw"] = "full"
+    ) -> list[Sport]:
+        """Get available sports. See Rundown.sports.
+
+        GET /sports
+        """
+        data = await self._build_url_and_get_json("sports")
+        return self._parse_sports(data, parse)
+
+    @_with_timezone_context
+    async def dates(
+        self,
+        sport: Union[int, str],
+        *,
+        offset: Optional[int] = None,
+        format: Literal["date", "epoch"] = "date",
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> list[Union[Date, Epoch]]:
+        """Get dates with odds for future events. See Rundown.dates.
+
+        GET /sports/<sport-id>/dates
+        """
+        offset = self._validate_offset(offset)
+        sport_id = self._validate_sport(sport)
+
+        data = await self._build_url_and_get_json(
+            "sports", sport_id, "dates", offset=offset, format=format
+        )
+        return self._parse_dates(data, format, parse)
+
+    async def sportsbooks(
+        self, *, parse: Literal["full", "lazy", "raw"] = "full"
+    ) -> list[Sportsbook]:
+        """Get available sportsbooks. See Rundown.sportsbooks.
+
+        GET /affiliates
+        """
+        data = await self._build_url_and_get_json("affiliates")
+        return self._parse_sportsbooks(data, parse)
+
+    async def teams(
+        self, sport: Union[int, str], *, parse: Literal["full", "lazy", "raw"] = "full"
+    ) -> list[BaseTeam]:
+        """Get teams for the league referenced by sport id. See Rundown.teams.
+
+        GET /sports/<sport-id>/teams
+        """
+        sport_id = self._validate_sport(sport)
+        data = await self._build_url_and_get_json("sports", sport_id, "teams")
+        return self._parse_teams(data, parse)
+
+    @_with_timezone_context
+    async def events(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Events:
+        """Get events by sport by date. See Rundown.events.
+
+        GET /sports/<sport-id>/events/<date>
+        """
+        return await self._get_and_parse_events(
+            sport, "events", date, offset, *include, parse=parse
+        )
+
+    async def events_many(
+        self,
+        sports: Iterable[Union[int, str]],
+        dates: Iterable[str],
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+        max_concurrency: int = 10,
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> dict[tuple[int, str], Union[Events, Exception]]:
+        """Get events for every combination of sports and dates concurrently. See
+        Rundown.events_many.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded_events(sport_id, date):
+            async with semaphore:
+                return await self.events(
+                    sport_id, date, *include, offset=offset, parse=parse
+                )
+
+        dates = list(dates)
+        keys = [(self._validate_sport(s), d) for s in sports for d in dates]
+        results = await asyncio.gather(
+            *[bounded_events(*k) for k in keys], return_exceptions=True
+        )
+        return dict(zip(keys, results))
+
+    @_with_timezone_context
+    async def opening_lines(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Events:
+        """Get events with opening lines by sport by date. See Rundown.opening_lines.
+
+        GET /sports/<sport-id>/openers/<date>
+        """
+        return await self._get_and_parse_events(
+            sport, "openers", date, offset, *include, parse=parse
+        )
+
+    @_with_timezone_context
+    async def closing_lines(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Events:
+        """Get events with closing lines by sport by date. See Rundown.closing_lines.
+
+        GET /sports/<sport-id>/closing/<date>
+        """
+        return await self._get_and_parse_events(
+            sport, "closing", date, offset, *include, parse=parse
+        )
+
+    def iter_events(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+    ) -> AsyncEventStream:
+        """Iterate over events by sport by date, parsing each event as it is downloaded.
+        See Rundown.iter_events.
+
+        GET /sports/<sport-id>/events/<date>
+
+        Example:
+            async with r.iter_events("MLB", "2021-05-11", "all_periods") as events:
+                async for event in events:
+                    ...
+        """
+        return self._iter_events(sport, "events", date, offset, *include)
+
+    def iter_opening_lines(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+    ) -> AsyncEventStream:
+        """Iterate over events with opening lines by sport by date. See
+        Rundown.iter_events.
+
+        GET /sports/<sport-id>/openers/<date>
+        """
+        return self._iter_events(sport, "openers", date, offset, *include)
+
+    def iter_closing_lines(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+    ) -> AsyncEventStream:
+        """Iterate over events with closing lines by sport by date. See
+        Rundown.iter_events.
+
+        GET /sports/<sport-id>/closing/<date>
+        """
+        return self._iter_events(sport, "closing", date, offset, *include)
+
+    @_with_timezone_context
+    async def events_delta(
+        self,
+        last_id: int,
+        *include: Literal["all_periods", "scores"],
+        sport: Optional[Union[int, str]] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Optional[Events]:
+        """Get events that have changed since request specified by last_id. See
+        Rundown.events_delta.
+
+        GET /delta?last_id=<delta-last-id>
+        """
+        sport_id = self._validate_sport(sport)
+        data = await self._build_url_and_get_json(
+            "delta", last_id=last_id, sport_id=sport_id, include=include
+        )
+        return self._parse_events_delta(data, parse)
+
+    @_with_timezone_context
+    async def event(
+        self,
+        event_id: str,
+        *include: Literal["all_periods", "scores"],
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Optional[Event]:
+        """Get event by event id. See Rundown.event.
+
+        GET /events/<event-id>
+        """
+        data = await self._build_url_and_get_json("events", event_id, include=include)
+        return self._parse_event(data, parse)
+
+    @_with_timezone_context
+    async def moneyline(
+        self,
+        line_id: int,
+        *include: Literal["all_periods", "scores"],
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Optional[Union[list[Moneyline], LinePeriods]]:
+        """Get line history for moneyline referenced by line_id. See Rundown.moneyline.
+
+        GET /lines/<line-id>/moneyline
+        """
+        data = await self._build_url_and_get_json(
+            "lines", line_id, "moneyline", include=include
+        )
+        return self._parse_lines(data, "moneyline", include, parse)
+
+    @_with_timezone_context
+    async def spread(
+        self,
+        line_id: int,
+        *include: Literal["all_periods", "scores"],
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Optional[Union[list[Spread], LinePeriods]]:
+        """Get line history for spread referenced by line_id. See Rundown.spread.
+
+        GET /lines/<line-id>/spread
+        """
+        data = await self._build_url_and_get_json(
+            "lines", line_id, "spread", include=include
+        )
+        return self._parse_lines(data, "spread", include, parse)
+
+    @_with_timezone_context
+    async def total(
+        self,
+        line_id: int,
+        *include: Literal["all_periods", "scores"],
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> Optional[Union[list[Total], LinePeriods]]:
+        """Get line history for total referenced by line_id. See Rundown.total.
+
+        GET /lines/<line-id>/total
+        """
+        data = await self._build_url_and_get_json(
+            "lines", line_id, "total", include=include
+        )
+        return self._parse_lines(data, "total", include, parse)
+
+    @_with_timezone_context
+    async def schedule(
+        self,
+        sport: Union[int, str],
+        date_from: Optional[str] = None,
+        limit: Optional[int] = 50,
+        *,
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> list[Schedule]:
+        """Get schedule for league referenced by sport. See Rundown.schedule.
+
+        GET /sports/<sport-id>/schedule
+        """
+        sport_id = self._validate_sport(sport)
+
+        # 'from' is a reserved keyword in Python, so use dict.
+        data = await self._build_url_and_get_json(
+            "sports", sport_id, "schedule", **{"from": date_from, "limit": limit}
+        )
+        return self._parse_schedule(data, parse)
@@ -0,0 +1,315 @@
+import json
+import threading
+import time
+from collections import namedtuple
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Literal, Optional, Union
+
+import arrow
+
+from rundown.ratelimit import TokenBucket
+
+"""Module for resumable backfills of historical events over ranges of dates."""
+
+Kind = Literal["events", "opening_lines", "closing_lines"]
+
+WorkUnit = namedtuple("WorkUnit", ["kind", "sport_id", "date"])
+BackfillProgress = namedtuple(
+    "BackfillProgress", ["done", "failed", "skipped", "total", "elapsed", "rate", "eta"]
+)
+BackfillReport = namedtuple(
+    "BackfillReport", ["done", "skipped", "failures", "elapsed"]
+)
+
+_kinds = ("events", "opening_lines", "closing_lines")
+
+
+class Manifest:
+    """Append-only record of the completed work units of a backfill.
+
+    Each completed unit is a JSON line, so recording one costs the same however many
+    are recorded, and a line cut short by a crash is ignored when loading. Units are
+    keyed along with the include parameters and the UTC offset in minutes, so a
+    backfill with other parameters, or for another timezone, doesn't skip them.
+
+    Args:
+        path: Path of the manifest file. It is created if it doesn't exist.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.completed = set()
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        unit = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.completed.add(self._key(unit))
+
+    @staticmethod
+    def _key(unit: dict) -> tuple:
+        return (
+            unit["kind"],
+            unit["sport_id"],
+            unit["date"],
+            tuple(sorted(unit["include"])),
+            unit["offset"],
+        )
+
+    def _unit(
+        self, unit: WorkUnit, include: tuple[str, ...], offset: int
+    ) -> dict:
+        return {**unit._asdict(), "include": sorted(include), "offset": offset}
+
+    def __contains__(
+        self, item: tuple[WorkUnit, tuple[str, ...], int]
+    ) -> bool:
+        unit, include, offset = item
+        return self._key(self._unit(unit, include, offset)) in self.completed
+
+    def record(
+        self,
+        units: Iterable[WorkUnit],
+        include: tuple[str, ...],
+        offset: int,
+    ):
+        """Record units as completed, requested with include and a UTC offset."""
+        lines = []
+        with self._lock:
+            for unit in units:
+                d = self._unit(unit, include, offset)
+                self.completed.add(self._key(d))
+                lines.append(json.dumps(d) + "\n")
+            with open(self.path, "a") as f:
+                f.writelines(lines)
+                f.flush()
+
+
+def plan(
+    sport_ids: Iterable[int],
+    start_date: str,
+    end_date: str,
+    kinds: Iterable[Kind] = ("closing_lines",),
+) -> list[WorkUnit]:
+    """Get the work units for every kind, sport and date from start_date to end_date.
+
+    Units are ordered by date, so a partial backfill covers a contiguous range.
+
+    Raises:
+        ValueError: If a kind isn't valid, a date isn't in ISO 8601 format
+            ('YYYY-MM-DD'), or end_date is before start_date.
+    """
+    kinds, sport_ids = list(kinds), list(sport_ids)
+    for kind in kinds:
+        if kind not in _kinds:
+            raise ValueError(f"{kind!r} is not one of {_kinds}.")
+    try:
+        start = arrow.get(start_date, "YYYY-MM-DD")
+        end = arrow.get(end_date, "YYYY-MM-DD")
+    except arrow.parser.ParserError as e:
+        raise ValueError(f"Dates must be in 'YYYY-MM-DD' format: {e}") from None
+    if end < start:
+        raise ValueError("end_date must not be before start_date.")
+    return [
+        WorkUnit(kind, sport_id, day.format("YYYY-MM-DD"))
+        for day in arrow.Arrow.range("day", start, end)
+        for sport_id in sport_ids
+        for kind in kinds
+    ]
+
+
+class Backfill:
+    """Resumable, concurrent backfill of historical events.
+
+    The date grid is planned up front, as one work unit per kind, sport and date.
+    Units are requested by a pool of threads, at most max_concurrency at once, and no
+    faster than rate requests per second. Results are passed to the sink from the
+    calling thread as they complete. Units that are written to the sink are recorded in
+    the manifest, and units in the manifest are skipped, so an interrupted backfill
+    resumes where it stopped. Failed units aren't recorded, and are retried by the
+    next run.
+
+    If the sink has a flush method, such as ParquetArchive, it is called before units
+    are recorded, every checkpoint_every units, so recorded units are never lost with
+    the sink's buffers.
+
+    Example:
+        archive = ParquetArchive("archive")
+        report = Backfill(
+            r, ["MLB", "NBA"], "2019-01-01", "2021-12-31", "all_periods",
+            sink=archive, manifest="backfill.jsonl", rate=5,
+            progress=lambda p: print(f"{p.done}/{p.total} ETA {p.eta:.0f}s"),
+        ).run()
+
+    Args:
+        rundown: The Rundown client used to make requests.
+        sports: IDs or names of the leagues to backfill.
+        start_date: First date, in ISO 8601 format ('YYYY-MM-DD').
+        end_date: Last date, included.
+        include: Any of 'all_periods' and 'scores'. See Rundown.events.
+        kinds: The methods to call: any of 'events', 'opening_lines' and
+            'closing_lines'.
+        sink: Called with the Events and kind of each unit, either a callable or an
+            object with a write(events, kind) method, such as ParquetArchive.
+        manifest: Path of the manifest file, or a Manifest. Without one, the backfill
+            can't be resumed.
+        max_concurrency: Maximum number of requests in flight at once.
+        rate: Maximum requests per second, or a TokenBucket shared with other
+            clients. Unlimited if None.
+        offset: UTC offset in minutes. See Rundown.events. Defaults to the offset of
+            the timezone of rundown when the backfill is created.
+        parse: 'full', 'lazy' or 'raw'. See Rundown.events.
+        checkpoint_every: Number of completed units between flushes of the sink.
+        progress: Called with a BackfillProgress after each unit completes.
+
+    Raises:
+        ValueError: If the dates or kinds aren't valid.
+        KeyError: If any sport string is not a valid sport name.
+    """
+
+    def __init__(
+        self,
+        rundown,
+        sports: Iterable[Union[int, str]],
+        start_date: str,
+        end_date: str,
+        *include: Literal["all_periods", "scores"],
+        kinds: Iterable[Kind] = ("closing_lines",),
+        sink: Optional[Any] = None,
+        manifest: Optional[Union[str, Path, Manifest]] = None,
+        max_concurrency: int = 10,
+        rate: Optional[Union[float, TokenBucket]] = None,
+        offset: Optional[int] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
+        checkpoint_every: int = 50,
+        progress: Optional[Callable[[BackfillProgress], Any]] = None,
+    ):
+        self.rundown = rundown
+        self.include = include
+        sport_ids = [rundown._validate_sport(s) for s in sports]
+        self.units = plan(sport_ids, start_date, end_date, kinds)
+        if manifest is not None and not isinstance(manifest, Manifest):
+            manifest = Manifest(manifest)
+        self.manifest = manifest
+        self.sink = sink
+        self.max_concurrency = max_concurrency
+        if rate is not None and not isinstance(rate, TokenBucket):
+            rate = TokenBucket(rate)
+        self.rate_limiter = rate
+        # Resolved once, so the manifest records the offset that was requested,
+        # rather than None for the timezone of the client.
+        self.offset = rundown._validate_offset(offset)
+        self.parse = parse
+        self.checkpoint_every = checkpoint_every
+        self.progress = progress
+
+    def pending(self) -> list[WorkUnit]:
+        """The planned units that aren't recorded in the manifest."""
+        if self.manifest is None:
+            return list(self.units)
+        params = (self.include, self.offset)
+        return [u for u in self.units if (u, *params) not in self.manifest]
+
+    def _fetch(self, unit: WorkUnit) -> Any:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        method = getattr(self.rundown, unit.kind)
+        args = (unit.sport_id, unit.date, *self.include)
+        return method(*args, offset=self.offset, parse=self.parse)
+
+    def _write(self, unit: WorkUnit, events: Any):
+        if self.sink is None:
+            return
+        if hasattr(self.sink, "write"):
+            self.sink.write(events, unit.kind)
+        else:
+            self.sink(events, unit.kind)
+
+    def _checkpoint(self, units: list[WorkUnit]):
+        if not units:
+            return
+        if hasattr(self.sink, "flush"):
+            self.sink.flush()
+        if self.manifest is not None:
+            self.manifest.record(units, self.include, self.offset)
+        units.clear()
+
+    def run(self) -> BackfillReport:
+        """Run the backfill until every pending unit has completed or failed.
+
+        Returns:
+            BackfillReport with the number of units done and skipped, a dict of the
+                exception raised by each failed unit, and the elapsed seconds.
+        """
+        pending = self.pending()
+        skipped, total = len(self.units) - len(pending), len(pending)
+        failures = {}
+        done = 0
+        unrecorded = []
+        start = time.monotonic()
+        queue = iter(pending)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            # Keep a bounded number of units submitted, so results are released once
+            # they are written instead of accumulating for the whole backfill.
+            in_flight = {}
+
+            def submit():
+                for unit in queue:
+                    in_flight[executor.submit(self._fetch, unit)] = unit
+                    if len(in_flight) >= 2 * self.max_concurrency:
+                        return
+
+            try:
+                submit()
+                while in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        unit = in_flight.pop(future)
+                        try:
+                            self._write(unit, future.result())
+                        except Exception as e:
+                            failures[unit] = e
+                        else:
+                            done += 1
+                            unrecorded.append(unit)
+                            if len(unrecorded) >= self.checkpoint_every:
+                                self._checkpoint(unrecorded)
+                        if self.progress is not None:
+                            self.progress(
+                                self._progress(done, failures, skipped, total, start)
+                            )
+                    submit()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                self._checkpoint(unrecorded)
+
+        return BackfillReport(done, skipped, failures, time.monotonic() - start)
+
+    @staticmethod
+    def _progress(
+        done: int, failures: dict, skipped: int, total: int, start: float
+    ) -> BackfillProgress:
+        elapsed = time.monotonic() - start
+        finished = done + len(failures)
+        rate = finished / elapsed if elapsed > 0 else 0.0
+        eta = (total - finished) / rate if rate > 0 else float("inf")
+        return BackfillProgress(done, len(failures), skipped, total, elapsed, rate, eta)
+
+
+def backfill(
+    rundown,
+    sports: Iterable[Union[int, str]],
+    start_date: str,
+    end_date: str,
+    *include: Literal["all_periods", "scores"],
+    **kwargs,
+) -> BackfillReport:
+    """Run a Backfill. See Backfill for the arguments."""
+    return Backfill(rundown, sports, start_date, end_date, *include, **kwargs).run()
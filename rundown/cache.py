@@ -0,0 +1,133 @@
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Optional, Union
+
+from rundown.utils import is_past_date
+
+"""Module containing the in-memory response cache used by Rundown clients."""
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class CachePolicy:
+    """Decides how long the response for an endpoint may be cached.
+
+    Subclass and override `ttl` to customize caching per endpoint.
+
+    Args:
+        static_ttl: Seconds to cache near-static endpoints (/sports, /affiliates and
+            /sports/<sport-id>/teams).
+        past_ttl: Seconds to cache events, opening and closing lines for dates that
+            have passed. These never change, so by default they never expire.
+        live_ttl: Seconds to cache events, opening and closing lines for current and
+            future dates.
+        default_ttl: Seconds to cache any other endpoint, except /delta which is never
+            cached.
+    """
+
+    def __init__(
+        self,
+        static_ttl: float = 24 * 60 * 60,
+        past_ttl: float = math.inf,
+        live_ttl: float = 10,
+        default_ttl: float = 60,
+    ):
+        self.static_ttl = static_ttl
+        self.past_ttl = past_ttl
+        self.live_ttl = live_ttl
+        self.default_ttl = default_ttl
+
+    def ttl(self, *segments: Union[str, int]) -> Optional[float]:
+        """Get the time to live for the response from the route built from segments.
+
+        Args:
+            segments: The URL segments, as passed to Rundown._build_url.
+
+        Returns:
+            The number of seconds to cache the response for, or None if the response
+            must not be cached.
+        """
+        segments = [str(s) for s in segments]
+        if segments[0] == "delta":
+            return None
+        if segments in (["sports"], ["affiliates"]):
+            return self.static_ttl
+        if segments[0] == "sports" and len(segments) == 3 and segments[2] == "teams":
+            return self.static_ttl
+        if (
+            segments[0] == "sports"
+            and len(segments) == 4
+            and segments[2] in ("events", "openers", "closing")
+        ):
+            return self.past_ttl if is_past_date(segments[3]) else self.live_ttl
+        return self.default_ttl
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of decoded JSON responses with per-endpoint TTLs.
+
+    Responses are keyed by URL and query parameters. Cached responses are shared
+    between calls, so they must not be mutated.
+
+    Args:
+        maxsize: Maximum number of responses held. The least recently used response
+            is evicted when the cache is full.
+        policy: Decides the TTL for each endpoint. Defaults to CachePolicy().
+
+    Attributes:
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups not found in the cache, or expired.
+    """
+
+    def __init__(self, maxsize: int = 512, policy: Optional[CachePolicy] = None):
+        self.maxsize = maxsize
+        self.policy = CachePolicy() if policy is None else policy
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: dict) -> tuple:
+        """Build the cache key for a request from its URL and cleaned parameters."""
+        items = []
+        for k, v in sorted(params.items()):
+            items.append((k, tuple(v) if isinstance(v, (list, tuple)) else v))
+        return (url, tuple(items))
+
+    def get(self, key: tuple) -> Optional[dict]:
+        """Get the response stored at key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, data: dict, ttl: float):
+        """Store data at key for ttl seconds, evicting the least recently used entry
+        if the cache is full.
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, data)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all responses and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Get hit and miss counts, and the current size of the cache."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
@@ -0,0 +1,66 @@
+import json
+from typing import Any, Union
+
+"""Module for decoding JSON responses with the fastest available backend.
+
+orjson is used if it is installed, otherwise the standard library json module. The
+Accept-Encoding header sent by Rundown clients includes Brotli if a Brotli decoder is
+installed.
+"""
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli  # noqa: F401
+
+    _has_brotli = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        _has_brotli = True
+    except ImportError:
+        _has_brotli = False
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+_backends = {"json": (json.loads, _json_dumps)}
+if orjson is not None:
+    _backends["orjson"] = (orjson.loads, orjson.dumps)
+
+backend = "orjson" if orjson is not None else "json"
+_loads, _dumps = _backends[backend]
+
+ACCEPT_ENCODING = "gzip, deflate, br" if _has_brotli else "gzip, deflate"
+
+
+def use_backend(name: str):
+    """Select the JSON backend used to decode responses.
+
+    Args:
+        name: 'orjson' or 'json'.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    global backend, _loads, _dumps
+    if name not in _backends:
+        raise ValueError(f"JSON backend must be one of {sorted(_backends)}.")
+    backend = name
+    _loads, _dumps = _backends[name]
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """Decode a JSON document."""
+    return _loads(content)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as a compact UTF-8 JSON document."""
+    return _dumps(obj)
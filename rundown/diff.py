@@ -0,0 +1,179 @@
+from collections import namedtuple
+from collections.abc import Iterable
+from typing import Any, Optional, Union
+
+from rundown.history import _series_fields
+from rundown.lazy import Lazy
+from rundown.oddsbook import _affiliate_name, _periods
+from rundown.resources.events import Events
+from rundown.resources.validators import make_none_if_not_published
+
+"""Module for finding what changed between two snapshots of events."""
+
+EventsDiff = namedtuple(
+    "EventsDiff", ["added", "removed", "status", "scores", "prices"]
+)
+StatusChange = namedtuple("StatusChange", ["event_id", "old", "new"])
+ScoreChange = namedtuple("ScoreChange", ["event_id", "old", "new"])
+PriceChange = namedtuple(
+    "PriceChange", ["event_id", "affiliate", "period", "market", "changes"]
+)
+
+
+def _unwrap(obj: Any) -> Any:
+    """The JSON of a Lazy object, which is quicker to compare than its fields."""
+    return obj.raw if isinstance(obj, Lazy) else obj
+
+
+def _get(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return _unwrap(getattr(obj, name, None))
+
+
+def _same(old: Any, new: Any) -> bool:
+    """Whether two subtrees are known to be equal without walking them.
+
+    Resources are only the same if they are the same object, as when reused by a
+    ModelCache, because comparing pydantic models builds dicts of both. Decoded JSON
+    is compared with ==, which doesn't build anything.
+    """
+    if old is new:
+        return True
+    return isinstance(old, dict) and isinstance(new, dict) and old == new
+
+
+def _price(value: Optional[Union[int, float]]) -> Optional[Union[int, float]]:
+    """Prices of raw payloads still have the 'Not Published' marker."""
+    return None if value is None else make_none_if_not_published(value)
+
+
+def _events_by_id(events: Any) -> dict[str, Any]:
+    events = _unwrap(events)
+    if isinstance(events, (Events, dict)):
+        events = _get(events, "events") or []
+    by_id = {}
+    for event in events:
+        event = _unwrap(event)
+        by_id[_get(event, "event_id")] = event
+    return by_id
+
+
+def _books(event: Any, name: str) -> dict[str, Any]:
+    """The lines or line_periods of an event, keyed by sportsbook name."""
+    books = _get(event, name) or {}
+    return {_affiliate_name(k): _unwrap(v) for k, v in books.items()}
+
+
+def diff_events(
+    old: Any,
+    new: Any,
+    markets: Iterable[str] = ("moneyline", "spread", "total"),
+) -> EventsDiff:
+    """Find what changed between two snapshots of events.
+
+    Snapshots can be resources.Events, Events parsed with parse='lazy' or parse='raw',
+    decoded JSON of an events response, or any iterable of events. The two snapshots
+    don't need to be of the same kind, since sportsbooks are matched by name and
+    prices are compared after removing the 'Not Published' marker.
+
+    The snapshots are walked from events down to lines, and subtrees known to be
+    unchanged are skipped: the same object, as with events reused by a ModelCache,
+    or equal decoded JSON. Only the price and points fields of lines are compared, so
+    a line whose date_updated changed without its prices isn't a change.
+
+    Example:
+        before = r.events("MLB", date)
+        ...
+        after = r.events("MLB", date)
+        diff = diff_events(before, after)
+        for change in diff.prices:
+            print(change.event_id, change.affiliate, change.market, change.changes)
+
+    Args:
+        old: The earlier snapshot.
+        new: The later snapshot.
+        markets: Markets to compare, out of 'moneyline', 'spread' and 'total'.
+
+    Raises:
+        ValueError: If a market isn't valid.
+
+    Returns:
+        EventsDiff with the lists:
+            added: Events only in new.
+            removed: Events only in old.
+            status: StatusChange for each event whose score.event_status changed.
+            scores: ScoreChange for each event whose (score_away, score_home) changed.
+            prices: PriceChange for each line with changed prices, keyed by event id,
+                sportsbook name, period (None for Event.lines) and market. changes
+                maps each changed field to its (old, new) values. A line only in one
+                snapshot has None for the values in the other.
+        any(diff) is False if nothing changed.
+    """
+    markets = tuple(markets)
+    for market in markets:
+        if market not in _series_fields:
+            raise ValueError(f"{market!r} is not a market.")
+
+    old_events, new_events = _events_by_id(old), _events_by_id(new)
+    diff = EventsDiff([], [], [], [], [])
+    for event_id, event in old_events.items():
+        if event_id not in new_events:
+            diff.removed.append(event)
+    for event_id, new_event in new_events.items():
+        old_event = old_events.get(event_id)
+        if old_event is None:
+            diff.added.append(new_event)
+        elif not _same(old_event, new_event):
+            _diff_event(diff, event_id, old_event, new_event, markets)
+    return diff
+
+
+def _diff_event(diff: EventsDiff, event_id: str, old: Any, new: Any, markets: tuple):
+    old_score, new_score = _get(old, "score"), _get(new, "score")
+    if not _same(old_score, new_score):
+        old_status = _get(old_score, "event_status")
+        new_status = _get(new_score, "event_status")
+        if old_status != new_status:
+            diff.status.append(StatusChange(event_id, old_status, new_status))
+        old_points = (_get(old_score, "score_away"), _get(old_score, "score_home"))
+        new_points = (_get(new_score, "score_away"), _get(new_score, "score_home"))
+        if old_points != new_points:
+            diff.scores.append(ScoreChange(event_id, old_points, new_points))
+
+    for name, periods in (("lines", (None,)), ("line_periods", _periods)):
+        old_books, new_books = _get(old, name), _get(new, name)
+        if _same(old_books, new_books):
+            continue
+        old_books, new_books = _books(old, name), _books(new, name)
+        for affiliate in {**new_books, **old_books}:
+            old_lines, new_lines = old_books.get(affiliate), new_books.get(affiliate)
+            if _same(old_lines, new_lines):
+                continue
+            for period in periods:
+                if period is None:
+                    old_period, new_period = old_lines, new_lines
+                else:
+                    old_period = _get(old_lines, period)
+                    new_period = _get(new_lines, period)
+                    if _same(old_period, new_period):
+                        continue
+                key = (event_id, affiliate, period)
+                _diff_lines(diff, key, old_period, new_period, markets)
+
+
+def _diff_lines(diff: EventsDiff, key: tuple, old: Any, new: Any, markets: tuple):
+    for market in markets:
+        old_line, new_line = _get(old, market), _get(new, market)
+        if _same(old_line, new_line):
+            continue
+        changes = {}
+        for field in _series_fields[market]:
+            old_value = _price(_get(old_line, field))
+            new_value = _price(_get(new_line, field))
+            if old_value != new_value:
+                changes[field] = (old_value, new_value)
+        if changes:
+            diff.prices.append(PriceChange(*key, market, changes))
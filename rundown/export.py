@@ -0,0 +1,251 @@
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel
+
+from rundown.lazy import _price_keys
+from rundown.resources.event import SportsbookLinePeriods
+from rundown.resources.line import (
+    Line,
+    Moneyline,
+    MoneylinePeriod,
+    Spread,
+    SpreadPeriod,
+    Total,
+    TotalPeriod,
+)
+from rundown.resources.lineperiods import LinePeriods
+
+"""Module for exporting resources to Arrow tables and pandas DataFrames.
+
+Events are flattened to one row per event, sportsbook and period, and line histories
+to one row per line. Columns are read straight from the resources, or from the decoded
+JSON returned with parse='raw', without building dicts of every resource first.
+
+pyarrow is needed for Arrow tables, and pandas for DataFrames. Both are optional.
+"""
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+_markets = {"moneyline": Moneyline, "spread": Spread, "total": Total}
+# Numeric fields of each market, such as moneyline_home and moneyline_home_delta.
+_market_fields = {
+    market: [f for f in resource.__fields__ if f in _price_keys]
+    for market, resource in _markets.items()
+}
+_periods = tuple(SportsbookLinePeriods.__fields__)
+_line_periods = tuple(LinePeriods.__fields__)
+
+# Columns of events tables, and their Arrow types by name.
+_event_columns = [
+    ("event_id", "string"),
+    ("sport_id", "int64"),
+    ("event_date", "string"),
+    ("event_status", "string"),
+    ("away_team_id", "int64"),
+    ("away_team", "dictionary"),
+    ("home_team_id", "int64"),
+    ("home_team", "dictionary"),
+    ("period", "dictionary"),
+    ("affiliate_id", "int64"),
+    ("affiliate_name", "dictionary"),
+    ("line_id", "int64"),
+]
+for _market, _fields in _market_fields.items():
+    _event_columns.append((f"{_market}_date_updated", "string"))
+    _event_columns += [(f, "float64") for f in _fields]
+
+_period_resources = {
+    "moneyline": MoneylinePeriod,
+    "spread": SpreadPeriod,
+    "total": TotalPeriod,
+}
+
+
+def _resource_columns(resource: type[BaseModel]) -> list[tuple[str, str]]:
+    """Columns for the scalar fields of a line resource."""
+    columns = []
+    for name, field in resource.__fields__.items():
+        if name in _price_keys:
+            columns.append((name, "float64"))
+        elif field.outer_type_ in (int, str):
+            columns.append((name, "int64" if field.outer_type_ is int else "string"))
+    return columns
+
+
+def _get(obj: Any, name: str) -> Any:
+    """Get a field of a resource, Lazy resource, or decoded JSON object."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _require(module: Any, name: str):
+    if module is None:
+        raise ImportError(f"Exporting to {name} requires {name}: pip install {name}")
+
+
+def _arrow_type(name: str) -> "pa.DataType":
+    if name == "dictionary":
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.type_for_alias(name)
+
+
+def _to_arrow(columns: list[tuple[str, str]], data: dict[str, list]) -> "pa.Table":
+    _require(pa, "pyarrow")
+    schema = pa.schema([(name, _arrow_type(type_)) for name, type_ in columns])
+    arrays = [
+        pa.array(data[name], type=field.type) for name, field in zip(data, schema)
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _to_pandas(columns: list[tuple[str, str]], data: dict[str, list]) -> "pd.DataFrame":
+    _require(pd, "pandas")
+    df = pd.DataFrame(data, columns=[name for name, _ in columns])
+    for name, type_ in columns:
+        if type_ == "dictionary":
+            df[name] = df[name].astype("category")
+        elif type_ == "int64":
+            df[name] = df[name].astype("Int64")
+        elif type_ == "float64":
+            df[name] = df[name].astype("float64")
+    return df
+
+
+def _teams(event: Any) -> tuple:
+    away = home = None
+    for team in _get(event, "teams_normalized") or []:
+        if _get(team, "is_away"):
+            away = team
+        elif _get(team, "is_home"):
+            home = team
+    return (
+        _get(away, "team_id"),
+        _get(away, "name"),
+        _get(home, "team_id"),
+        _get(home, "name"),
+    )
+
+
+def _append_lines(data: dict, event_values: tuple, period: Optional[str], lines: Any):
+    affiliate = _get(lines, "affiliate")
+    values = event_values + (
+        period,
+        _get(affiliate, "affiliate_id"),
+        _get(affiliate, "affiliate_name"),
+        _get(lines, "line_id"),
+    )
+    for name, value in zip(data, values):
+        data[name].append(value)
+    for market, fields in _market_fields.items():
+        line = _get(lines, market)
+        data[f"{market}_date_updated"].append(_get(line, "date_updated"))
+        for f in fields:
+            data[f].append(_get(line, f))
+
+
+def events_columns(events: Any) -> dict[str, list]:
+    """Flatten events to columns, with a row per event, sportsbook and period.
+
+    Rows for Event.lines have a null period, and rows for Event.line_periods have the
+    name of the period, such as 'period_full_game'. Events without lines have no rows.
+
+    Args:
+        events: resources.Events, or the dict returned by an events method with
+            parse='raw' or parse='lazy'.
+
+    Returns:
+        dict mapping column names to lists of values.
+    """
+    data = {name: [] for name, _ in _event_columns}
+    for event in _get(events, "events") or []:
+        event_values = (
+            _get(event, "event_id"),
+            _get(event, "sport_id"),
+            _get(event, "event_date"),
+            _get(_get(event, "score"), "event_status"),
+        ) + _teams(event)
+        for lines in (_get(event, "lines") or {}).values():
+            _append_lines(data, event_values, None, lines)
+        for line_periods in (_get(event, "line_periods") or {}).values():
+            for period in _periods:
+                lines = _get(line_periods, period)
+                if lines is not None:
+                    _append_lines(data, event_values, period, lines)
+    return data
+
+
+def events_to_arrow(events: Any) -> "pa.Table":
+    """Export events to a pyarrow.Table. See events_columns."""
+    return _to_arrow(_event_columns, events_columns(events))
+
+
+def events_to_pandas(events: Any) -> "pd.DataFrame":
+    """Export events to a pandas.DataFrame. See events_columns."""
+    return _to_pandas(_event_columns, events_columns(events))
+
+
+def _line_market(line: Any) -> str:
+    # Lazy objects know their resource, and decoded JSON is told apart by its fields.
+    resource = type(line) if isinstance(line, BaseModel) else _get(line, "resource")
+    for market, market_resource in _markets.items():
+        if isinstance(resource, type) and issubclass(resource, market_resource):
+            return market
+        if isinstance(line, dict) and _market_fields[market][0] in line:
+            return market
+    raise ValueError(f"{line!r} is not a moneyline, spread or total.")
+
+
+def _lines_columns(lines: Union[list, LinePeriods, dict]) -> list[tuple[str, str]]:
+    """Columns for a line history, taken from the resource of its first line."""
+    if isinstance(lines, list):
+        return _resource_columns(_markets[_line_market(lines[0])] if lines else Line)
+    first = next((ls[0] for p in _line_periods if (ls := _get(lines, p))), None)
+    if first is None:
+        return [("period", "dictionary")] + _resource_columns(Line)
+    resource = _period_resources[_line_market(first)]
+    return [("period", "dictionary")] + _resource_columns(resource)
+
+
+def lines_columns(lines: Union[list, LinePeriods, dict]) -> dict[str, list]:
+    """Flatten a line history to columns, with a row per line.
+
+    Args:
+        lines: The list of resources.Moneyline, Spread or Total, or the
+            resources.LinePeriods, returned by a line method with any parse mode.
+            Rows for LinePeriods have the name of their period, such as
+            'period_full_game', in the period column.
+
+    Returns:
+        dict mapping column names to lists of values.
+    """
+    data = {name: [] for name, _ in _lines_columns(lines)}
+    if isinstance(lines, list):
+        periods = [(None, lines)]
+    else:
+        periods = [(p, _get(lines, p) or []) for p in _line_periods]
+    for period, period_lines in periods:
+        for line in period_lines:
+            for name, values in data.items():
+                values.append(period if name == "period" else _get(line, name))
+    return data
+
+
+def lines_to_arrow(lines: Union[list, LinePeriods, dict]) -> "pa.Table":
+    """Export a line history to a pyarrow.Table. See lines_columns."""
+    return _to_arrow(_lines_columns(lines), lines_columns(lines))
+
+
+def lines_to_pandas(lines: Union[list, LinePeriods, dict]) -> "pd.DataFrame":
+    """Export a line history to a pandas.DataFrame. See lines_columns."""
+    return _to_pandas(_lines_columns(lines), lines_columns(lines))
@@ -0,0 +1,329 @@
+import asyncio
+import inspect
+import logging
+import queue
+import threading
+from collections import namedtuple
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from typing import Any, Union, Optional, Literal
+
+from rundown.oddsbook import _affiliate_name, _periods
+from rundown.poller import AsyncDeltaPoller, DeltaPoller
+from rundown.resources.event import Event
+from rundown.resources.events import Events
+
+"""Module for dispatching changes from the /delta route to filtered subscribers."""
+
+LineChange = namedtuple(
+    "LineChange", ["event_id", "affiliate", "period", "market", "line"]
+)
+Change = namedtuple("Change", ["event", "lines"])
+
+_markets = ("moneyline", "spread", "total")
+_closed = object()
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Filters for the changes a subscriber receives. Created by ChangeFeed.subscribe.
+
+    Each filter is None to accept anything, or the values to accept.
+
+    If the subscription has no callback, changes are queued until they are read by
+    iterating over the subscription. Once maxsize polls are queued, the oldest are
+    dropped to make room for the newest.
+
+    Attributes:
+        sport_ids (Optional[frozenset[int]]): Sports of the events.
+        affiliates (Optional[frozenset[str]]): Names of the sportsbooks.
+        markets (Optional[frozenset[str]]): Any of 'moneyline', 'spread' and 'total'.
+        periods (Optional[frozenset[Optional[str]]]): None for Event.lines, or
+            SportsbookLinePeriods fields such as 'period_full_game' for
+            Event.line_periods.
+        dropped (int): The number of queued polls dropped because the queue was full.
+    """
+
+    _full, _empty = queue.Full, queue.Empty
+
+    def __init__(
+        self,
+        feed: "ChangeFeed",
+        callback: Optional[Callable[[list[Change]], Any]],
+        sport_ids: Optional[Iterable[int]],
+        affiliates: Optional[Iterable[Union[int, str]]],
+        markets: Optional[Iterable[str]],
+        periods: Optional[Iterable[Optional[str]]],
+        maxsize: int,
+    ):
+        self._feed = feed
+        self.callback = callback
+        self.sport_ids = None if sport_ids is None else frozenset(sport_ids)
+        self.affiliates = (
+            None if affiliates is None else frozenset(map(_affiliate_name, affiliates))
+        )
+        self.markets = None if markets is None else frozenset(markets)
+        self.periods = None if periods is None else frozenset(periods)
+        if self.markets is not None and not self.markets <= set(_markets):
+            raise ValueError(f"markets must be any of {_markets}.")
+        if self.periods is not None and not self.periods <= {None, *_periods}:
+            raise ValueError(f"periods must be None or any of {_periods}.")
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+
+    def select(self, event: Event) -> Optional[Change]:
+        """Get the part of event that matches the filters.
+
+        Returns:
+            Change with the event and its matching lines, or None if nothing matches.
+                Events without lines match if no line filters are set.
+        """
+        if self.sport_ids is not None and event.sport_id not in self.sport_ids:
+            return None
+        lines = []
+        if self.periods is None or None in self.periods:
+            for affiliate, sl in self._select_affiliates(event.lines):
+                lines += self._select_markets(event.event_id, affiliate, None, sl)
+        periods = _periods if self.periods is None else self.periods - {None}
+        for affiliate, slp in self._select_affiliates(event.line_periods):
+            for period in periods:
+                sl = getattr(slp, period)
+                lines += self._select_markets(event.event_id, affiliate, period, sl)
+
+        filters = (self.affiliates, self.markets, self.periods)
+        if len(lines) == 0 and any(f is not None for f in filters):
+            return None
+        return Change(event, lines)
+
+    def _select_affiliates(self, lines: Optional[dict]) -> Iterator[tuple[str, Any]]:
+        if not lines:
+            return
+        if self.affiliates is None:
+            yield from lines.items()
+            return
+        for affiliate in self.affiliates:
+            if affiliate in lines:
+                yield affiliate, lines[affiliate]
+
+    def _select_markets(
+        self, event_id: str, affiliate: str, period: Optional[str], sl: Any
+    ) -> list[LineChange]:
+        markets = _markets if self.markets is None else self.markets
+        return [
+            LineChange(event_id, affiliate, period, m, getattr(sl, m)) for m in markets
+        ]
+
+    def deliver(self, changes: list[Change]):
+        """Pass changes to the callback, or queue them."""
+        if self.callback is not None:
+            self.callback(changes)
+        else:
+            self._put(changes)
+
+    def _put(self, item):
+        # The consumer may empty the queue between the two calls, so this loops.
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except self._full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except self._empty:
+                    pass
+
+    def unsubscribe(self):
+        """Stop receiving changes, and end iteration once queued changes are read."""
+        self._feed.unsubscribe(self)
+
+    def _close(self):
+        self._put(_closed)
+
+    def __iter__(self) -> Iterator[list[Change]]:
+        """Wait for and yield queued changes until unsubscribed."""
+        while True:
+            changes = self._queue.get()
+            if changes is _closed:
+                return
+            yield changes
+
+
+class AsyncSubscription(Subscription):
+    """Subscription created by AsyncChangeFeed.subscribe. The callback may be a
+    coroutine function. Without a callback, changes are read with async for.
+    """
+
+    _full, _empty = asyncio.QueueFull, asyncio.QueueEmpty
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._queue = asyncio.Queue(self._queue.maxsize)
+
+    async def deliver(self, changes: list[Change]):
+        if self.callback is not None:
+            result = self.callback(changes)
+            if inspect.isawaitable(result):
+                await result
+        else:
+            self._put(changes)
+
+    def __iter__(self):
+        raise TypeError("Use async for with an AsyncSubscription.")
+
+    async def __aiter__(self) -> AsyncIterator[list[Change]]:
+        while True:
+            changes = await self._queue.get()
+            if changes is _closed:
+                return
+            yield changes
+
+
+class ChangeFeed:
+    """Publishes the changes returned by a DeltaPoller to filtered subscribers.
+
+    Each poll is made and parsed once, however many subscribers there are. Events are
+    only offered to the subscribers of their sport, and each subscriber receives the
+    matching events and lines of a poll in a single list. An exception raised by a
+    callback is logged, and doesn't stop the other subscribers or the feed.
+
+    Args:
+        poller: The poller the changes come from. Subscribers can only receive changes
+            for the sports it follows.
+
+    Example:
+        feed = ChangeFeed(DeltaPoller(r, ["NBA", "NHL"]))
+        feed.subscribe(print, sports=["NBA"], markets=["spread"])
+        pinnacle = feed.subscribe(affiliates=["Pinnacle"], periods=[None])
+        threading.Thread(target=feed.run, daemon=True).start()
+        for changes in pinnacle:
+            ...
+    """
+
+    _subscription_class = Subscription
+
+    def __init__(self, poller: Union[DeltaPoller, AsyncDeltaPoller]):
+        self.poller = poller
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        # Subscriptions by sport_id, with None for those accepting every sport.
+        self._by_sport = {}
+
+    def subscribe(
+        self,
+        callback: Optional[Callable[[list[Change]], Any]] = None,
+        *,
+        sports: Optional[Iterable[Union[int, str]]] = None,
+        affiliates: Optional[Iterable[Union[int, str]]] = None,
+        markets: Optional[Iterable[Literal["moneyline", "spread", "total"]]] = None,
+        periods: Optional[Iterable[Optional[str]]] = None,
+        maxsize: int = 100,
+    ) -> Subscription:
+        """Register a subscriber.
+
+        Args:
+            callback: Called with the list of matching Change of each poll. If None,
+                iterate over the returned subscription instead.
+            sports: IDs or names of the leagues to receive. Defaults to all.
+            affiliates: Names or IDs of the sportsbooks to receive. Defaults to all.
+            markets: Any of 'moneyline', 'spread' and 'total'. Defaults to all.
+            periods: None for Event.lines, and SportsbookLinePeriods fields such as
+                'period_full_game' for Event.line_periods. Defaults to all.
+            maxsize: The number of polls queued for a subscription without callback,
+                after which the oldest are dropped. 0 for no limit.
+
+        Raises:
+            KeyError: If a sport string is not a valid sport name.
+            ValueError: If a market or period is not valid.
+
+        Returns:
+            The Subscription, used to unsubscribe or read queued changes.
+        """
+        sport_ids = None
+        if sports is not None:
+            sport_ids = [self.poller.rundown._validate_sport(s) for s in sports]
+        subscription = self._subscription_class(
+            self, callback, sport_ids, affiliates, markets, periods, maxsize
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self._index()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop dispatching to subscription."""
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.remove(subscription)
+            self._index()
+        subscription._close()
+
+    def _index(self):
+        by_sport = {}
+        for s in self._subscriptions:
+            for sport_id in s.sport_ids or (None,):
+                by_sport.setdefault(sport_id, []).append(s)
+        self._by_sport = by_sport
+
+    def _dispatch(self, events: Events) -> dict[Subscription, list[Change]]:
+        """Group the matching changes of events by subscriber."""
+        by_sport = self._by_sport
+        everything = by_sport.get(None, [])
+        dispatch = {}
+        for event in events.events:
+            for s in [*everything, *by_sport.get(event.sport_id, [])]:
+                change = s.select(event)
+                if change is not None:
+                    dispatch.setdefault(s, []).append(change)
+        return dispatch
+
+    def publish(self, events: Events):
+        """Dispatch events to the matching subscribers."""
+        for subscription, changes in self._dispatch(events).items():
+            try:
+                subscription.deliver(changes)
+            except Exception:
+                logger.exception(
+                    "Subscriber callback %r failed.", subscription.callback
+                )
+
+    def run(self):
+        """Poll and publish until the poller is stopped."""
+        for events in self.poller:
+            self.publish(events)
+
+    def stop(self):
+        """Stop the poller, and end iteration for every subscriber."""
+        self.poller.stop()
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+
+
+class AsyncChangeFeed(ChangeFeed):
+    """Publishes the changes returned by an AsyncDeltaPoller. See ChangeFeed.
+
+    Example:
+        feed = AsyncChangeFeed(AsyncDeltaPoller(r, ["NBA"]))
+        spreads = feed.subscribe(markets=["spread"])
+        task = asyncio.create_task(feed.run())
+        async for changes in spreads:
+            ...
+    """
+
+    _subscription_class = AsyncSubscription
+
+    async def publish(self, events: Events):
+        """Dispatch events to the matching subscribers."""
+        for subscription, changes in self._dispatch(events).items():
+            try:
+                await subscription.deliver(changes)
+            except Exception:
+                logger.exception(
+                    "Subscriber callback %r failed.", subscription.callback
+                )
+
+    async def run(self):
+        """Poll and publish until the poller is stopped."""
+        async for events in self.poller:
+            await self.publish(events)
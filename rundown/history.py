@@ -0,0 +1,411 @@
+import math
+import threading
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Literal, Optional, Union
+
+import arrow
+
+from rundown import decoder
+from rundown.lazy import _price_keys
+from rundown.resources.line import Moneyline, Spread, Total
+from rundown.usercontext import user_context
+
+"""Module for fetching line histories in bulk, and storing them as compact series."""
+
+_markets = {"moneyline": Moneyline, "spread": Spread, "total": Total}
+# Prices and points of each market, without the deltas, which follow from the series.
+_series_fields = {
+    market: tuple(
+        f for f in resource.__fields__ if f in _price_keys and not f.endswith("_delta")
+    )
+    for market, resource in _markets.items()
+}
+
+When = Union[float, int, str, datetime]
+
+
+def _epoch(when: When) -> float:
+    """Epoch time of an epoch time, ISO 8601 date string, or aware datetime."""
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, str):
+        try:
+            when = datetime.fromisoformat(when.replace("Z", "+00:00"))
+        except ValueError:
+            # Before Python 3.11, fractions of seconds must have 3 or 6 digits.
+            return arrow.get(when).timestamp()
+    return when.timestamp()
+
+
+def _get(line: Any, name: str) -> Any:
+    return line.get(name) if isinstance(line, dict) else getattr(line, name)
+
+
+class LineSeries:
+    """History of a line, stored as arrays of timestamps and values.
+
+    Timestamps are the epoch times of date_updated, in ascending order. Each field of
+    the market, such as moneyline_home, is an array('d') of values, with NaN where the
+    price wasn't published. A series of thousands of lines takes a few arrays instead
+    of thousands of resources.
+
+    Example:
+        series = histories["moneyline", line_id]
+        at_start = series.asof("2021-05-11T23:10:00+00:00")
+        hourly = series.resample(3600)
+
+    Attributes:
+        line_id (int): The line id.
+        market (str): 'moneyline', 'spread' or 'total'.
+        timestamps (array): Epoch times of the lines.
+        columns (dict[str, array]): Values of each field.
+    """
+
+    def __init__(
+        self, line_id: int, market: str, timestamps: array, columns: dict[str, array]
+    ):
+        self.line_id = line_id
+        self.market = market
+        self.timestamps = timestamps
+        self.columns = columns
+
+    @classmethod
+    def from_lines(
+        cls, line_id: int, market: str, lines: Iterable[Any]
+    ) -> "LineSeries":
+        """Build a series from a line history.
+
+        Args:
+            line_id: The line id.
+            market: 'moneyline', 'spread' or 'total'.
+            lines: The lines returned by Rundown.moneyline, spread or total, with any
+                parse mode, in any order.
+        """
+        columns = {f: array("d") for f in _series_fields[market]}
+        return cls(line_id, market, array("d"), columns).extend(lines)
+
+    def extend(self, lines: Iterable[Any]) -> "LineSeries":
+        """Append lines updated at or after the last line of the series.
+
+        Args:
+            lines: Lines with any parse mode, in any order.
+
+        Raises:
+            ValueError: If a line was updated before the last line of the series.
+
+        Returns:
+            The series itself.
+        """
+        fields = list(self.columns)
+        rows = sorted(
+            (
+                (_epoch(_get(line, "date_updated")), *(_get(line, f) for f in fields))
+                for line in lines
+            ),
+            key=lambda row: row[0],
+        )
+        if rows and self.timestamps and rows[0][0] < self.timestamps[-1]:
+            raise ValueError("Lines must not be older than the last line.")
+        self.timestamps.extend(row[0] for row in rows)
+        for i, f in enumerate(fields, 1):
+            self.columns[f].extend(math.nan if r[i] is None else r[i] for r in rows)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __repr__(self) -> str:
+        return f"LineSeries({self.market!r}, {self.line_id}, n={len(self)})"
+
+    def _row(self, i: int) -> dict[str, Optional[float]]:
+        row = {"timestamp": self.timestamps[i]}
+        for f, values in self.columns.items():
+            row[f] = None if math.isnan(values[i]) else values[i]
+        return row
+
+    def asof(self, when: When) -> Optional[dict[str, Optional[float]]]:
+        """Get the line in effect at a time: the last one updated at or before it.
+
+        Args:
+            when: Epoch time, ISO 8601 date string, or aware datetime.
+
+        Returns:
+            dict with the timestamp of the line and the value of each field, None for
+                unpublished prices. None if when is before the first line.
+        """
+        i = bisect_right(self.timestamps, _epoch(when))
+        return None if i == 0 else self._row(i - 1)
+
+    def resample(
+        self,
+        step: float,
+        start: Optional[When] = None,
+        end: Optional[When] = None,
+    ) -> "LineSeries":
+        """Sample the line in effect at regular times.
+
+        Args:
+            step: Seconds between samples.
+            start: Time of the first sample. Defaults to the first timestamp.
+            end: Time after which there are no samples. Defaults to the last timestamp.
+
+        Returns:
+            LineSeries with a timestamp per sample. Samples before the first line have
+                NaN values.
+        """
+        if step <= 0:
+            raise ValueError("step must be positive.")
+        timestamps = array("d")
+        columns = {f: array("d") for f in self.columns}
+        if not self.timestamps and (start is None or end is None):
+            return LineSeries(self.line_id, self.market, timestamps, columns)
+
+        t = self.timestamps[0] if start is None else _epoch(start)
+        end = self.timestamps[-1] if end is None else _epoch(end)
+        i = bisect_right(self.timestamps, t)
+        n = len(self.timestamps)
+        while t <= end:
+            # Walk forwards instead of bisecting for each sample.
+            while i < n and self.timestamps[i] <= t:
+                i += 1
+            timestamps.append(t)
+            for f, values in self.columns.items():
+                columns[f].append(values[i - 1] if i else math.nan)
+            t += step
+        return LineSeries(self.line_id, self.market, timestamps, columns)
+
+
+class LineHistories:
+    """Line series keyed by (market, line_id), returned by line_histories.
+
+    Attributes:
+        failures (dict[tuple[str, int], Exception]): The exception raised by each
+            request that failed.
+    """
+
+    def __init__(self):
+        self._series: dict[tuple[str, int], LineSeries] = {}
+        self.failures: dict[tuple[str, int], Exception] = {}
+
+    def __getitem__(self, key: tuple[str, int]) -> LineSeries:
+        return self._series[key]
+
+    def __setitem__(self, key: tuple[str, int], series: LineSeries):
+        self._series[key] = series
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        return key in self._series
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        return iter(self._series)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def get(self, market: str, line_id: int) -> Optional[LineSeries]:
+        return self._series.get((market, line_id))
+
+    def items(self):
+        return self._series.items()
+
+    def asof(self, when: When) -> dict[tuple[str, int], Optional[dict]]:
+        """Get the line in effect at a time for every series. See LineSeries.asof."""
+        return {key: series.asof(when) for key, series in self._series.items()}
+
+
+def line_histories(
+    rundown,
+    line_ids: Iterable[int],
+    markets: Iterable[str] = ("moneyline", "spread", "total"),
+    max_concurrency: int = 10,
+) -> LineHistories:
+    """Fetch the histories of many lines concurrently.
+
+    Histories are requested with parse='raw', so no resources are built, and are
+    stored as LineSeries. Requests go through the client, so its cache, store, rate
+    limiter and retries apply.
+
+    Example:
+        line_ids = [lines.line_id for e in events.events for lines in e.lines.values()]
+        histories = line_histories(r, line_ids, ["moneyline"])
+        closing = histories.asof(events.events[0].event_date)
+
+    Args:
+        rundown: The Rundown client used to make requests.
+        line_ids: The line ids of interest.
+        markets: Any of 'moneyline', 'spread' and 'total'.
+        max_concurrency: Maximum number of requests in flight at once.
+
+    Raises:
+        ValueError: If a market isn't valid.
+
+    Returns:
+        LineHistories with a series for each line id and market that has a history.
+            Lines without history are left out, and failed requests are in failures.
+    """
+    markets = list(markets)
+    for market in markets:
+        if market not in _markets:
+            raise ValueError(f"{market!r} is not a market.")
+    keys = [(m, i) for i in dict.fromkeys(line_ids) for m in markets]
+
+    def fetch(market: str, line_id: int) -> Optional[LineSeries]:
+        lines = getattr(rundown, market)(line_id, parse="raw")
+        return None if lines is None else LineSeries.from_lines(line_id, market, lines)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {k: executor.submit(fetch, *k) for k in keys}
+
+    histories = LineHistories()
+    for key, future in futures.items():
+        try:
+            series = future.result()
+        except Exception as e:
+            histories.failures[key] = e
+        else:
+            if series is not None:
+                histories[key] = series
+    return histories
+
+
+class _CachedHistory:
+    """The parsed history of a line, and the raw lines updated at its last time."""
+
+    def __init__(self, line_id: int, market: str):
+        self.lines = []
+        self.series = LineSeries.from_lines(line_id, market, [])
+        self.last_updated = -math.inf
+        self.last_lines = set()
+
+
+class LineHistoryCache:
+    """Thread-safe cache of line histories, which parses only the new lines.
+
+    The history endpoints return the whole history of a line on every request. The
+    cache keeps the parsed history of each line, keyed by market and line id, along
+    with the time the last line was updated. A refresh still requests the whole
+    history, but only lines updated after that time are parsed and appended, and only
+    those are returned. Lines updated at exactly that time are told apart by their
+    JSON, so none are skipped or duplicated.
+
+    Example:
+        cache = LineHistoryCache(r)
+        while True:
+            for line in cache.refresh("moneyline", line_id):
+                print(line.date_updated, line.moneyline_home)
+            time.sleep(60)
+
+    Args:
+        rundown: The Rundown client used to make requests.
+        parse: 'full', 'lazy' or 'raw'. See Rundown.events.
+
+    Raises:
+        ValueError: If parse is not valid.
+    """
+
+    def __init__(self, rundown, parse: Literal["full", "lazy", "raw"] = "full"):
+        if parse not in ("full", "lazy", "raw"):
+            raise ValueError("parse must be one of 'full', 'lazy' or 'raw'.")
+        self.rundown = rundown
+        self.parse = parse
+        self._histories: dict[tuple[str, int], _CachedHistory] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, market: str, line_id: int) -> list:
+        """Request the history of a line, and add the lines not seen before.
+
+        Args:
+            market: 'moneyline', 'spread' or 'total'.
+            line_id: The line id.
+
+        Raises:
+            ValueError: If market isn't valid.
+
+        Returns:
+            list of the new resources.Moneyline, Spread or Total, oldest first, in the
+                parse mode of the cache. Empty if there are none, or the line id could
+                not be found.
+        """
+        if market not in _markets:
+            raise ValueError(f"{market!r} is not a market.")
+        data = self.rundown._build_url_and_get_json("lines", line_id, market)
+        raw_lines = data.get(f"{market}s") or []
+
+        with self._lock:
+            key = (market, line_id)
+            history = self._histories.get(key)
+            if history is None:
+                history = self._histories[key] = _CachedHistory(line_id, market)
+
+            new = []
+            for raw in raw_lines:
+                t = _epoch(raw["date_updated"])
+                if t < history.last_updated:
+                    continue
+                if t == history.last_updated:
+                    if decoder.dumps(raw) in history.last_lines:
+                        continue
+                new.append((t, raw))
+            if not new:
+                return []
+            new.sort(key=lambda pair: pair[0])
+
+            last_updated = new[-1][0]
+            if last_updated > history.last_updated:
+                history.last_updated = last_updated
+                history.last_lines = set()
+            history.last_lines.update(
+                decoder.dumps(raw) for t, raw in new if t == last_updated
+            )
+
+            resource = list[_markets[market]]
+            with user_context(self.rundown._context_timezone(None)):
+                lines = self.rundown._parse_as(
+                    resource, [raw for _, raw in new], self.parse
+                )
+            history.lines.extend(lines)
+            history.series.extend(lines)
+            return list(lines)
+
+    def history(self, market: str, line_id: int) -> list:
+        """Get every cached line of a line id, oldest first."""
+        with self._lock:
+            history = self._histories.get((market, line_id))
+            return [] if history is None else list(history.lines)
+
+    def series(self, market: str, line_id: int) -> Optional[LineSeries]:
+        """Get the cached history of a line as a LineSeries, or None if not cached.
+
+        The series is extended in place by refreshes.
+        """
+        with self._lock:
+            history = self._histories.get((market, line_id))
+            return None if history is None else history.series
+
+    def last_updated(self, market: str, line_id: int) -> Optional[float]:
+        """Epoch time the last cached line was updated, or None if there is none."""
+        with self._lock:
+            history = self._histories.get((market, line_id))
+            if history is None or not history.lines:
+                return None
+            return history.last_updated
+
+    def discard(self, market: str, line_id: int):
+        """Remove the cached history of a line, such as that of a finished event."""
+        with self._lock:
+            self._histories.pop((market, line_id), None)
+
+    def clear(self):
+        """Remove every cached history."""
+        with self._lock:
+            self._histories = {}
+
+    def __len__(self) -> int:
+        return len(self._histories)
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        return key in self._histories
@@ -0,0 +1,150 @@
+from typing import Any, Union
+
+from pydantic import BaseModel, ValidationError
+from pydantic.class_validators import make_generic_validator
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+from rundown.resources.event import Event
+from rundown.resources.line import Moneyline, Spread, Total, SpreadElement, TotalElement
+from rundown.resources.schedule import Schedule
+from rundown.resources.validators import change_timezone, make_none_if_not_published
+from rundown.usercontext import user_context
+
+"""Module for the 'lazy' and 'raw' parse modes of Rundown methods.
+
+'lazy' wraps the decoded JSON in Lazy objects, which validate each field the first
+time it is accessed. 'raw' returns the decoded JSON with only the timezone and 'Not
+Published' normalizations applied.
+"""
+
+
+def _fields_validated_by(func, *resources: type[BaseModel]) -> frozenset[str]:
+    """Names of the fields of resources that have func as a validator."""
+    return frozenset(
+        name
+        for resource in resources
+        for name, field in resource.__fields__.items()
+        if any(v.func is func for v in field.class_validators.values())
+    )
+
+
+_date_keys = _fields_validated_by(change_timezone, Event, Moneyline, Schedule)
+_price_keys = _fields_validated_by(
+    make_none_if_not_published, Moneyline, Spread, Total, SpreadElement, TotalElement
+)
+
+
+def _is_model(t: Any) -> bool:
+    return isinstance(t, type) and issubclass(t, BaseModel)
+
+
+class Lazy:
+    """Wrapper around the JSON for a resource that validates a field the first time
+    it is accessed, and then keeps the result.
+
+    Fields holding resources, or lists or dicts of resources, are wrapped in Lazy
+    objects, so accessing event.lines doesn't validate every line of every sportsbook.
+    Validators run with the timezone of the request that returned the JSON.
+
+    Example:
+        events = r.events("MLB", "2021-05-11", parse="lazy")
+        for event in events.events:
+            ml = event.lines["Pinnacle"].moneyline.moneyline_home
+
+    Attributes:
+        resource (type[BaseModel]): The resource the JSON is for.
+        raw (dict): The JSON. It must not be mutated.
+    """
+
+    def __init__(self, resource: type[BaseModel], raw: dict, timezone: str):
+        self.resource = resource
+        self.raw = raw
+        self._timezone = timezone
+
+    def __getattr__(self, name: str) -> Any:
+        fields = self.__dict__["resource"].__fields__
+        if name not in fields:
+            raise AttributeError(
+                f"{self.resource.__name__!r} object has no attribute {name!r}"
+            )
+        value = self._validate(fields[name])
+        # Cache the value, so __getattr__ isn't called for this field again.
+        self.__dict__[name] = value
+        return value
+
+    def _validate(self, field) -> Any:
+        if field.alias not in self.raw:
+            if field.required:
+                error = ErrorWrapper(MissingError(), loc=field.alias)
+                raise ValidationError([error], self.resource)
+            return field.get_default()
+
+        value = self.raw[field.alias]
+        resource = self.resource
+        with user_context(self._timezone):
+            if value is None or not _is_model(field.type_):
+                value, error = field.validate(value, {}, loc=field.alias, cls=resource)
+                if error:
+                    raise ValidationError([error], resource)
+                return value
+
+            value = self._wrap(field, value)
+            # Validators of fields holding resources, such as the one swapping
+            # sportsbook IDs for names, get the wrapped resources.
+            for validator in field.class_validators.values():
+                validate = make_generic_validator(validator.func)
+                value = validate(resource, value, {}, field, resource.__config__)
+            return value
+
+    def _wrap(self, field, value: Any) -> Union["Lazy", list, dict]:
+        resource, timezone = field.type_, self._timezone
+        if field.shape == SHAPE_SINGLETON:
+            return Lazy(resource, value, timezone)
+        if field.shape == SHAPE_LIST:
+            return [Lazy(resource, v, timezone) for v in value]
+        return {k: Lazy(resource, v, timezone) for k, v in value.items()}
+
+    def model(self) -> BaseModel:
+        """Validate every field, and get the resource."""
+        with user_context(self._timezone):
+            return self.resource(**self.raw)
+
+    def __repr__(self) -> str:
+        return f"Lazy({self.resource.__name__})"
+
+
+def lazy(resource: type[BaseModel], raw: Union[dict, list], timezone: str) -> Any:
+    """Wrap raw, or each item of raw if it is a list, in Lazy objects."""
+    if isinstance(raw, list):
+        return [Lazy(resource, r, timezone) for r in raw]
+    return Lazy(resource, raw, timezone)
+
+
+def normalize(raw: Any) -> Any:
+    """Apply the timezone and 'Not Published' normalizations to decoded JSON.
+
+    Dates are converted to context_timezone, and prices with the 'Not Published'
+    marker become None, as with the resources. Nothing else is validated, and
+    sportsbooks are still keyed by ID. raw isn't mutated, because responses may be
+    shared by the cache.
+
+    Returns:
+        A normalized copy of raw.
+    """
+    if isinstance(raw, list):
+        return [normalize(v) for v in raw]
+    if not isinstance(raw, dict):
+        return raw
+
+    normalized = {}
+    for k, v in raw.items():
+        if k in _date_keys and isinstance(v, str):
+            v = change_timezone(v)
+        elif k in _price_keys and type(v) in (int, float):
+            v = make_none_if_not_published(v)
+        elif isinstance(v, (dict, list)):
+            v = normalize(v)
+        normalized[k] = v
+    return normalized
@@ -0,0 +1,163 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Union
+
+from rundown import decoder
+from rundown.resources.event import Event, SportsbookLines, SportsbookLinePeriods
+from rundown.resources.events import Events, Meta
+from rundown.usercontext import context_timezone
+
+"""Module for reusing the resources parsed from unchanged parts of responses."""
+
+ModelCacheInfo = namedtuple(
+    "ModelCacheInfo",
+    ["event_hits", "event_misses", "line_hits", "line_misses", "maxsize", "currsize"],
+)
+
+_line_fields = {"lines": SportsbookLines, "line_periods": SportsbookLinePeriods}
+
+
+def _digest(obj: Any) -> bytes:
+    return hashlib.blake2b(decoder.dumps(obj), digest_size=16).digest()
+
+
+class ModelCache:
+    """Thread-safe LRU cache of parsed events, keyed by a fingerprint of their JSON.
+
+    Full and delta responses keep resending events whose lines haven't moved. Each
+    raw event, and each sportsbook's lines in it, is fingerprinted with a hash of its
+    JSON. An event with a known fingerprint reuses the Event parsed before, skipping
+    validation. Otherwise only the sportsbooks with new fingerprints are validated.
+
+    Fingerprints include the timezone used by validators. Reused resources are shared
+    between responses, so they must not be mutated.
+
+    Args:
+        maxsize: Maximum number of events and sportsbook lines held. The least
+            recently used entry is evicted when the cache is full.
+
+    Example:
+        model_cache = ModelCache()
+        r = Rundown(api_key, model_cache=model_cache)
+        ...
+        print(model_cache.event_hit_rate, model_cache.line_hit_rate)
+
+    Attributes:
+        event_hits (int): Events reused whole.
+        event_misses (int): Events that had to be parsed.
+        line_hits (int): Sportsbook lines reused in events that had to be parsed.
+        line_misses (int): Sportsbook lines that had to be parsed.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self.event_hits = 0
+        self.event_misses = 0
+        self.line_hits = 0
+        self.line_misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse_events(self, data: dict) -> Events:
+        """Parse an events response, like Events(**data)."""
+        events = [self.parse_event(e) for e in data["events"]]
+        return Events.construct(meta=Meta(**data["meta"]), events=events)
+
+    def parse_event(self, raw: dict) -> Event:
+        """Parse a raw event, like Event(**raw)."""
+        timezone = context_timezone.get()
+        fingerprint = hashlib.blake2b(timezone.encode(), digest_size=16)
+        base = {}
+        digests = {}
+        for k, v in raw.items():
+            if k in _line_fields and v:
+                digests[k] = {a: _digest(lines) for a, lines in v.items()}
+                for affiliate, digest in digests[k].items():
+                    fingerprint.update(f"{k}/{affiliate}".encode())
+                    fingerprint.update(digest)
+            else:
+                base[k] = v
+        fingerprint.update(decoder.dumps(base))
+
+        key = ("event", fingerprint.digest())
+        event = self._get(key)
+        if event is not None:
+            with self._lock:
+                self.event_hits += 1
+            return event
+        with self._lock:
+            self.event_misses += 1
+
+        hits = misses = 0
+        line_models = {}
+        for field, affiliate_digests in digests.items():
+            resource = _line_fields[field]
+            models = {}
+            for affiliate, digest in affiliate_digests.items():
+                line_key = (field, timezone, digest)
+                model = self._get(line_key)
+                if model is None:
+                    misses += 1
+                    model = resource(**raw[field][affiliate])
+                    self._set(line_key, model)
+                else:
+                    hits += 1
+                models[affiliate] = model
+            line_models[field] = models
+        with self._lock:
+            self.line_hits += hits
+            self.line_misses += misses
+
+        event = Event(**base)
+        # Validating lines that are already models copies them, so they are set after
+        # validation, and the cached lines are shared with the event.
+        for field, models in line_models.items():
+            setattr(event, field, Event.use_sportsbook_names(models))
+        self._set(key, event)
+        return event
+
+    def _get(self, key: tuple) -> Union[Event, SportsbookLines, None]:
+        with self._lock:
+            model = self._data.get(key)
+            if model is not None:
+                self._data.move_to_end(key)
+            return model
+
+    def _set(self, key: tuple, model: Union[Event, SportsbookLines]):
+        with self._lock:
+            self._data[key] = model
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    @property
+    def event_hit_rate(self) -> float:
+        """Fraction of parsed events that were reused whole."""
+        total = self.event_hits + self.event_misses
+        return self.event_hits / total if total else 0.0
+
+    @property
+    def line_hit_rate(self) -> float:
+        """Fraction of sportsbook lines reused, in events that had to be parsed."""
+        total = self.line_hits + self.line_misses
+        return self.line_hits / total if total else 0.0
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.event_hits = self.event_misses = 0
+            self.line_hits = self.line_misses = 0
+
+    def info(self) -> ModelCacheInfo:
+        """Get hit and miss counts, and the current size of the cache."""
+        with self._lock:
+            return ModelCacheInfo(
+                self.event_hits,
+                self.event_misses,
+                self.line_hits,
+                self.line_misses,
+                self.maxsize,
+                len(self._data),
+            )
@@ -0,0 +1,297 @@
+import threading
+from collections.abc import Iterable
+from typing import Union, Optional
+
+from rundown.resources.event import Event, SportsbookLines, SportsbookLinePeriods
+from rundown.resources.events import Events
+from rundown.resources.line import Moneyline, Spread, Total
+from rundown.static.static import sportsbook_dict
+
+"""Module containing the in-memory book of current odds, updated from deltas."""
+
+_periods = tuple(SportsbookLinePeriods.__fields__)
+
+LineKey = tuple[str, str, Optional[str]]
+
+
+# Marks a key removed from the layers under the one it is in.
+_DELETED = object()
+_MISSING = object()
+
+
+class _Layers:
+    """Mapping stored as a stack of dicts, looked up from the newest.
+
+    Snapshots share the layers, which are then frozen. The next write pushes an empty
+    layer on top instead of copying the mapping, so writing after a snapshot costs
+    time proportional to the entries written, amortized. Layers at least half the
+    size of the one under them are merged into it, which keeps the number of layers
+    logarithmic in the number of entries.
+    """
+
+    def __init__(self, layers: Optional[list[dict]] = None, size: int = 0):
+        self._layers = layers or [{}]
+        self._size = size
+        # Whether a snapshot shares the top layer, which must then not be changed.
+        self._frozen = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _DELETED) is not _DELETED
+
+    def __iter__(self):
+        seen = set()
+        for layer in self._layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    if key in self:
+                        yield key
+
+    def get(self, key, default=None):
+        for layer in reversed(self._layers):
+            value = layer.get(key, _MISSING)
+            if value is not _MISSING:
+                return default if value is _DELETED else value
+        return default
+
+    def snapshot(self) -> "_Layers":
+        """Get a copy sharing the layers, which are frozen."""
+        self._frozen = True
+        snapshot = _Layers(self._layers, self._size)
+        snapshot._frozen = True
+        return snapshot
+
+    def __setitem__(self, key, value):
+        self._thaw()
+        if key not in self:
+            self._size += 1
+        self._layers[-1][key] = value
+
+    def pop(self, key, default=None):
+        value = self.get(key, _DELETED)
+        if value is _DELETED:
+            return default
+        self._thaw()
+        self._size -= 1
+        if len(self._layers) == 1:
+            del self._layers[0][key]
+        else:
+            self._layers[-1][key] = _DELETED
+        return value
+
+    def _thaw(self):
+        if not self._frozen:
+            return
+        # The list is replaced rather than changed, as readers may be iterating it.
+        layers = list(self._layers)
+        while len(layers) > 1 and 2 * len(layers[-1]) >= len(layers[-2]):
+            top = layers.pop()
+            merged = {**layers[-1], **top}
+            if len(layers) == 1:
+                merged = {k: v for k, v in merged.items() if v is not _DELETED}
+            layers[-1] = merged
+        layers.append({})
+        self._layers = layers
+        self._frozen = False
+
+
+def _affiliate_name(affiliate: Union[int, str]) -> str:
+    """Events key lines by sportsbook name, or by ID if the name isn't known."""
+    return sportsbook_dict.get(str(affiliate), str(affiliate))
+
+
+class _BookView:
+    """Queries shared by OddsBook and OddsBookSnapshot.
+
+    Lines are keyed by (event_id, affiliate, period). period is None for Event.lines,
+    or one of the SportsbookLinePeriods fields, such as 'period_full_game', for
+    Event.line_periods.
+    """
+
+    def __init__(self, events: _Layers, lines: _Layers):
+        self._events = events
+        self._lines = lines
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._events
+
+    def event_ids(self) -> list[str]:
+        return list(self._events)
+
+    def event(self, event_id: str) -> Optional[Event]:
+        """Get the event with every line merged into it so far, or None."""
+        return self._events.get(event_id)
+
+    def lines(
+        self,
+        event_id: str,
+        affiliate: Union[int, str],
+        period: Optional[str] = None,
+    ) -> Optional[SportsbookLines]:
+        """Get the current lines of a sportsbook for an event.
+
+        Args:
+            event_id: The event id.
+            affiliate: The sportsbook name, such as 'Pinnacle', or its ID.
+            period: None for the lines in Event.lines, or a period such as
+                'period_full_game' for the lines in Event.line_periods.
+
+        Returns:
+            resources.event.SportsbookLines, or SportsbookLinePeriod if period is
+                given. None if there are no such lines.
+        """
+        return self._lines.get((event_id, _affiliate_name(affiliate), period))
+
+    def moneyline(
+        self,
+        event_id: str,
+        affiliate: Union[int, str],
+        period: Optional[str] = None,
+    ) -> Optional[Moneyline]:
+        """Get the current moneyline of a sportsbook for an event. See lines."""
+        lines = self.lines(event_id, affiliate, period)
+        return None if lines is None else lines.moneyline
+
+    def spread(
+        self,
+        event_id: str,
+        affiliate: Union[int, str],
+        period: Optional[str] = None,
+    ) -> Optional[Spread]:
+        """Get the current spread of a sportsbook for an event. See lines."""
+        lines = self.lines(event_id, affiliate, period)
+        return None if lines is None else lines.spread
+
+    def total(
+        self,
+        event_id: str,
+        affiliate: Union[int, str],
+        period: Optional[str] = None,
+    ) -> Optional[Total]:
+        """Get the current total of a sportsbook for an event. See lines."""
+        lines = self.lines(event_id, affiliate, period)
+        return None if lines is None else lines.total
+
+
+class OddsBookSnapshot(_BookView):
+    """Read-only view of an OddsBook at one point in time, returned by
+    OddsBook.snapshot. Later updates to the book are not visible in it.
+    """
+
+
+class OddsBook(_BookView):
+    """Thread-safe in-memory book of the current events and lines.
+
+    Events from full responses and from Rundown.events_delta are merged in with apply.
+    Each event replaces the stored event, but its lines are merged per sportsbook, so
+    a delta that only has some sportsbooks keeps the lines of the others. Applying an
+    event costs time proportional to its number of lines, not to the size of the book.
+
+    Single queries are dictionary lookups. Use snapshot for several queries that must
+    see the same state while other threads apply updates. Stored resources are never
+    mutated, so they may be shared with readers.
+
+    Example:
+        book = OddsBook()
+        for events in DeltaPoller(r, ["NBA"]):
+            book.apply(events)
+            ml = book.moneyline(event_id, "Pinnacle")
+
+    Attributes:
+        delta_last_id (Optional[str]): The delta_last_id of the last applied Events.
+    """
+
+    def __init__(self, events: Optional[Events] = None):
+        super().__init__(_Layers(), _Layers())
+        self._lock = threading.Lock()
+        self.delta_last_id = None
+        if events is not None:
+            self.apply(events)
+
+    def snapshot(self) -> OddsBookSnapshot:
+        """Get a consistent read-only view of the book.
+
+        Taking a snapshot doesn't copy the book. Later updates are written to a new
+        layer on top of the entries the snapshot sees, so they cost time
+        proportional to the lines they change, amortized, not to the size of the
+        book.
+        """
+        with self._lock:
+            return OddsBookSnapshot(self._events.snapshot(), self._lines.snapshot())
+
+    def apply(self, events: Union[Events, Iterable[Event]]) -> set[str]:
+        """Merge events into the book.
+
+        Args:
+            events: resources.Events returned by an events method or
+                Rundown.events_delta, or any iterable of resources.Event.
+
+        Returns:
+            The ids of the events that were applied.
+        """
+        if isinstance(events, Events):
+            last_id, events = events.meta.delta_last_id, events.events
+        else:
+            last_id = None
+
+        with self._lock:
+            applied = set()
+            for event in events:
+                self._apply_event(event)
+                applied.add(event.event_id)
+            if last_id is not None:
+                self.delta_last_id = last_id
+        return applied
+
+    def discard(self, event_ids: Iterable[str]):
+        """Remove events and their lines from the book, such as finished events."""
+        with self._lock:
+            for event_id in event_ids:
+                event = self._events.pop(event_id, None)
+                if event is not None:
+                    for key in self._line_keys(event):
+                        self._lines.pop(key, None)
+
+    def clear(self):
+        """Remove every event and line."""
+        with self._lock:
+            self._events, self._lines = _Layers(), _Layers()
+            self.delta_last_id = None
+
+    def _apply_event(self, event: Event):
+        # Only the incoming lines are indexed, the others already are.
+        new_lines, new_line_periods = event.lines or {}, event.line_periods or {}
+        old = self._events.get(event.event_id)
+        update = {}
+        if old is not None:
+            # Merge lines per sportsbook, keeping those missing from the update.
+            for field in ("lines", "line_periods"):
+                old_value, new_value = getattr(old, field), getattr(event, field)
+                if old_value and new_value is not None:
+                    update[field] = {**old_value, **new_value}
+                elif old_value and new_value is None:
+                    update[field] = old_value
+        if update:
+            event = event.copy(update=update)
+        self._events[event.event_id] = event
+
+        for affiliate, lines in new_lines.items():
+            self._lines[(event.event_id, affiliate, None)] = lines
+        for affiliate, line_periods in new_line_periods.items():
+            for period in _periods:
+                key = (event.event_id, affiliate, period)
+                self._lines[key] = getattr(line_periods, period)
+
+    @staticmethod
+    def _line_keys(event: Event) -> list[LineKey]:
+        keys = [(event.event_id, a, None) for a in event.lines or {}]
+        keys += [
+            (event.event_id, a, p) for a in event.line_periods or {} for p in _periods
+        ]
+        return keys
@@ -0,0 +1,263 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from pathlib import Path
+from typing import Union, Optional, Literal
+
+import arrow
+
+from rundown.resources.events import Events, Meta
+
+"""Module for following live odds with the /delta route."""
+
+
+class _PollerBase:
+    """State shared by DeltaPoller and AsyncDeltaPoller.
+
+    Subclasses are responsible for making requests with their client.
+    """
+
+    def __init__(
+        self,
+        rundown,
+        sports: Iterable[Union[int, str]],
+        *include: Literal["all_periods", "scores"],
+        dates: Optional[Iterable[str]] = None,
+        checkpoint: Optional[Union[str, Path]] = None,
+        min_interval: float = 1,
+        max_interval: float = 30,
+        backoff: float = 2,
+    ):
+        self.rundown = rundown
+        self.sport_ids = tuple(rundown._validate_sport(s) for s in sports)
+        if len(self.sport_ids) == 0:
+            raise ValueError("At least one sport is required.")
+        self.include = include
+        self.dates = None if dates is None else list(dates)
+        if self.dates is not None and len(self.dates) == 0:
+            raise ValueError("At least one date is required, or None for today.")
+        self.checkpoint = None if checkpoint is None else Path(checkpoint)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.last_id = self._load_checkpoint()
+        self.full_refreshes = 0
+
+    def _seed_calls(self) -> list[tuple[int, str]]:
+        """The (sport_id, date) pairs requested by a full refresh."""
+        if self.dates is None:
+            dates = [arrow.now(self.rundown.timezone).format("YYYY-MM-DD")]
+        else:
+            dates = self.dates
+        return [(s, d) for s in self.sport_ids for d in dates]
+
+    def _delta_sport(self) -> Optional[int]:
+        """The /delta route filters by one sport at most, so with several sports every
+        change is requested and filtered by _filter.
+        """
+        return self.sport_ids[0] if len(self.sport_ids) == 1 else None
+
+    def _filter(self, events: Events) -> Events:
+        if len(self.sport_ids) == 1:
+            return events
+        kept = [e for e in events.events if e.sport_id in self.sport_ids]
+        return Events.construct(meta=events.meta, events=kept)
+
+    def _after_refresh(self, results: list[Events]) -> Events:
+        """Combine the responses of a full refresh, and resume from the first of them.
+
+        Responses are requested one after another, so the first delta_last_id is the
+        oldest, and following it can't miss a change made during the refresh.
+        """
+        meta = Meta(delta_last_id=results[0].meta.delta_last_id)
+        events = Events.construct(
+            meta=meta, events=[e for r in results for e in r.events]
+        )
+        self.full_refreshes += 1
+        self.interval = self.min_interval
+        self._set_last_id(meta.delta_last_id)
+        return events
+
+    def _after_delta(self, events: Events) -> Events:
+        events = self._filter(events)
+        if len(events.events) > 0:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        self._set_last_id(events.meta.delta_last_id)
+        return events
+
+    def _set_last_id(self, last_id: str):
+        self.last_id = last_id
+        self._save_checkpoint()
+
+    def _checkpoint_state(self) -> dict:
+        return {
+            "last_id": self.last_id,
+            "sport_ids": list(self.sport_ids),
+            "include": sorted(self.include),
+            "saved_at": time.time(),
+        }
+
+    def _load_checkpoint(self) -> Optional[str]:
+        """Get the last_id saved by a poller following the same sports and include.
+
+        Returns:
+            The saved last_id, or None if there is no usable checkpoint.
+        """
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return None
+        try:
+            state = json.loads(self.checkpoint.read_text())
+        except ValueError:
+            return None
+        if state.get("sport_ids") != list(self.sport_ids) or state.get(
+            "include"
+        ) != sorted(self.include):
+            return None
+        return state.get("last_id")
+
+    def _save_checkpoint(self):
+        """Write the checkpoint atomically, so a crash never leaves a partial file."""
+        if self.checkpoint is None:
+            return
+        tmp = self.checkpoint.with_name(f"{self.checkpoint.name}.tmp")
+        tmp.write_text(json.dumps(self._checkpoint_state()))
+        os.replace(tmp, self.checkpoint)
+
+
+class DeltaPoller(_PollerBase):
+    """Follows changes to events with Rundown.events_delta.
+
+    The first poll is a full refresh, which requests events for every sport and date
+    with Rundown.events. Later polls request the changes since the delta_last_id of the
+    previous response. If the server no longer accepts that id, because the delta
+    window has expired, the poller falls back to a full refresh.
+
+    When a poll returns no changes, the interval until the next poll grows by backoff,
+    up to max_interval. It drops back to min_interval as soon as something changes.
+
+    The last delta_last_id is written to checkpoint after every poll, so a restarted
+    poller following the same sports resumes from it without a full refresh.
+
+    Args:
+        rundown: The Rundown client used to make requests.
+        sports: IDs or names of the leagues to follow.
+        include: Any of 'all_periods' and 'scores'. See Rundown.events.
+        dates: The dates requested by a full refresh. Defaults to the current date in
+            the client's timezone.
+        checkpoint: Optional path of a JSON file holding the last delta_last_id.
+        min_interval: Seconds between polls while events are changing.
+        max_interval: Maximum seconds between polls.
+        backoff: Factor the interval grows by after a poll without changes.
+
+    Raises:
+        ValueError: If sports or dates is empty.
+
+    Example:
+        poller = DeltaPoller(r, ["NBA"], checkpoint="nba.json")
+        for events in poller:
+            for event in events.events:
+                ...
+
+    Attributes:
+        last_id (Optional[str]): The delta_last_id polls resume from.
+        interval (float): Seconds until the next poll.
+        full_refreshes (int): Number of full refreshes made.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stopped = threading.Event()
+
+    def refresh(self) -> Events:
+        """Request events for every sport and date, and resume polling from there.
+
+        Returns:
+            resources.Events with the events of every response.
+        """
+        results = [
+            self.rundown.events(sport_id, date, *self.include)
+            for sport_id, date in self._seed_calls()
+        ]
+        return self._after_refresh(results)
+
+    def poll(self) -> Events:
+        """Get the events that changed since the last poll.
+
+        Returns:
+            resources.Events with the changed events, or every event if a full refresh
+                was needed.
+        """
+        if self.last_id is None:
+            return self.refresh()
+        events = self.rundown.events_delta(
+            self.last_id, *self.include, sport=self._delta_sport()
+        )
+        if events is None:
+            return self.refresh()
+        return self._after_delta(events)
+
+    def stop(self):
+        """Stop iterating. Can be called from another thread."""
+        self._stopped.set()
+
+    def __iter__(self) -> Iterator[Events]:
+        """Poll until stop is called, waiting interval seconds between polls.
+
+        Yields:
+            resources.Events returned by each poll, including polls without changes.
+        """
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            yield self.poll()
+            self._stopped.wait(self.interval)
+
+
+class AsyncDeltaPoller(_PollerBase):
+    """Follows changes to events with AsyncRundown.events_delta. See DeltaPoller.
+
+    Example:
+        poller = AsyncDeltaPoller(r, ["NBA"], checkpoint="nba.json")
+        async for events in poller:
+            ...
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stopped = False
+
+    async def refresh(self) -> Events:
+        """Request events for every sport and date. See DeltaPoller.refresh."""
+        results = [
+            await self.rundown.events(sport_id, date, *self.include)
+            for sport_id, date in self._seed_calls()
+        ]
+        return self._after_refresh(results)
+
+    async def poll(self) -> Events:
+        """Get the events that changed since the last poll. See DeltaPoller.poll."""
+        if self.last_id is None:
+            return await self.refresh()
+        events = await self.rundown.events_delta(
+            self.last_id, *self.include, sport=self._delta_sport()
+        )
+        if events is None:
+            return await self.refresh()
+        return self._after_delta(events)
+
+    def stop(self):
+        """Stop iterating after the current poll."""
+        self._stopped = True
+
+    async def __aiter__(self) -> AsyncIterator[Events]:
+        """Poll until stop is called. See DeltaPoller.__iter__."""
+        self._stopped = False
+        while not self._stopped:
+            yield await self.poll()
+            if not self._stopped:
+                await asyncio.sleep(self.interval)
@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+"""Module containing the client-side rate limiters used by Rundown clients."""
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where only FileTokenBucket is unsupported.
+    fcntl = None
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of requests to the API.
+
+    Each request takes a token. Tokens are refilled at `rate` per second, up to
+    `capacity`, which is the largest burst allowed. Share one bucket between clients
+    to limit them together.
+
+    The bucket also follows the quota headers returned by the API. When the quota is
+    used up, requests wait until the quota resets. If pace_quota is True, the refill
+    rate is lowered so the remaining quota lasts until it resets.
+
+    Args:
+        rate: Requests per second.
+        capacity: Maximum burst of requests. Defaults to rate, and at least 1.
+        remaining_header: Name of the header with the remaining request quota.
+        reset_header: Name of the header with the seconds until the quota resets.
+        pace_quota: Whether to spread the remaining quota until it resets.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        remaining_header: str = "X-RateLimit-requests-Remaining",
+        reset_header: str = "X-RateLimit-requests-Reset",
+        pace_quota: bool = False,
+    ):
+        self.rate = rate
+        self.capacity = max(1, rate) if capacity is None else capacity
+        self.remaining_header = remaining_header
+        self.reset_header = reset_header
+        self.pace_quota = pace_quota
+        self._lock = threading.Lock()
+        self._state = self._initial_state()
+
+    def _initial_state(self) -> dict:
+        return {
+            "tokens": self.capacity,
+            "rate": self.rate,
+            "updated": time.time(),
+            "resume_at": 0.0,
+        }
+
+    @contextmanager
+    def _transaction(self):
+        """Give exclusive access to the bucket state."""
+        with self._lock:
+            yield self._state
+
+    def reserve(self) -> float:
+        """Take a token for one request.
+
+        Returns:
+            float: The number of seconds to wait before making the request.
+        """
+        with self._transaction() as state:
+            now = time.time()
+            self._refill(state, now)
+            state["tokens"] -= 1
+            wait = -state["tokens"] / state["rate"] if state["tokens"] < 0 else 0.0
+            return max(wait, state["resume_at"] - now)
+
+    def acquire(self):
+        """Take a token for one request, sleeping until the request may be made."""
+        time.sleep(self.reserve())
+
+    def update(self, headers: Mapping[str, str]):
+        """Adapt to the quota headers of a response.
+
+        Args:
+            headers: The response headers. Lookups must be case insensitive.
+        """
+        remaining = _float_header(headers, self.remaining_header)
+        reset = _float_header(headers, self.reset_header)
+        if remaining is None or reset is None:
+            return
+
+        with self._transaction() as state:
+            now = time.time()
+            self._refill(state, now)
+            if remaining <= 0:
+                state["resume_at"] = now + reset
+                state["tokens"] = min(state["tokens"], 0)
+            elif self.pace_quota and reset > 0:
+                state["rate"] = min(self.rate, remaining / reset)
+            else:
+                state["rate"] = self.rate
+
+    def _refill(self, state: dict, now: float):
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(self.capacity, state["tokens"] + elapsed * state["rate"])
+        state["updated"] = now
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket shared between processes through a lock file.
+
+    The bucket state is stored in the file at path, which is locked while it is read
+    and updated. Every process using the same path shares the same rate limit. Only
+    supported on POSIX systems. AsyncRundown runs the file I/O in a thread, so it
+    doesn't block the event loop.
+
+    Args:
+        path: Path of the state file. It is created if it doesn't exist.
+        rate: Requests per second.
+        capacity: Maximum burst of requests. See TokenBucket.
+        kwargs: Passed to TokenBucket.
+
+    Raises:
+        NotImplementedError: If the platform has no fcntl module, as on Windows.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        rate: float,
+        capacity: Optional[float] = None,
+        **kwargs,
+    ):
+        if fcntl is None:
+            raise NotImplementedError(
+                "FileTokenBucket requires fcntl, which is only available on POSIX."
+            )
+        self.path = Path(path)
+        super().__init__(rate, capacity, **kwargs)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock, open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                state = json.loads(content) if content else self._initial_state()
+                yield state
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _float_header(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -1,6 +1,14 @@
-from pydantic import BaseModel
+from functools import wraps
+from typing import Any, Optional, Union
 
-from rundown.resources.event import Event
+from pydantic import BaseModel, PrivateAttr, validator
+
+from rundown.resources.event import (
+    Event,
+    SportsbookLinePeriod,
+    SportsbookLinePeriods,
+    SportsbookLines,
+)
 
 """Module for resources used by Rundown events methods."""
 
@@ -11,8 +19,159 @@ class Meta(BaseModel):
     delta_last_id: str
 
 
+def _changing(method):
+    @wraps(method)
+    def changing(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    return changing
+
+
+class EventList(list):
+    """List of events counting its changes, so indexes built from it can tell they
+    are stale.
+
+    Attributes:
+        version (int): Incremented by every method that changes the list.
+    """
+
+    version = 0
+
+    __setitem__ = _changing(list.__setitem__)
+    __delitem__ = _changing(list.__delitem__)
+    __iadd__ = _changing(list.__iadd__)
+    __imul__ = _changing(list.__imul__)
+    append = _changing(list.append)
+    extend = _changing(list.extend)
+    insert = _changing(list.insert)
+    pop = _changing(list.pop)
+    remove = _changing(list.remove)
+    clear = _changing(list.clear)
+    sort = _changing(list.sort)
+    reverse = _changing(list.reverse)
+
+
 class Events(BaseModel):
-    """Class holding a list of Event resources. Used by Rundown events methods."""
+    """Class holding a list of Event resources. Used by Rundown events methods.
+
+    Lookups by event id, team, status and sportsbook use indexes, each built on its
+    first lookup with a single pass over events. events is an EventList, so indexes are
+    rebuilt after it is reassigned or changed in any way, including replacing an
+    event. Changing the fields of an event isn't noticed: call invalidate_indexes
+    after doing so.
+    """
 
     meta: Meta
     events: list[Event]
+
+    _indexes: dict[str, dict] = PrivateAttr(default_factory=dict)
+    # id and version of the events list the indexes were built from.
+    _indexed: Optional[tuple[int, int]] = PrivateAttr(default=None)
+
+    @validator("events")
+    def _count_changes(cls, events: list[Event]) -> EventList:
+        return events if isinstance(events, EventList) else EventList(events)
+
+    def __setattr__(self, name: str, value: Any):
+        if name == "events" and not isinstance(value, EventList):
+            value = EventList(value)
+        super().__setattr__(name, value)
+        if name == "events":
+            self.invalidate_indexes()
+
+    def invalidate_indexes(self):
+        """Drop the indexes, so they are rebuilt from events on the next lookup."""
+        self._indexes = {}
+        self._indexed = None
+
+    def _index(self, name: str) -> dict:
+        # Events made with construct skip validation, and may hold a plain list.
+        events = self.events
+        state = (id(events), getattr(events, "version", len(events)))
+        if self._indexed != state:
+            self._indexes = {}
+            self._indexed = state
+        index = self._indexes.get(name)
+        if index is None:
+            index = self._indexes[name] = getattr(self, f"_build_{name}_index")()
+        return index
+
+    def _build_event_id_index(self) -> dict[str, Event]:
+        return {event.event_id: event for event in self.events}
+
+    def _build_team_index(self) -> dict[int, list[Event]]:
+        index = {}
+        for event in self.events:
+            for team in event.teams_normalized:
+                index.setdefault(team.team_id, []).append(event)
+        return index
+
+    def _build_status_index(self) -> dict[str, list[Event]]:
+        index = {}
+        for event in self.events:
+            if event.score is not None:
+                index.setdefault(event.score.event_status, []).append(event)
+        return index
+
+    def _build_affiliate_index(self) -> dict[tuple, list[tuple[Event, Any]]]:
+        # Keyed by (sportsbook name, period) and (affiliate id, period), with a None
+        # period for Event.lines.
+        index = {}
+        for event in self.events:
+            for name, lines in (event.lines or {}).items():
+                for key in {name, lines.affiliate.affiliate_id}:
+                    index.setdefault((key, None), []).append((event, lines))
+            for name, line_periods in (event.line_periods or {}).items():
+                for period in SportsbookLinePeriods.__fields__:
+                    lines = getattr(line_periods, period)
+                    for key in {name, lines.affiliate.affiliate_id}:
+                        index.setdefault((key, period), []).append((event, lines))
+        return index
+
+    def get_event(self, event_id: str) -> Optional[Event]:
+        """Get the event with an event id, or None if there is none."""
+        return self._index("event_id").get(event_id)
+
+    def by_team(self, team_id: int) -> list[Event]:
+        """Get the events of a team, by the team_id of Event.teams_normalized."""
+        return list(self._index("team").get(team_id, ()))
+
+    def by_status(self, event_status: str) -> list[Event]:
+        """Get the events with a status, such as 'STATUS_SCHEDULED'.
+
+        Events without a score have no status, and are never returned.
+        """
+        return list(self._index("status").get(event_status, ()))
+
+    def by_affiliate(
+        self, affiliate: Union[int, str], period: Optional[str] = None
+    ) -> list[tuple[Event, Union[SportsbookLines, SportsbookLinePeriod]]]:
+        """Get the lines of a sportsbook in every event it has lines for.
+
+        Args:
+            affiliate: The affiliate id, or the key of the sportsbook in Event.lines,
+                such as 'Pinnacle'.
+            period: None for Event.lines, or a period of Event.line_periods, such as
+                'period_full_game'.
+
+        Returns:
+            list of (resources.Event, resources.SportsbookLines) tuples, in the order
+                of events.
+        """
+        return list(self._index("affiliate").get((affiliate, period), ()))
+
+    def to_arrow(self) -> "pyarrow.Table":  # noqa: F821
+        """Export to a pyarrow.Table, with a row per event, sportsbook and period.
+
+        See export.events_columns for the columns. Requires pyarrow.
+        """
+        from rundown.export import events_to_arrow
+
+        return events_to_arrow(self)
+
+    def to_pandas(self) -> "pandas.DataFrame":  # noqa: F821
+        """Export to a pandas.DataFrame. See to_arrow. Requires pandas."""
+        from rundown.export import events_to_pandas
+
+        return events_to_pandas(self)
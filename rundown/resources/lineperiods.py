@@ -10,7 +10,11 @@ from rundown.resources.line import MoneylinePeriod, SpreadPeriod, TotalPeriod
 
 
 class LinePeriods(BaseModel):
-    """Class used to aggregate lines for different periods of a game or event."""
+    """Class used to aggregate lines for different periods of a game or event.
+
+    Lines are parsed as the first resource of the union they validate as, which is
+    MoneylinePeriod for any line. Line methods return the subclass of their market.
+    """
 
     period_full_game: list[Union[MoneylinePeriod, SpreadPeriod, TotalPeriod]]
     period_first_half: list[Union[MoneylinePeriod, SpreadPeriod, TotalPeriod]] = []
@@ -20,3 +24,57 @@ class LinePeriods(BaseModel):
     period_third_period: list[Union[MoneylinePeriod, SpreadPeriod, TotalPeriod]] = []
     period_fourth_period: list[Union[MoneylinePeriod, SpreadPeriod, TotalPeriod]] = []
     period_live_full_game: list[Union[MoneylinePeriod, SpreadPeriod, TotalPeriod]] = []
+
+    def to_arrow(self) -> "pyarrow.Table":  # noqa: F821
+        """Export to a pyarrow.Table, with a row per line and a period column.
+
+        See export.lines_columns. Requires pyarrow.
+        """
+        from rundown.export import lines_to_arrow
+
+        return lines_to_arrow(self)
+
+    def to_pandas(self) -> "pandas.DataFrame":  # noqa: F821
+        """Export to a pandas.DataFrame. See to_arrow. Requires pandas."""
+        from rundown.export import lines_to_pandas
+
+        return lines_to_pandas(self)
+
+
+class MoneylinePeriods(LinePeriods):
+    """LinePeriods returned by Rundown.moneyline."""
+
+    period_full_game: list[MoneylinePeriod]
+    period_first_half: list[MoneylinePeriod] = []
+    period_second_half: list[MoneylinePeriod] = []
+    period_first_period: list[MoneylinePeriod] = []
+    period_second_period: list[MoneylinePeriod] = []
+    period_third_period: list[MoneylinePeriod] = []
+    period_fourth_period: list[MoneylinePeriod] = []
+    period_live_full_game: list[MoneylinePeriod] = []
+
+
+class SpreadPeriods(LinePeriods):
+    """LinePeriods returned by Rundown.spread."""
+
+    period_full_game: list[SpreadPeriod]
+    period_first_half: list[SpreadPeriod] = []
+    period_second_half: list[SpreadPeriod] = []
+    period_first_period: list[SpreadPeriod] = []
+    period_second_period: list[SpreadPeriod] = []
+    period_third_period: list[SpreadPeriod] = []
+    period_fourth_period: list[SpreadPeriod] = []
+    period_live_full_game: list[SpreadPeriod] = []
+
+
+class TotalPeriods(LinePeriods):
+    """LinePeriods returned by Rundown.total."""
+
+    period_full_game: list[TotalPeriod]
+    period_first_half: list[TotalPeriod] = []
+    period_second_half: list[TotalPeriod] = []
+    period_first_period: list[TotalPeriod] = []
+    period_second_period: list[TotalPeriod] = []
+    period_third_period: list[TotalPeriod] = []
+    period_fourth_period: list[TotalPeriod] = []
+    period_live_full_game: list[TotalPeriod] = []
@@ -1,9 +1,39 @@
+import re
+from datetime import datetime, timezone as dt_timezone, tzinfo
+from functools import lru_cache
 from math import floor
 from typing import Union, Optional
 import arrow
 
 from rundown.usercontext import context_timezone
 
+# Timestamps returned by the API, which datetime.fromisoformat parses on every
+# supported Python version once a 'Z' suffix is replaced by '+00:00'.
+_iso_pattern = re.compile(
+    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{3}|\.\d{6})?([+-]\d{2}:\d{2}|Z)?"
+)
+
+
+@lru_cache(maxsize=None)
+def _tzinfo(timezone: str) -> tzinfo:
+    """Resolve a timezone string once, the way Arrow does."""
+    return arrow.parser.TzinfoParser.parse(timezone)
+
+
+@lru_cache(maxsize=2 ** 16)
+def _change_timezone(dt_str: str, timezone: str) -> str:
+    tz = _tzinfo(timezone)
+    if not _iso_pattern.fullmatch(dt_str):
+        return str(arrow.get(dt_str).to(tz))
+
+    if dt_str.endswith("Z"):
+        dt_str = dt_str[:-1] + "+00:00"
+    dt = datetime.fromisoformat(dt_str)
+    if dt.tzinfo is None:
+        # Arrow treats naive timestamps as UTC.
+        dt = dt.replace(tzinfo=dt_timezone.utc)
+    return dt.astimezone(tz).isoformat()
+
 
 def change_timezone(dt_str: str) -> str:
     """Pydantic validator which changes the timezone of a date string.
@@ -11,16 +41,17 @@ def change_timezone(dt_str: str) -> str:
     Uses context_timezone to get the timezone because Pydantic validation doesn't allow
     for passing arguments to validator functions.
 
+    Timezones are resolved once, ISO 8601 timestamps skip Arrow's parser, and results
+    are memoized, since the same timestamps repeat across sportsbooks and responses.
+    The result is the same as str(arrow.get(dt_str).to(timezone)).
+
     Args:
         dt_str: The date string to change.
 
     Returns:
         str: New date string with updated timezone.
     """
-    timezone = context_timezone.get()
-    dt = arrow.get(dt_str)
-    new_dt = dt.to(timezone)
-    return str(new_dt)
+    return _change_timezone(dt_str, context_timezone.get())
 
 
 def make_none_if_not_published(line: Union[int, float]) -> Optional[Union[int, float]]:
@@ -0,0 +1,83 @@
+import random
+from collections.abc import Iterable
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import arrow
+
+"""Module containing the retry policy used by Rundown clients."""
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Requests that fail to connect or time out, and responses with a status code in
+    status_forcelist, are retried with exponential backoff and full jitter. A
+    Retry-After header on the response takes precedence over the backoff, unless it
+    asks for a longer wait than retry_after_max, in which case the request isn't
+    retried.
+
+    Args:
+        total: Maximum number of retries for a request. 0 disables retries.
+        backoff_factor: Base delay in seconds. Retry n waits a random time between 0
+            and backoff_factor * 2 ** n seconds.
+        backoff_max: Maximum delay in seconds, when there is no Retry-After header.
+        status_forcelist: Status codes that are retried.
+        respect_retry_after: Whether to wait as long as the Retry-After header says.
+        retry_after_max: Longest wait in seconds asked for by a Retry-After header
+            that is honored. A response asking for a longer wait fails instead.
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30,
+        status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True,
+        retry_after_max: float = 120,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.status_forcelist = frozenset(status_forcelist)
+        self.respect_retry_after = respect_retry_after
+        self.retry_after_max = retry_after_max
+
+    def can_retry(self, attempt: int) -> bool:
+        """Whether another retry is allowed after attempt (counting from 0) failed."""
+        return attempt < self.total
+
+    def backoff(
+        self, attempt: int, retry_after: Optional[str] = None
+    ) -> Optional[float]:
+        """Get the number of seconds to wait before retrying.
+
+        Args:
+            attempt: The number of the attempt that failed, counting from 0.
+            retry_after: The value of the response's Retry-After header, if any.
+
+        Returns:
+            float: The delay in seconds. None if Retry-After asks for a longer wait
+                than retry_after_max, so the request shouldn't be retried.
+        """
+        if retry_after is not None and self.respect_retry_after:
+            delay = self._parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.retry_after_max else None
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_factor * 2**attempt)
+        )
+
+    @staticmethod
+    def _parse_retry_after(retry_after: str) -> Optional[float]:
+        """Parse a Retry-After header, which is either seconds or an HTTP date."""
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (arrow.get(retry_at) - arrow.utcnow()).total_seconds())
@@ -1,12 +1,21 @@
-from typing import Union, Optional, Literal
-from collections.abc import Callable
+from typing import Any, Union, Optional, Literal, get_args, get_origin
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from pathlib import Path
+import time
 
 import requests
+from requests.adapters import HTTPAdapter
 from pydantic import parse_obj_as
 
+from rundown import decoder, lazy, stream
 from rundown.utils import utc_shift, utc_shift_to_tz, write_yaml
+from rundown.cache import ResponseCache
+from rundown.modelcache import ModelCache
+from rundown.store import HistoricalStore
+from rundown.retry import RetryPolicy
+from rundown.ratelimit import TokenBucket
 from rundown.resources.sportsbook import Sportsbook
 from rundown.resources.sport import Sport
 from rundown.resources.date import Date, Epoch
@@ -14,9 +23,16 @@ from rundown.resources.team import BaseTeam
 from rundown.resources.events import Events
 from rundown.resources.event import Event
 from rundown.resources.line import Moneyline, Spread, Total
-from rundown.resources.lineperiods import LinePeriods
+from rundown.resources.lineperiods import (
+    LinePeriods,
+    MoneylinePeriods,
+    SpreadPeriods,
+    TotalPeriods,
+)
 from rundown.resources.schedule import Schedule
-from rundown.usercontext import user_context
+from rundown.usercontext import user_context, context_timezone
+from rundown.singleflight import SingleFlight
+from rundown.stream import EventStream
 from rundown.static.static import build_sports_dict
 
 """Module containing classes allowing the user to access the Rundown API."""
@@ -33,6 +49,16 @@ class _RapidAPIBase:
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": self.api_host,
         }
+        # Default client-side rate limit in requests per second, and quota headers.
+        self.rate_limit = 5
+        self.quota_headers = {
+            "remaining_header": "X-RateLimit-requests-Remaining",
+            "reset_header": "X-RateLimit-requests-Reset",
+        }
+
+    def rate_limiter(self) -> TokenBucket:
+        """Create a rate limiter with the defaults for RapidAPI."""
+        return TokenBucket(self.rate_limit, **self.quota_headers)
 
 
 class _RundownBase:
@@ -42,6 +68,16 @@ class _RundownBase:
         self.api_key = api_key
         self.api_url = "https://therundown.io/api/v1"
         self.headers = {"X-TheRundown-Key": self.api_key}
+        # Default client-side rate limit in requests per second, and quota headers.
+        self.rate_limit = 2
+        self.quota_headers = {
+            "remaining_header": "X-RateLimit-Remaining",
+            "reset_header": "X-RateLimit-Reset",
+        }
+
+    def rate_limiter(self) -> TokenBucket:
+        """Create a rate limiter with the defaults for The Rundown's API."""
+        return TokenBucket(self.rate_limit, **self.quota_headers)
 
 
 class _Base:
@@ -59,26 +95,18 @@ class _Base:
         )
 
 
-class Rundown:
-    """The Rundown REST API client class supporting user configuration.
+_line_resources = {"moneyline": Moneyline, "spread": Spread, "total": Total}
+_line_periods_resources = {
+    "moneyline": MoneylinePeriods,
+    "spread": SpreadPeriods,
+    "total": TotalPeriods,
+}
 
-    Both RapidAPI.com and TheRundown.io are supported.
 
-    Args:
-        api_key: The API key to use.
-        api_provider: The API provider. Must be either 'rundown' or 'rapidapi'
-            (case insensitive).
-        timezone: Your preferred timezone.
-            The following formats are accepted:
-            - A str describing a timezone, similar to ‘US/Pacific’, or ‘Europe/Berlin’.
-            - A str in ISO 8601 style, as in ‘+07:00’.
-            - A str, one of the following: ‘local’, ‘utc’, ‘UTC’.
+class _ClientBase:
+    """Configuration, validation and parsing shared by Rundown and AsyncRundown.
 
-    timezone will be used to format responses from the API.
-
-    Attributes:
-        sport_names (dict[str, int]): Sports names and their IDs.
-        timezone (str): Your preferred timezone.
+    Subclasses are responsible for making requests to the API.
     """
 
     def __init__(
@@ -86,22 +114,23 @@ class Rundown:
         api_key: str,
         api_provider: Literal["rapidapi", "rundown"] = "rapidapi",
         timezone: str = "local",
-        refresh_cached_data: bool = False,
+        cache: Optional[ResponseCache] = None,
+        store: Optional[HistoricalStore] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Union[bool, TokenBucket] = False,
+        model_cache: Optional[ModelCache] = None,
     ):
         self._auth = _Base.factory(api_provider.lower(), api_key)
-        self._session = requests.session()
-        self._session.headers.update(self._auth.headers)
-
+        self._cache = cache
+        self._model_cache = model_cache
+        self._store = store
+        self._retry = RetryPolicy() if retry is None else retry
+        if rate_limiter is True:
+            rate_limiter = self._auth.rate_limiter()
+        self._rate_limiter = rate_limiter or None
         self._json = {}
-
         self.timezone = timezone
-
-        self.sport_names = {}
-        if refresh_cached_data:
-            self.refresh_sportsbooks()
-            self.refresh_sports()
-        else:
-            self.sport_names = build_sports_dict()
+        self.sport_names = build_sports_dict()
 
     def _build_url(self, *segments: Union[str, int]) -> str:
         """Build URL without query parameters."""
@@ -120,21 +149,40 @@ class Rundown:
 
         return {k: v for k, v in params.items() if is_clean(v)}
 
-    def _get(self, url: str, **params: Union[str, int, list[str]]) -> requests.Response:
-        """Make get request."""
-        res = self._session.get(url, params=params)
-        # TODO: handle 404 not found - should never happen if called through methods.
-        return res
+    def _get_cached_json(
+        self, segments: tuple[Union[str, int], ...], url: str, params: dict
+    ) -> Optional[dict]:
+        """Get the response for url and params from the cache or the store, if either
+        has it.
+        """
+        data = None
+        if self._cache is not None:
+            data = self._cache.get(self._cache.key(url, params))
+        if data is None and self._store is not None and self._store.storable(segments):
+            data = self._store.get(segments, params)
+            if data is not None and self._cache is not None:
+                self._cache_json(segments, url, params, data, store=False)
+        return data
 
-    def _build_url_and_get_json(
-        self, *segments: Union[str, int], **params: Union[str, int, list[str]]
-    ) -> dict:
-        """Build URL from segments and make get request to API."""
-        url = self._build_url(*segments)
-        params = self._clean_params(**params)
-        res = self._get(url, **params)
-        self._json = res.json()
-        return self._json
+    def _cache_json(
+        self,
+        segments: tuple[Union[str, int], ...],
+        url: str,
+        params: dict,
+        data: dict,
+        store: bool = True,
+    ):
+        """Cache the response for url and params, and save it to the store if it never
+        changes.
+        """
+        if "error" in data:
+            return
+        if self._cache is not None:
+            ttl = self._cache.policy.ttl(*segments)
+            if ttl:
+                self._cache.set(self._cache.key(url, params), data, ttl)
+        if store and self._store is not None and self._store.storable(segments):
+            self._store.put(segments, params, data)
 
     def _validate_offset(self, offset: int) -> int:
         """Determine offset by parameter or self.timezone, with parameter precedence."""
@@ -170,6 +218,257 @@ class Rundown:
 
         return sport_id
 
+    def _events_key(
+        self,
+        sport: Union[int, str],
+        lines_type: str,
+        date: str,
+        offset: Optional[int],
+        *include: Literal["all_periods", "scores"],
+        parse: str = "full",
+    ) -> tuple:
+        """Key identifying calls to events methods that return the same Events."""
+        sport_id = self._validate_sport(sport)
+        timezone = context_timezone.get()
+        return ("events", lines_type, sport_id, date, offset, include, timezone, parse)
+
+    def _context_timezone(self, offset: Optional[int]) -> str:
+        """Timezone used by resource validators, with offset taking precedence."""
+        return self.timezone if offset is None else utc_shift_to_tz(offset)
+
+    def _parse_as(self, type_: Any, raw: Union[dict, list], parse: str) -> Any:
+        """Parse raw as type_, a resource or list of resources, in the parse mode.
+
+        Raises:
+            ValueError: If parse is not 'full', 'lazy' or 'raw'.
+        """
+        if parse == "full":
+            return parse_obj_as(type_, raw)
+        if parse == "lazy":
+            resource = get_args(type_)[0] if get_origin(type_) is list else type_
+            return lazy.lazy(resource, raw, context_timezone.get(self.timezone))
+        if parse == "raw":
+            return lazy.normalize(raw)
+        raise ValueError("parse must be one of 'full', 'lazy' or 'raw'.")
+
+    def _parse_sports(self, data: dict, parse: str = "full") -> list[Sport]:
+        return self._parse_as(list[Sport], data["sports"], parse)
+
+    def _parse_dates(
+        self, data: dict, format: Literal["date", "epoch"], parse: str = "full"
+    ) -> list[Union[Date, Epoch]]:
+        if format == "date":
+            resource = Date
+            dates = [{"date": v} for v in data["dates"]]
+        else:
+            resource = Epoch
+            dates = [{"timestamp": v} for v in data["dates"]]
+
+        if parse == "raw":
+            # Date's validator is what fixes the timezone of dates.
+            return [d.dict() for d in parse_obj_as(list[resource], dates)]
+        return self._parse_as(list[resource], dates, parse)
+
+    def _parse_sportsbooks(self, data: dict, parse: str = "full") -> list[Sportsbook]:
+        return self._parse_as(list[Sportsbook], data["affiliates"], parse)
+
+    def _parse_teams(self, data: dict, parse: str = "full") -> list[BaseTeam]:
+        return self._parse_as(list[BaseTeam], data["teams"], parse)
+
+    def _parse_events(self, data: dict, parse: str = "full") -> Events:
+        if parse == "full" and self._model_cache is not None:
+            return self._model_cache.parse_events(data)
+        return self._parse_as(Events, data, parse)
+
+    def _parse_events_delta(self, data: dict, parse: str = "full") -> Optional[Events]:
+        if "error" in data:
+            return None
+        return self._parse_events(data, parse)
+
+    def _parse_event(self, data: dict, parse: str = "full") -> Optional[Event]:
+        if "error" in data:
+            return None
+        if parse == "full" and self._model_cache is not None:
+            return self._model_cache.parse_event(data)
+        return self._parse_as(Event, data, parse)
+
+    def _parse_lines(
+        self,
+        data: dict,
+        market: Literal["moneyline", "spread", "total"],
+        include: tuple[str, ...],
+        parse: str = "full",
+    ) -> Optional[Union[list[Union[Moneyline, Spread, Total]], LinePeriods]]:
+        """Parse the line history returned by the /lines/<line-id>/<market> routes.
+
+        Returns:
+            None if the line id could not be found, or the line has no lines available
+            for market.
+        """
+        history_key = f"{market}s"
+        if "error" in data or history_key in data and len(data[history_key]) == 0:
+            return None
+
+        if "all_periods" in include:
+            resource = _line_periods_resources[market]
+            return self._parse_as(resource, data[f"{market}_periods"], parse)
+        return self._parse_as(list[_line_resources[market]], data[history_key], parse)
+
+    def _parse_schedule(self, data: dict, parse: str = "full") -> list[Schedule]:
+        return self._parse_as(list[Schedule], data["schedules"], parse)
+
+
+class Rundown(_ClientBase):
+    """The Rundown REST API client class supporting user configuration.
+
+    Both RapidAPI.com and TheRundown.io are supported.
+
+    Args:
+        api_key: The API key to use.
+        api_provider: The API provider. Must be either 'rundown' or 'rapidapi'
+            (case insensitive).
+        timezone: Your preferred timezone.
+            The following formats are accepted:
+            - A str describing a timezone, similar to ‘US/Pacific’, or ‘Europe/Berlin’.
+            - A str in ISO 8601 style, as in ‘+07:00’.
+            - A str, one of the following: ‘local’, ‘utc’, ‘UTC’.
+        refresh_cached_data: Whether to download the sports and sportsbooks lists
+            instead of using the copies shipped with the package.
+        cache: Optional cache for API responses. See rundown.cache.ResponseCache.
+        store: Optional on-disk store for responses that never change. See
+            rundown.store.HistoricalStore.
+        retry: When to retry failed requests. Defaults to RetryPolicy(), which
+            retries 429 and 5xx responses and connection errors up to 3 times. See
+            rundown.retry.RetryPolicy.
+        timeout: Seconds to wait for the server to respond, or a (connect, read)
+            tuple.
+        pool_connections: Number of connection pools to cache.
+        pool_maxsize: Maximum number of connections kept alive in each pool. Should be
+            at least the number of threads making requests at once.
+        rate_limiter: Whether to limit the rate of requests, using the defaults for
+            api_provider. Pass a rundown.ratelimit.TokenBucket or FileTokenBucket
+            instead to share a limit between clients, threads or processes.
+        model_cache: Optional cache of parsed events, which reuses the resources
+            parsed from events that haven't changed. See
+            rundown.modelcache.ModelCache.
+
+    timezone will be used to format responses from the API.
+
+    Identical requests made at the same time from different threads share a single
+    round-trip, and events methods also share the parsed Events object, so it should
+    not be mutated.
+
+    Attributes:
+        sport_names (dict[str, int]): Sports names and their IDs.
+        timezone (str): Your preferred timezone.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_provider: Literal["rapidapi", "rundown"] = "rapidapi",
+        timezone: str = "local",
+        refresh_cached_data: bool = False,
+        cache: Optional[ResponseCache] = None,
+        store: Optional[HistoricalStore] = None,
+        retry: Optional[RetryPolicy] = None,
+        timeout: Union[float, tuple[float, float]] = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        rate_limiter: Union[bool, TokenBucket] = False,
+        model_cache: Optional[ModelCache] = None,
+    ):
+        super().__init__(
+            api_key,
+            api_provider,
+            timezone,
+            cache,
+            store,
+            retry,
+            rate_limiter,
+            model_cache,
+        )
+        self._singleflight = SingleFlight()
+        self._timeout = timeout
+        self._session = requests.session()
+        self._session.headers.update(self._auth.headers)
+        self._session.headers["Accept-Encoding"] = decoder.ACCEPT_ENCODING
+        # Retries are handled by _get, so that Retry-After can be honored with jitter.
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0
+        )
+        self._session.mount("https://", adapter)
+
+        if refresh_cached_data:
+            self.refresh_sportsbooks()
+            self.refresh_sports()
+
+    def _get(
+        self, url: str, stream: bool = False, **params: Union[str, int, list[str]]
+    ) -> requests.Response:
+        """Make get request, retrying according to the retry policy.
+
+        If stream is True, the response body is not downloaded until it is read.
+
+        Raises:
+            requests.HTTPError: If the response still has a retryable status code, such
+                as 429 or 502, when no retries are left or Retry-After asks for a longer
+                wait than the policy allows.
+            requests.ConnectionError, requests.Timeout: If the last attempt failed to
+                connect or timed out.
+        """
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                time.sleep(self._rate_limiter.reserve())
+            try:
+                res = self._session.get(
+                    url, params=params, timeout=self._timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if not self._retry.can_retry(attempt):
+                    raise
+                delay = self._retry.backoff(attempt)
+            else:
+                if self._rate_limiter is not None:
+                    self._rate_limiter.update(res.headers)
+                # 404 responses have a JSON error body handled by the calling method.
+                if res.status_code not in self._retry.status_forcelist:
+                    return res
+                if not self._retry.can_retry(attempt):
+                    res.raise_for_status()
+                delay = self._retry.backoff(attempt, res.headers.get("Retry-After"))
+                if delay is None:
+                    # The server asked to wait longer than the policy allows.
+                    res.raise_for_status()
+                res.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _build_url_and_get_json(
+        self, *segments: Union[str, int], **params: Union[str, int, list[str]]
+    ) -> dict:
+        """Build URL from segments and make get request to API."""
+        url = self._build_url(*segments)
+        params = self._clean_params(**params)
+        # Identical concurrent requests share a single round-trip.
+        self._json = self._singleflight.do(
+            ("json", ResponseCache.key(url, params)),
+            lambda: self._fetch_json(segments, url, params),
+        )
+        return self._json
+
+    def _fetch_json(
+        self, segments: tuple[Union[str, int], ...], url: str, params: dict
+    ) -> dict:
+        """Get the response from the cache or the store, or else from the API."""
+        data = self._get_cached_json(segments, url, params)
+        if data is None:
+            res = self._get(url, **params)
+            data = decoder.loads(res.content)
+            self._cache_json(segments, url, params, data)
+        return data
+
     def _get_events(
         self,
         sport: Union[int, str],
@@ -185,6 +484,56 @@ class Rundown:
         )
         return data
 
+    def _get_and_parse_events(
+        self,
+        sport: Union[int, str],
+        lines_type: str,
+        date: str,
+        offset: Optional[int],
+        *include: Literal["all_periods", "scores"],
+        parse: str = "full",
+    ) -> Events:
+        """Get and parse events. Identical concurrent calls share one Events object."""
+        key = self._events_key(sport, lines_type, date, offset, *include, parse=parse)
+        return self._singleflight.do(
+            key,
+            lambda: self._parse_events(
+                self._get_events(sport, lines_type, date, offset, *include), parse
+            ),
+        )
+
+    def _iter_events(
+        self,
+        sport: Union[int, str],
+        lines_type: str,
+        date: str,
+        offset: Optional[int],
+        *include: Literal["all_periods", "scores"],
+    ) -> EventStream:
+        """Stream events, which are parsed in the timezone given by offset."""
+        timezone = self._context_timezone(offset)
+        offset = self._validate_offset(offset)
+        sport_id = self._validate_sport(sport)
+        segments = ("sports", sport_id, lines_type, date)
+        params = self._clean_params(offset=offset, include=include)
+        return EventStream(self._stream_json(segments, params), timezone)
+
+    def _stream_json(
+        self, segments: tuple[Union[str, int], ...], params: dict
+    ) -> Iterator[tuple[str, Any]]:
+        """Parse the response incrementally, unless it is cached or stored.
+
+        Streamed responses aren't cached or stored, since that would mean holding the
+        whole response in memory.
+        """
+        url = self._build_url(*segments)
+        data = self._get_cached_json(segments, url, params)
+        if data is not None:
+            yield from stream.dict_items(data)
+            return
+        with self._get(url, stream=True, **params) as res:
+            yield from stream.iter_items(res.iter_content(stream.CHUNK_SIZE))
+
     def _with_timezone_context(f: Callable) -> Callable:
         """Decorator for methods that use self.timezone.
 
@@ -198,9 +547,7 @@ class Rundown:
         @wraps(f)
         def inner(self, *args, **kwargs):
             offset = kwargs["offset"] if "offset" in kwargs else None
-            with user_context(
-                self.timezone if offset is None else utc_shift_to_tz(offset)
-            ):
+            with user_context(self._context_timezone(offset)):
                 return f(self, *args, **kwargs)
 
         return inner
@@ -216,17 +563,19 @@ class Rundown:
         write_yaml(data, parent / "static/sports.yaml")
         self.sport_names = build_sports_dict()
 
-    def sports(self) -> list[Sport]:
+    def sports(self, *, parse: Literal["full", "lazy", "raw"] = "full") -> list[Sport]:
         """Get available sports.
 
         GET /sports
 
+        Args:
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
+
         Returns:
             list of resources.Sport.
         """
         data = self._build_url_and_get_json("sports")
-        sports = parse_obj_as(list[Sport], data["sports"])
-        return sports
+        return self._parse_sports(data, parse)
 
     @_with_timezone_context
     def dates(
@@ -235,6 +584,7 @@ class Rundown:
         *,
         offset: Optional[int] = None,
         format: Literal["date", "epoch"] = "date",
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> list[Union[Date, Epoch]]:
         """Get dates with odds for future events.
 
@@ -249,6 +599,7 @@ class Rundown:
                 self.timezone.
             format: 'date' or 'epoch'. If format == 'epoch', offset and timezone are
                 ignored, and dates will be in epoch format.
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             list of resources.Date or resources.Epoch.
@@ -259,29 +610,27 @@ class Rundown:
         data = self._build_url_and_get_json(
             "sports", sport_id, "dates", offset=offset, format=format
         )
-        if format == "date":
-            resource = Date
-            dates = [{"date": v} for v in data["dates"]]
-        else:
-            resource = Epoch
-            dates = [{"timestamp": v} for v in data["dates"]]
+        return self._parse_dates(data, format, parse)
 
-        dates = parse_obj_as(list[resource], dates)
-        return dates
-
-    def sportsbooks(self) -> list[Sportsbook]:
+    def sportsbooks(
+        self, *, parse: Literal["full", "lazy", "raw"] = "full"
+    ) -> list[Sportsbook]:
         """Get available sportsbooks.
 
         GET /affiliates
 
+        Args:
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
+
         Returns:
             list of resources.Sportsbook.
         """
         data = self._build_url_and_get_json("affiliates")
-        sportsbooks = parse_obj_as(list[Sportsbook], data["affiliates"])
-        return sportsbooks
+        return self._parse_sportsbooks(data, parse)
 
-    def teams(self, sport: Union[int, str]) -> list[BaseTeam]:
+    def teams(
+        self, sport: Union[int, str], *, parse: Literal["full", "lazy", "raw"] = "full"
+    ) -> list[BaseTeam]:
         """Get teams for the league referenced by sport id.
 
         GET /sports/<sport-id>/teams
@@ -290,14 +639,14 @@ class Rundown:
             sport: ID for the league of interest, or a string representing the league of
                 interest. Valid sport names can be found in the 'sport_names' attribute.
                 Examples: 'NHL', 'NBA', 'MLB'.
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             list of resource.Team.
         """
         sport_id = self._validate_sport(sport)
         data = self._build_url_and_get_json("sports", sport_id, "teams")
-        teams = parse_obj_as(list[BaseTeam], data["teams"])
-        return teams
+        return self._parse_teams(data, parse)
 
     @_with_timezone_context
     def events(
@@ -306,6 +655,7 @@ class Rundown:
         date: str,
         *include: Literal["all_periods", "scores"],
         offset: Optional[int] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Events:
         """Get events by sport by date.
 
@@ -322,13 +672,66 @@ class Rundown:
                 itself is the default.
             offset: UTC offset in minutes. If offset is provided, it takes precedence
                 over self.timezone, otherwise dates will be in timezone self.timezone.
+            parse: 'full' to return resources, 'lazy' to return rundown.lazy.Lazy
+                objects that validate each field the first time it is accessed, or
+                'raw' to return the JSON with only dates converted to the timezone and
+                'Not Published' prices replaced by None.
 
         Returns:
             resources.Events object.
         """
-        data = self._get_events(sport, "events", date, offset, *include)
-        events = Events(**data)
-        return events
+        return self._get_and_parse_events(
+            sport, "events", date, offset, *include, parse=parse
+        )
+
+    def events_many(
+        self,
+        sports: Iterable[Union[int, str]],
+        dates: Iterable[str],
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+        max_concurrency: int = 10,
+        parse: Literal["full", "lazy", "raw"] = "full",
+    ) -> dict[tuple[int, str], Union[Events, Exception]]:
+        """Get events for every combination of sports and dates concurrently.
+
+        Requests are made by a pool of at most max_concurrency threads, so the wall
+        time is close to that of the slowest request rather than the sum of all of
+        them.
+
+        Args:
+            sports: IDs or names of the leagues of interest. See Rundown.events.
+            dates: The dates of interest, in IS0 8601 format ('YYYY-MM-DD').
+            include: Any of 'all_periods' and 'scores'. See Rundown.events.
+            offset: UTC offset in minutes. See Rundown.events.
+            max_concurrency: Maximum number of requests in flight at once. Should not
+                be more than the pool_maxsize the client was created with.
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
+
+        Raises:
+            KeyError: If any sport string is not a valid sport name.
+
+        Returns:
+            dict with key (sport_id, date) and value resources.Events object. If the
+                request for a key failed, the value is the raised exception instead.
+        """
+        dates = list(dates)
+        keys = [(self._validate_sport(s), d) for s in sports for d in dates]
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {
+                k: executor.submit(
+                    self.events, *k, *include, offset=offset, parse=parse
+                )
+                for k in keys
+            }
+
+        results = {}
+        for k, future in futures.items():
+            try:
+                results[k] = future.result()
+            except Exception as e:
+                results[k] = e
+        return results
 
     @_with_timezone_context
     def opening_lines(
@@ -337,6 +740,7 @@ class Rundown:
         date: str,
         *include: Literal["all_periods", "scores"],
         offset: Optional[int] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Events:
         """Get events with opening lines by sport by date.
 
@@ -353,13 +757,17 @@ class Rundown:
                 itself is the default.
             offset: UTC offset in minutes. If offset is provided, it takes precedence
                 over self.timezone, otherwise dates will be in timezone self.timezone.
+            parse: 'full' to return resources, 'lazy' to return rundown.lazy.Lazy
+                objects that validate each field the first time it is accessed, or
+                'raw' to return the JSON with only dates converted to the timezone and
+                'Not Published' prices replaced by None.
 
         Returns:
             resources.Events object.
         """
-        data = self._get_events(sport, "openers", date, offset, *include)
-        events = Events(**data)
-        return events
+        return self._get_and_parse_events(
+            sport, "openers", date, offset, *include, parse=parse
+        )
 
     @_with_timezone_context
     def closing_lines(
@@ -368,6 +776,7 @@ class Rundown:
         date: str,
         *include: Literal["all_periods", "scores"],
         offset: Optional[int] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Events:
         """Get events with closing lines by sport by date.
 
@@ -384,13 +793,83 @@ class Rundown:
                 itself is the default.
             offset: UTC offset in minutes. If offset is provided, it takes precedence
                 over self.timezone, otherwise dates will be in timezone self.timezone.
+            parse: 'full' to return resources, 'lazy' to return rundown.lazy.Lazy
+                objects that validate each field the first time it is accessed, or
+                'raw' to return the JSON with only dates converted to the timezone and
+                'Not Published' prices replaced by None.
 
         Returns:
             resources.Events object.
         """
-        data = self._get_events(sport, "closing", date, offset, *include)
-        events = Events(**data)
-        return events
+        return self._get_and_parse_events(
+            sport, "closing", date, offset, *include, parse=parse
+        )
+
+    def iter_events(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+    ) -> EventStream:
+        """Iterate over events by sport by date, parsing each event as it is downloaded.
+
+        GET /sports/<sport-id>/events/<date>
+
+        Unlike Rundown.events, the whole response and the full list of events are
+        never held in memory at once, which matters for large 'all_periods'
+        responses. Streamed responses are not cached or stored, but a cached or stored
+        response is used if there is one.
+
+        Args:
+            sport: ID or name of the league of interest. See Rundown.events.
+            date: The date of interest, in IS0 8601 format ('YYYY-MM-DD').
+            include: Any of 'all_periods' and 'scores'. See Rundown.events.
+            offset: UTC offset in minutes. See Rundown.events.
+
+        Raises:
+            KeyError: If the sport string is not a valid sport name.
+
+        Returns:
+            rundown.stream.EventStream of resources.Event objects. Its delta_last_id
+                attribute is set once the meta of the response has been read, which is
+                before the first event.
+
+        Example:
+            with r.iter_events("MLB", "2021-05-11", "all_periods") as events:
+                for event in events:
+                    ...
+            last_id = events.delta_last_id
+        """
+        return self._iter_events(sport, "events", date, offset, *include)
+
+    def iter_opening_lines(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+    ) -> EventStream:
+        """Iterate over events with opening lines by sport by date, parsing each event
+        as it is downloaded. See Rundown.iter_events.
+
+        GET /sports/<sport-id>/openers/<date>
+        """
+        return self._iter_events(sport, "openers", date, offset, *include)
+
+    def iter_closing_lines(
+        self,
+        sport: Union[int, str],
+        date: str,
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+    ) -> EventStream:
+        """Iterate over events with closing lines by sport by date, parsing each event
+        as it is downloaded. See Rundown.iter_events.
+
+        GET /sports/<sport-id>/closing/<date>
+        """
+        return self._iter_events(sport, "closing", date, offset, *include)
 
     @_with_timezone_context
     def events_delta(
@@ -398,6 +877,7 @@ class Rundown:
         last_id: int,
         *include: Literal["all_periods", "scores"],
         sport: Optional[Union[int, str]] = None,
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Optional[Events]:
         """Get events that have changed since request specified by last_id.
 
@@ -414,6 +894,7 @@ class Rundown:
                 interest. Valid sport names can be found in the 'sport_names' attribute.
                 Examples: 'NHL', 'NBA', 'MLB'.  If this argument is included, only
                 events for the matching sport will be returned.
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             resources.Events object.
@@ -422,15 +903,14 @@ class Rundown:
         data = self._build_url_and_get_json(
             "delta", last_id=last_id, sport_id=sport_id, include=include
         )
-        if "error" in data:
-            return None
-
-        events = Events(**data)
-        return events
+        return self._parse_events_delta(data, parse)
 
     @_with_timezone_context
     def event(
-        self, event_id: str, *include: Literal["all_periods", "scores"]
+        self,
+        event_id: str,
+        *include: Literal["all_periods", "scores"],
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Optional[Event]:
         """Get event by event id.
 
@@ -442,22 +922,20 @@ class Rundown:
                 lines for each period are included in the response. If 'scores' is
                 included, lines for the event are included in the response. 'scores' by
                 itself is the default.
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             resources.Event object, or None if no matching event could be found.
         """
         data = self._build_url_and_get_json("events", event_id, include=include)
-        if "error" in data:
-            return None
-
-        e = Event(**data)
-        return e
+        return self._parse_event(data, parse)
 
     @_with_timezone_context
     def moneyline(
         self,
         line_id: int,
         *include: Literal["all_periods", "scores"],
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Optional[Union[list[Moneyline], LinePeriods]]:
         """Get line history for moneyline referenced by line_id.
 
@@ -469,6 +947,7 @@ class Rundown:
                 lines for each period are included in the response. If 'scores' is
                 included, lines for the event are included in the response. 'scores' by
                 itself is the default
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             list of resources.Moneyline, or resources.LinePeriods object. None if line
@@ -477,18 +956,14 @@ class Rundown:
         data = self._build_url_and_get_json(
             "lines", line_id, "moneyline", include=include
         )
-        if "error" in data or "moneylines" in data and len(data["moneylines"]) == 0:
-            return None
-
-        if "all_periods" in include:
-            lines = LinePeriods(**data["moneyline_periods"])
-        else:
-            lines = parse_obj_as(list[Moneyline], data["moneylines"])
-        return lines
+        return self._parse_lines(data, "moneyline", include, parse)
 
     @_with_timezone_context
     def spread(
-        self, line_id: int, *include: str
+        self,
+        line_id: int,
+        *include: str,
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Optional[Union[list[Moneyline], LinePeriods]]:
         """Get line history for spread referenced by line_id.
 
@@ -500,26 +975,21 @@ class Rundown:
                 lines for each period are included in the response. If 'scores' is
                 included, lines for the event are included in the response. 'scores' by
                 itself is the default
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             list of resources.Spead, or resources.LinePeriods object. None if line id
                 could not be found, or the line has no spreads available.
         """
         data = self._build_url_and_get_json("lines", line_id, "spread", include=include)
-        if "error" in data or "spreads" in data and len(data["spreads"]) == 0:
-            return None
-
-        if "all_periods" in include:
-            lines = LinePeriods(**data["spread_periods"])
-        else:
-            lines = parse_obj_as(list[Spread], data["spreads"])
-        return lines
+        return self._parse_lines(data, "spread", include, parse)
 
     @_with_timezone_context
     def total(
         self,
         line_id,
         *include: Literal["all_periods", "scores"],
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> Optional[Union[list[Moneyline], LinePeriods]]:
         """Get line history for total referenced by line_id.
 
@@ -531,20 +1001,14 @@ class Rundown:
                 lines for each period are included in the response. If 'scores' is
                 included, lines for the event are included in the response. 'scores' by
                 itself is the default
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             list of resources.Total, or resources.LinePeriods object. None if line id
                 could not be found, or the line has no totals available.
         """
         data = self._build_url_and_get_json("lines", line_id, "total", include=include)
-        if "error" in data or "totals" in data and len(data["totals"]) == 0:
-            return None
-
-        if "all_periods" in include:
-            lines = LinePeriods(**data["total_periods"])
-        else:
-            lines = parse_obj_as(list[Total], data["totals"])
-        return lines
+        return self._parse_lines(data, "total", include, parse)
 
     @_with_timezone_context
     def schedule(
@@ -552,6 +1016,8 @@ class Rundown:
         sport: Union[int, str],
         date_from: Optional[str] = None,
         limit: Optional[int] = 50,
+        *,
+        parse: Literal["full", "lazy", "raw"] = "full",
     ) -> list[Schedule]:
         """Get schedule for league referenced by sport.
 
@@ -564,6 +1030,7 @@ class Rundown:
             date_from: ISO 8601 date string of the starting date of the scheduled
                 events. The server considers the date to be in UTC. Defaults to today.
             limit: Number of events to retrieve. Maximum 500.
+            parse: 'full', 'lazy' or 'raw'. See Rundown.events.
 
         Returns:
             list of resources.Schedule.
@@ -574,5 +1041,4 @@ class Rundown:
         data = self._build_url_and_get_json(
             "sports", sport_id, "schedule", **{"from": date_from, "limit": limit}
         )
-        schedules = parse_obj_as(list[Schedule], data["schedules"])
-        return schedules
+        return self._parse_schedule(data, parse)
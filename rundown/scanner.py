@@ -0,0 +1,270 @@
+import heapq
+import threading
+from bisect import insort
+from collections import namedtuple
+from collections.abc import Iterable
+from typing import Optional, Union
+
+from rundown.resources.event import Event, SportsbookLinePeriods
+from rundown.resources.events import Events
+
+"""Module for finding the best prices and arbitrages across sportsbooks."""
+
+Quote = namedtuple("Quote", ["affiliate", "price", "points", "decimal"])
+Arbitrage = namedtuple(
+    "Arbitrage", ["event_id", "period", "market", "points", "quotes", "margin"]
+)
+
+# The sides of each market, and the fields holding their prices.
+_sides = {
+    "moneyline": (("away", "moneyline_away"), ("home", "moneyline_home")),
+    "spread": (
+        ("away", "point_spread_away_money"),
+        ("home", "point_spread_home_money"),
+    ),
+    "total": (("over", "total_over_money"), ("under", "total_under_money")),
+}
+_draw = ("draw", "moneyline_draw")
+# Prices are only comparable between lines with the same points.
+_points_fields = {
+    "moneyline": None,
+    "spread": "point_spread_home",
+    "total": "total_over",
+}
+
+# (event_id, period, market, points)
+MarketKey = tuple[str, Optional[str], str, Optional[float]]
+
+
+def decimal_odds(american: Union[int, float]) -> float:
+    """Convert American odds to decimal odds, the total returned per unit staked."""
+    return 1 + (american / 100 if american > 0 else 100 / -american)
+
+
+class PriceScanner:
+    """Thread-safe index of the best prices of each side of each market.
+
+    Every side of a market, keyed by event, period, market and points, has its prices
+    kept sorted from best to worst across sportsbooks. Applying an event only touches
+    the indexes of the lines that changed, and arbitrages are rechecked only for the
+    markets those lines are in. Queries then don't scan any lines: best returns the
+    head of an index, and arbitrages returns those already found.
+
+    Spreads are keyed by the home point spread and totals by the total, since only
+    prices for the same points can be compared. Moneylines are two-way unless
+    three_way is set.
+
+    Example:
+        scanner = PriceScanner(periods=[None, "period_full_game"])
+        for events in DeltaPoller(r, ["NBA"]):
+            scanner.update(events)
+            for arb in scanner.arbitrages():
+                print(arb.event_id, arb.market, arb.margin, arb.quotes)
+
+    Args:
+        markets: Markets to index, out of 'moneyline', 'spread' and 'total'.
+        periods: None for the lines in Event.lines, and periods such as
+            'period_full_game' for the lines in Event.line_periods.
+        three_way: Whether moneylines have a draw side, for sports with draws.
+
+    Raises:
+        ValueError: If a market or period isn't valid.
+    """
+
+    def __init__(
+        self,
+        markets: Iterable[str] = ("moneyline", "spread", "total"),
+        periods: Iterable[Optional[str]] = (None,),
+        three_way: bool = False,
+    ):
+        self.markets = tuple(markets)
+        self.periods = tuple(periods)
+        for market in self.markets:
+            if market not in _sides:
+                raise ValueError(f"{market!r} is not a market.")
+        for period in self.periods:
+            if period is not None and period not in SportsbookLinePeriods.__fields__:
+                raise ValueError(
+                    f"{period!r} is not a period of SportsbookLinePeriods."
+                )
+        self._sides = dict(_sides)
+        if three_way:
+            self._sides["moneyline"] += (_draw,)
+
+        self._lock = threading.Lock()
+        # (event_id, affiliate, period, market) -> (MarketKey, {side: price})
+        self._quotes = {}
+        # MarketKey -> {side: [(-decimal, affiliate, price)]}, sorted best first.
+        self._index = {}
+        # (event_id, period, market) -> set of points with quotes.
+        self._points = {}
+        self._arbitrages: dict[MarketKey, Arbitrage] = {}
+
+    def update(self, events: Union[Events, Iterable[Event]]) -> set[MarketKey]:
+        """Index the lines of events.
+
+        Sportsbooks missing from an event keep their indexed prices, so events from
+        Rundown.events_delta can be applied as they come.
+
+        Args:
+            events: resources.Events, or any iterable of resources.Event.
+
+        Returns:
+            The keys of the markets whose prices changed.
+        """
+        if isinstance(events, Events):
+            events = events.events
+
+        with self._lock:
+            changed = set()
+            for event in events:
+                for period in self.periods:
+                    books = event.line_periods if period else event.lines
+                    for affiliate, lines in (books or {}).items():
+                        if period:
+                            lines = getattr(lines, period)
+                        for market in self.markets:
+                            line = None if lines is None else getattr(lines, market)
+                            key = (event.event_id, affiliate, period, market)
+                            changed |= self._set_quote(key, self._quote(key, line))
+            for market_key in changed:
+                self._check_arbitrage(market_key)
+            return changed
+
+    def discard(self, event_ids: Iterable[str]):
+        """Remove the prices of events, such as finished events."""
+        event_ids = set(event_ids)
+        with self._lock:
+            changed = set()
+            for key in [k for k in self._quotes if k[0] in event_ids]:
+                changed |= self._set_quote(key, None)
+            for market_key in changed:
+                self._check_arbitrage(market_key)
+
+    def clear(self):
+        """Remove every price."""
+        with self._lock:
+            self._quotes, self._index, self._points = {}, {}, {}
+            self._arbitrages = {}
+
+    def best(
+        self,
+        event_id: str,
+        market: str,
+        side: str,
+        period: Optional[str] = None,
+        points: Optional[float] = None,
+        n: int = 1,
+    ) -> list[Quote]:
+        """Get the best prices for a side of a market.
+
+        Args:
+            event_id: The event id.
+            market: 'moneyline', 'spread' or 'total'.
+            side: 'away' or 'home' for moneylines and spreads ('draw' if three_way),
+                'over' or 'under' for totals.
+            period: None for Event.lines, or the period of Event.line_periods.
+            points: The home point spread or the total. If None, prices for every
+                point spread or total are ranked together.
+            n: Number of prices to get.
+
+        Returns:
+            Up to n Quotes, best first.
+        """
+        with self._lock:
+            if points is None and _points_fields[market] is not None:
+                all_points = self._points.get((event_id, period, market), ())
+            else:
+                all_points = (points,)
+            ranked = []
+            for p in all_points:
+                index = self._index.get((event_id, period, market, p), {})
+                ranked.append([(*entry, p) for entry in index.get(side, [])[:n]])
+        return [
+            Quote(affiliate, price, p, -neg_decimal)
+            for neg_decimal, affiliate, price, p in heapq.merge(*ranked)
+        ][:n]
+
+    def arbitrages(self, min_margin: float = 0.0) -> list[Arbitrage]:
+        """Get the markets where backing the best price of every side guarantees a
+        profit.
+
+        margin is the guaranteed return per unit staked, when the stake on each side
+        is proportional to the inverse of its decimal odds.
+
+        Args:
+            min_margin: Only get arbitrages with a greater margin.
+
+        Returns:
+            Arbitrages, largest margin first.
+        """
+        with self._lock:
+            found = [a for a in self._arbitrages.values() if a.margin > min_margin]
+        return sorted(found, key=lambda a: -a.margin)
+
+    def _quote(self, key: tuple, line) -> Optional[tuple[MarketKey, dict]]:
+        event_id, _, period, market = key
+        if line is None:
+            return None
+        points_field = _points_fields[market]
+        points = None if points_field is None else getattr(line, points_field)
+        if points_field is not None and points is None:
+            return None
+        prices = {}
+        for side, field in self._sides[market]:
+            price = getattr(line, field)
+            # Prices between -100 and 100 aren't valid American odds.
+            if price is not None and abs(price) >= 100:
+                prices[side] = price
+        if not prices:
+            return None
+        return (event_id, period, market, points), prices
+
+    def _set_quote(self, key: tuple, quote: Optional[tuple]) -> set[MarketKey]:
+        """Replace the quote of a sportsbook's line, returning the changed markets."""
+        old = self._quotes.get(key)
+        if old == quote:
+            return set()
+        affiliate = key[1]
+        changed = set()
+        if old is not None:
+            market_key, prices = old
+            index = self._index[market_key]
+            for side, price in prices.items():
+                index[side].remove((-decimal_odds(price), affiliate, price))
+                if not index[side]:
+                    del index[side]
+            if not index:
+                del self._index[market_key]
+                points = self._points[market_key[:3]]
+                points.discard(market_key[3])
+                if not points:
+                    del self._points[market_key[:3]]
+            del self._quotes[key]
+            changed.add(market_key)
+        if quote is not None:
+            market_key, prices = quote
+            index = self._index.setdefault(market_key, {})
+            for side, price in prices.items():
+                entry = (-decimal_odds(price), affiliate, price)
+                insort(index.setdefault(side, []), entry)
+            self._points.setdefault(market_key[:3], set()).add(market_key[3])
+            self._quotes[key] = quote
+            changed.add(market_key)
+        return changed
+
+    def _check_arbitrage(self, market_key: MarketKey):
+        self._arbitrages.pop(market_key, None)
+        index = self._index.get(market_key, {})
+        sides = self._sides[market_key[2]]
+        if any(side not in index for side, _ in sides):
+            return
+        heads = [index[side][0] for side, _ in sides]
+        inverse = sum(-1 / neg_decimal for neg_decimal, _, _ in heads)
+        if inverse < 1:
+            quotes = tuple(
+                Quote(affiliate, price, market_key[3], -neg_decimal)
+                for neg_decimal, affiliate, price in heads
+            )
+            margin = 1 / inverse - 1
+            self._arbitrages[market_key] = Arbitrage(*market_key, quotes, margin)
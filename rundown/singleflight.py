@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+"""Module for coalescing identical concurrent calls into a single call."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """Thread-safe coalescing of identical concurrent calls.
+
+    While a call for a key is in flight, other calls for the same key wait for it and
+    share its result, or its exception, instead of making their own call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Call fn, unless a call for key is already in flight.
+
+        Args:
+            key: Identifies calls that are interchangeable.
+            fn: Makes the call.
+
+        Returns:
+            The result of the call. Concurrent callers get the same object.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Coalescing of identical concurrent calls made from tasks on one event loop.
+
+    See SingleFlight.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn(), unless a call for key is already in flight.
+
+        Args:
+            key: Identifies calls that are interchangeable.
+            fn: Coroutine function that makes the call.
+
+        Returns:
+            The result of the call. Concurrent callers get the same object.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            # The call runs in its own task, so it keeps running for the other
+            # callers if the caller that started it is cancelled.
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._finish(key, t))
+        # Shield the shared call, so cancelling one caller doesn't cancel it.
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved, in case every caller was cancelled.
+            task.exception()
@@ -0,0 +1,234 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Union, Optional, Literal
+from urllib.parse import urlencode
+
+from rundown import decoder
+from rundown.utils import is_past_date
+
+"""Module containing the on-disk store for historical responses."""
+
+_line_markets = ("moneyline", "spread", "total")
+
+
+class HistoricalStore:
+    """SQLite backed store of responses that never change.
+
+    Closing lines for past dates, and optionally line histories, are stored
+    compressed, along with a checksum of the response, so repeat backfills are read
+    from disk instead of the network.
+
+    A line history is stored the first time it is fetched, and the response doesn't
+    say whether its event has finished, so a stored history of a live line never gets
+    new lines. Line histories are therefore only stored if their markets are given in
+    endpoints, which should only be done by clients that request lines of finished
+    events.
+
+    Args:
+        path: Path of the SQLite database file. It is created if it doesn't exist.
+        endpoints: The endpoints to store. Any of 'closing', 'openers', 'moneyline',
+            'spread' and 'total'.
+        compression_level: zlib compression level, from 0 (none) to 9 (smallest).
+
+    Example:
+        store = HistoricalStore("history.db")
+        r = Rundown(api_key, store=store)
+        store.warm_up(r, ["MLB", "NBA"], ["2021-05-10", "2021-05-11"], "all_periods")
+
+        # Line histories of finished events.
+        store = HistoricalStore("history.db", ["closing", "moneyline"])
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        endpoints: Iterable[str] = ("closing",),
+        compression_level: int = 6,
+    ):
+        self.path = Path(path)
+        self.endpoints = frozenset(endpoints)
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    sport_id INTEGER,
+                    line_id INTEGER,
+                    date TEXT,
+                    include TEXT NOT NULL,
+                    checksum TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def key(segments: tuple[Union[str, int], ...], params: dict) -> str:
+        """Build the store key for a request from its URL segments and cleaned
+        parameters. Keys don't depend on the API provider.
+        """
+        path = "/".join(str(s) for s in segments)
+        return f"{path}?{urlencode(sorted(params.items()), doseq=True)}"
+
+    def storable(self, segments: tuple[Union[str, int], ...]) -> bool:
+        """Whether the response from the route built from segments never changes."""
+        segments = [str(s) for s in segments]
+        if len(segments) == 4 and segments[0] == "sports":
+            return segments[2] in self.endpoints and is_past_date(segments[3])
+        if len(segments) == 3 and segments[0] == "lines":
+            return segments[2] in self.endpoints
+        return False
+
+    def get(
+        self, segments: tuple[Union[str, int], ...], params: dict
+    ) -> Optional[dict]:
+        """Get the stored response for a request.
+
+        A response that fails its integrity check is deleted and treated as missing.
+
+        Returns:
+            The decoded JSON response, or None if it isn't stored.
+        """
+        key = self.key(segments, params)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT checksum, data FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        raw = self._decompress(row[1])
+        if raw is None or hashlib.sha256(raw).hexdigest() != row[0]:
+            self.delete(key)
+            return None
+        return decoder.loads(raw)
+
+    def put(self, segments: tuple[Union[str, int], ...], params: dict, data: dict):
+        """Store the response for a request, replacing any stored response."""
+        segments = [str(s) for s in segments]
+        endpoint = segments[2]
+        sport_id = segments[1] if segments[0] == "sports" else None
+        line_id = segments[1] if segments[0] == "lines" else None
+        date = segments[3] if segments[0] == "sports" else None
+        include = params.get("include", ())
+        include = ",".join(sorted([include] if isinstance(include, str) else include))
+
+        raw = decoder.dumps(data)
+        row = (
+            self.key(segments, params),
+            endpoint,
+            sport_id,
+            line_id,
+            date,
+            include,
+            hashlib.sha256(raw).hexdigest(),
+            zlib.compress(raw, self.compression_level),
+            time.time(),
+        )
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+
+    def delete(self, key: str):
+        """Delete the response stored at key."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def verify(self, repair: bool = False) -> list[str]:
+        """Check every stored response against its checksum.
+
+        Args:
+            repair: Whether to delete the responses that fail the check, so they are
+                downloaded again when next requested.
+
+        Returns:
+            list of keys of the responses that failed the check.
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT key, checksum, data FROM responses")
+            corrupt = []
+            for key, checksum, data in rows:
+                raw = self._decompress(data)
+                if raw is None or hashlib.sha256(raw).hexdigest() != checksum:
+                    corrupt.append(key)
+
+        if repair:
+            for key in corrupt:
+                self.delete(key)
+        return corrupt
+
+    def warm_up(
+        self,
+        rundown,
+        sports: Iterable[Union[int, str]] = (),
+        dates: Iterable[str] = (),
+        *include: Literal["all_periods", "scores"],
+        offset: Optional[int] = None,
+        line_ids: Iterable[int] = (),
+        max_concurrency: int = 10,
+    ) -> list[Exception]:
+        """Download and store closing lines and line histories that aren't stored yet.
+
+        Args:
+            rundown: The Rundown client used to make requests. It must use this store.
+            sports: IDs or names of the leagues to store closing lines for.
+            dates: The dates to store closing lines for. Dates that haven't passed are
+                requested but not stored.
+            include: Any of 'all_periods' and 'scores'. See Rundown.closing_lines.
+            offset: UTC offset in minutes. See Rundown.closing_lines.
+            line_ids: Line ids to store the history of, for every market in
+                endpoints.
+            max_concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+            list of exceptions raised by requests that failed.
+        """
+        if rundown._store is not self:
+            raise ValueError("rundown must be created with this store.")
+
+        dates = list(dates)
+        calls = [
+            partial(rundown._get_events, s, "closing", d, offset, *include)
+            for s in sports
+            for d in dates
+        ]
+        calls += [
+            partial(rundown._build_url_and_get_json, "lines", i, m, include=include)
+            for i in line_ids
+            for m in _line_markets
+            if m in self.endpoints
+        ]
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [executor.submit(f) for f in calls]
+
+        return [f.exception() for f in futures if f.exception() is not None]
+
+    @staticmethod
+    def _decompress(data: bytes) -> Optional[bytes]:
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            return None
@@ -0,0 +1,282 @@
+import codecs
+import json
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import Any, Optional
+
+from rundown.resources.event import Event
+from rundown.resources.events import Meta
+from rundown.usercontext import user_context
+
+"""Module for parsing events responses incrementally, as they are downloaded."""
+
+CHUNK_SIZE = 64 * 1024
+
+_whitespace = re.compile(r"[ \t\n\r]*")
+_incomplete = object()
+
+
+class _EventsParser:
+    """Push parser for the JSON object returned by the events routes.
+
+    Text is fed in chunks as it is downloaded. The value of each top level key is
+    decoded once it is complete, except for the events array, whose items are decoded
+    one at a time. Only the undecoded text is kept between chunks.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+        self._pending = []
+        self._pending_length = 0
+        self._wait_for = 0
+        self._decode = json.JSONDecoder().raw_decode
+
+    def feed(self, text: str, final: bool = False) -> list[tuple[str, Any]]:
+        """Parse text, which follows the text fed so far.
+
+        Args:
+            text: The next chunk of the response.
+            final: Whether text is the end of the response.
+
+        Raises:
+            ValueError: If the response is not a JSON object, or final is True and the
+                object is incomplete.
+
+        Returns:
+            list of (key, value) pairs completed by text. Each item of the events
+                array is returned as ('event', item) instead of one ('events', list)
+                pair.
+        """
+        # Wait until the partial value has doubled in size before decoding it again,
+        # so that a value spanning many chunks isn't decoded once for every chunk.
+        self._pending.append(text)
+        self._pending_length += len(text)
+        if not final and self._pending_length < self._wait_for:
+            return []
+
+        buffer, pos = self._buffer, self._pos
+        self._buffer = "".join([buffer[pos:], *self._pending])
+        self._pos = 0
+        self._pending = []
+        self._pending_length = len(self._buffer)
+        items = []
+        while self._step(items, final):
+            pass
+        self._pending_length -= self._pos
+        if final and self._state != "end":
+            raise ValueError("The events response ended unexpectedly.")
+        return items
+
+    def _step(self, items: list, final: bool) -> bool:
+        """Parse the next token or value, if it is complete.
+
+        Returns:
+            bool: Whether anything was parsed.
+        """
+        pos = _whitespace.match(self._buffer, self._pos).end()
+        if pos == len(self._buffer):
+            self._wait_for = 0
+            return False
+        char = self._buffer[pos]
+        state = self._state
+
+        if state == "start":
+            self._expect(char, "{")
+            self._advance(pos, "first_key")
+        elif state == "first_key" and char == "}":
+            self._advance(pos, "end")
+        elif state in ("first_key", "key"):
+            key = self._decode_value(pos, final)
+            if key is _incomplete:
+                return False
+            if not isinstance(key, str):
+                raise ValueError("Expected a key in the events response.")
+            self._key = key
+            self._state = "colon"
+        elif state == "colon":
+            self._expect(char, ":")
+            self._advance(pos, "value")
+        elif state == "value" and self._key == "events" and char == "[":
+            self._advance(pos, "first_item")
+        elif state == "value":
+            value = self._decode_value(pos, final)
+            if value is _incomplete:
+                return False
+            items.append((self._key, value))
+            self._state = "after_value"
+        elif state == "after_value":
+            self._expect(char, ",}")
+            self._advance(pos, "key" if char == "," else "end")
+        elif state == "first_item" and char == "]":
+            self._advance(pos, "after_value")
+        elif state in ("first_item", "item"):
+            item = self._decode_value(pos, final)
+            if item is _incomplete:
+                return False
+            items.append(("event", item))
+            self._state = "after_item"
+        elif state == "after_item":
+            self._expect(char, ",]")
+            self._advance(pos, "item" if char == "," else "after_value")
+        else:
+            raise ValueError("Extra data after the events response.")
+        return True
+
+    def _advance(self, pos: int, state: str):
+        self._pos = pos + 1
+        self._state = state
+
+    def _expect(self, char: str, expected: str):
+        if char not in expected:
+            raise ValueError(f"Expected one of {expected!r} in the events response.")
+
+    def _decode_value(self, pos: int, final: bool) -> Any:
+        """Decode the value starting at pos, or return _incomplete if it isn't."""
+        try:
+            value, end = self._decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            value, end = _incomplete, None
+        # A value ending with the buffer may be a number continued by the next chunk.
+        if value is _incomplete or end == len(self._buffer) and not final:
+            self._pos = pos
+            self._wait_for = 2 * (len(self._buffer) - pos)
+            return _incomplete
+        self._pos = end
+        return value
+
+
+def iter_items(chunks: Iterable[bytes]) -> Iterator[tuple[str, Any]]:
+    """Parse an events response from its chunks of UTF-8 encoded JSON.
+
+    Yields:
+        (key, value) pairs of the response, with each event as ('event', item).
+    """
+    parser = _EventsParser()
+    decode = codecs.getincrementaldecoder("utf-8")().decode
+    for chunk in chunks:
+        yield from parser.feed(decode(chunk))
+    yield from parser.feed(decode(b"", final=True), final=True)
+
+
+async def aiter_items(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[str, Any]]:
+    """Parse an events response from its chunks of UTF-8 encoded JSON. See
+    iter_items.
+    """
+    parser = _EventsParser()
+    decode = codecs.getincrementaldecoder("utf-8")().decode
+    async for chunk in chunks:
+        for item in parser.feed(decode(chunk)):
+            yield item
+    for item in parser.feed(decode(b"", final=True), final=True):
+        yield item
+
+
+def dict_items(data: dict) -> Iterator[tuple[str, Any]]:
+    """Get the (key, value) pairs of a decoded events response. See iter_items."""
+    for key, value in data.items():
+        if key == "events" and isinstance(value, list):
+            for item in value:
+                yield "event", item
+        else:
+            yield key, value
+
+
+class _StreamBase:
+    def __init__(self, timezone: str):
+        self._timezone = timezone
+        self.meta = None
+
+    @property
+    def delta_last_id(self) -> Optional[str]:
+        """The delta_last_id of the response, or None until it has been read."""
+        return None if self.meta is None else self.meta.delta_last_id
+
+    def _parse(self, key: str, value: Any) -> Optional[Event]:
+        """Parse an event, or save the meta of the response."""
+        if key == "meta":
+            self.meta = Meta(**value)
+        elif key == "event":
+            with user_context(self._timezone):
+                return Event(**value)
+        return None
+
+
+class EventStream(_StreamBase):
+    """Iterator over the events of a response, which parses each event as soon as it
+    has been downloaded. Returned by Rundown.iter_events and similar methods.
+
+    Only the event being parsed and a chunk of the response are held in memory, rather
+    than the whole response and every parsed event. The request is made when iteration
+    starts, and the response is closed when iteration ends or close() is called.
+
+    Args:
+        items: (key, value) pairs of the response. See iter_items.
+        timezone: The timezone used to parse events.
+
+    Attributes:
+        meta (Optional[resources.events.Meta]): The meta of the response, or None
+            until it has been read. The API sends it before the events.
+    """
+
+    def __init__(self, items: Iterator[tuple[str, Any]], timezone: str):
+        super().__init__(timezone)
+        self._items = items
+
+    def __iter__(self) -> "EventStream":
+        return self
+
+    def __next__(self) -> Event:
+        for key, value in self._items:
+            event = self._parse(key, value)
+            if event is not None:
+                return event
+        raise StopIteration
+
+    def __enter__(self) -> "EventStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop iterating and close the response."""
+        close = getattr(self._items, "close", None)
+        if close is not None:
+            close()
+
+
+class AsyncEventStream(_StreamBase):
+    """Async iterator over the events of a response. Returned by
+    AsyncRundown.iter_events and similar methods. See EventStream.
+    """
+
+    def __init__(self, items: AsyncIterator[tuple[str, Any]], timezone: str):
+        super().__init__(timezone)
+        self._items = items
+
+    def __aiter__(self) -> "AsyncEventStream":
+        return self
+
+    async def __anext__(self) -> Event:
+        async for key, value in self._items:
+            event = self._parse(key, value)
+            if event is not None:
+                return event
+        raise StopAsyncIteration
+
+    async def __aenter__(self) -> "AsyncEventStream":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Stop iterating and close the response."""
+        aclose = getattr(self._items, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -8,9 +8,14 @@ context_timezone = ContextVar("context_timezone")
 def user_context(timezone: str):
     """Context manager used by Rundown in order to pass state to Pydantic validators.
 
+    context_timezone is a ContextVar, so each thread and each asyncio task sees the
+    timezone of the request it is parsing.
+
     Args:
         timezone: A timezone string.
     """
     token_timezone = context_timezone.set(timezone)
-    yield
-    context_timezone.reset(token_timezone)
+    try:
+        yield
+    finally:
+        context_timezone.reset(token_timezone)
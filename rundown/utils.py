@@ -1,18 +1,69 @@
+import re
+import time
+from datetime import datetime, tzinfo
+from functools import lru_cache
+
 import arrow
 import yaml
 
+_iso_date_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# How far ahead to look for a DST transition, and the step used to find it.
+_transition_horizon = 400 * 24 * 60 * 60
+_transition_step = 24 * 60 * 60
+
+# timezone -> (UTC offset in minutes, epoch time at which the offset may change).
+_offsets: dict[str, tuple[int, float]] = {}
+
+
+def _offset_at(tz: tzinfo, timestamp: float) -> int:
+    t_delta = datetime.fromtimestamp(timestamp, tz).utcoffset()
+    return int(t_delta.days * 24 * 60 + t_delta.seconds / 60)
+
+
+def _next_transition(tz: tzinfo, timestamp: float) -> float:
+    """Epoch time of the first change of tz's UTC offset after timestamp.
+
+    Steps forwards a day at a time, then bisects the day the offset changes in to the
+    second. If the offset doesn't change within the horizon, the end of the horizon is
+    returned, so the offset is checked again then.
+    """
+    offset = _offset_at(tz, timestamp)
+    lo = timestamp
+    while lo - timestamp < _transition_horizon:
+        hi = lo + _transition_step
+        if _offset_at(tz, hi) != offset:
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _offset_at(tz, mid) == offset:
+                    lo = mid
+                else:
+                    hi = mid
+            return hi
+        lo = hi
+    return lo
+
 
 def utc_offset(timezone: str) -> int:
     """Get UTC offset in minutes for timezone.
 
+    The offset is cached per timezone until the next DST transition, so the tz
+    database is only consulted again when the offset may have changed.
+
     Args:
         timezone: Timezone string of form accepted by Arrow library.
 
     Returns:
         int: the UTC offset in minutes.
     """
-    t_delta = arrow.now(timezone).utcoffset()
-    return int(t_delta.days * 24 * 60 + t_delta.seconds / 60)
+    now = time.time()
+    cached = _offsets.get(timezone)
+    if cached is None or now >= cached[1]:
+        tz = arrow.parser.TzinfoParser.parse(timezone)
+        cached = _offset_at(tz, now), _next_transition(tz, now)
+        # A single assignment, so other threads see either the old or new entry.
+        _offsets[timezone] = cached
+    return cached[0]
 
 
 def utc_shift(timezone: str) -> int:
@@ -36,6 +87,7 @@ def utc_shift(timezone: str) -> int:
     return -utc_offset(timezone)
 
 
+@lru_cache(maxsize=None)
 def utc_shift_to_tz(shift: int) -> str:
     """Given a number of minutes to shift UTC by, get matching ISO 8601 timezone string.
 
@@ -54,6 +106,24 @@ def utc_shift_to_tz(shift: int) -> str:
     return f"{sign}{hours:02d}:{minutes:02d}"
 
 
+def is_past_date(date: str) -> bool:
+    """Whether the 24 hour window for date has ended in every timezone.
+
+    Events methods can shift the window by any UTC offset, so only dates at least two
+    days before the current UTC date are considered past.
+
+    Args:
+        date: ISO 8601 date string ('YYYY-MM-DD'). The server returns today's events
+            for malformed dates, so they are never considered past.
+
+    Returns:
+        bool: Whether date is in the past.
+    """
+    if not _iso_date_pattern.match(date):
+        return False
+    return date < arrow.utcnow().shift(days=-1).format("YYYY-MM-DD")
+
+
 def write_yaml(obj, fname):
     with open(fname, "w") as f:
         yaml.dump(obj, f)
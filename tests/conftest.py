@@ -1,9 +1,12 @@
+import asyncio
 import os
 import json
 
+import httpx
 import pytest
 
 from rundown.rundown import Rundown
+from rundown.asyncrundown import AsyncRundown
 
 
 @pytest.fixture(scope="module")
@@ -64,3 +67,29 @@ def rundown2(request, monkeypatch):
         patched_build_url_and_get_json(request, original_fn),
     )
     return r
+
+
+def recorded_json_transport(request):
+    """httpx transport replaying the JSON saved for the matching TestRundown test."""
+    JSON_DIR = "tests/json"
+
+    def handler(http_request):
+        node_name = request.node.nodeid.split("::")[-1]
+        with open(f"{JSON_DIR}/TestRundown.{node_name}.json") as f:
+            content = f.read()
+        status_code = 404 if '"error"' in content[:20] else 200
+        return httpx.Response(status_code, content=content)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def async_rundown(request):
+    # httpx rejects None header values, unlike requests which drops them.
+    r = AsyncRundown(os.getenv("RAPIDAPI_KEY", ""), timezone="America/Phoenix")
+    # Close the client that is replaced, and the replacement after the test, so
+    # httpx doesn't warn about unclosed clients.
+    asyncio.run(r.aclose())
+    r._client = httpx.AsyncClient(transport=recorded_json_transport(request))
+    yield r
+    asyncio.run(r.aclose())
@@ -0,0 +1,50 @@
+import json
+
+from rundown.resources.events import Events, Meta
+from rundown.usercontext import user_context
+
+"""Fake clients, and loaders of the recorded responses, shared by the tests."""
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+
+
+def load_json(fname):
+    with open(fname) as f:
+        return json.load(f)
+
+
+def load_events(fname, timezone="UTC"):
+    data = load_json(fname)
+    with user_context(timezone):
+        return Events(**data)
+
+
+class FakeRundown:
+    """Returns recorded responses, and a 'no changes' response once they run out."""
+
+    timezone = "UTC"
+
+    def __init__(self, deltas):
+        self.deltas = list(deltas)
+        self.calls = []
+
+    def _validate_sport(self, sport):
+        return {"mlb": 3, "nhl": 6}.get(str(sport).lower(), sport)
+
+    def events(self, sport, date, *include):
+        self.calls.append(("events", sport, date))
+        return load_events(EVENTS_JSON)
+
+    def events_delta(self, last_id, *include, sport=None):
+        self.calls.append(("delta", last_id, sport))
+        if self.deltas:
+            return self.deltas.pop(0)
+        return Events.construct(meta=Meta(delta_last_id=last_id), events=[])
+
+
+class AsyncFakeRundown(FakeRundown):
+    async def events(self, *args):
+        return super().events(*args)
+
+    async def events_delta(self, *args, **kwargs):
+        return super().events_delta(*args, **kwargs)
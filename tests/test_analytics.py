@@ -0,0 +1,103 @@
+import pytest
+
+from tests.fakes import load_events
+
+np = pytest.importorskip("numpy")
+
+from rundown.analytics import (  # noqa: E402
+    MARKETS,
+    SIDES,
+    fair_price,
+    implied_probability,
+    odds_arrays,
+    overround,
+    remove_vig,
+    to_american,
+)
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include1].json"
+
+
+@pytest.mark.parametrize(
+    "fname, period", [(EVENTS_JSON, None), (PERIODS_JSON, "period_full_game")]
+)
+def test_odds_arrays_match_events(fname, period):
+    events = load_events(fname)
+    odds = odds_arrays(events, period)
+    assert odds.shape == (len(events.events), len(odds.affiliates), 3, 3)
+    assert odds.event_ids == [e.event_id for e in events.events]
+
+    for e, event in enumerate(events.events):
+        books = event.line_periods if period else event.lines
+        for affiliate, lines in (books or {}).items():
+            if period:
+                lines = getattr(lines, period)
+            a = odds.affiliate(affiliate)
+            ml = lines.moneyline
+            prices = odds.prices[e, a, odds.market("moneyline")]
+            for s, value in enumerate([ml.moneyline_away, ml.moneyline_home]):
+                if value is None:
+                    assert prices.mask[s]
+                else:
+                    assert prices[s] == value
+            total = lines.total
+            points = odds.points[e, a, odds.market("total")]
+            if total.total_over is not None:
+                assert points[SIDES.index("away")] == total.total_over
+            assert points.mask[SIDES.index("draw")]
+    assert odds.points[..., MARKETS.index("moneyline"), :].mask.all()
+
+
+def test_odds_arrays_affiliates():
+    events = load_events(EVENTS_JSON)
+    odds = odds_arrays(events, affiliates=["LowVig", "foobar"])
+    assert odds.affiliates == ["LowVig", "foobar"]
+    assert odds.prices[:, 1].mask.all()
+    assert not odds.prices[:, 0].mask.all()
+    with pytest.raises(ValueError):
+        odds_arrays(events, "period_fifth_period")
+
+
+def test_implied_probability():
+    p = implied_probability([-110, 100, 150, -200, 50])
+    np.testing.assert_allclose(p[:4], [110 / 210, 0.5, 0.4, 2 / 3])
+    assert p.mask.tolist() == [False] * 4 + [True]
+
+
+def test_remove_vig():
+    p = implied_probability([[-110, -110, np.nan], [-200, 150, np.nan]])
+    p = np.ma.masked_invalid(p)
+    np.testing.assert_allclose(overround(p), [220 / 210 - 1, 2 / 3 + 0.4 - 1])
+
+    fair = remove_vig(p)
+    np.testing.assert_allclose(fair.sum(axis=-1), [1, 1])
+    np.testing.assert_allclose(fair[0, :2], [0.5, 0.5])
+    additive = remove_vig(p, method="additive")
+    np.testing.assert_allclose(additive[1, :2], [2 / 3 - 1 / 30, 0.4 - 1 / 30])
+    with pytest.raises(ValueError):
+        remove_vig(p, method="foobar")
+
+
+def test_one_sided_markets_are_masked():
+    p = np.ma.masked_invalid(implied_probability([[-110, np.nan]]))
+    assert overround(p).mask.all()
+    assert remove_vig(p).mask.all()
+
+
+def test_fair_price():
+    np.testing.assert_allclose(to_american([0.5, 0.4, 0.8]), [-100, 150, -400])
+    fair = fair_price([[-110, -110], [-200, 170]])
+    np.testing.assert_allclose(fair[0], [-100, -100])
+    assert fair[1, 0] < -170 and fair[1, 1] > 170
+
+
+def test_fair_price_of_events():
+    odds = odds_arrays(load_events(EVENTS_JSON))
+    fair = fair_price(odds.prices[..., :2])
+    two_way = odds.prices[..., :2].count(axis=-1) == 2
+    assert (fair.count(axis=-1)[two_way] == 2).all()
+    assert fair.count() == 2 * two_way.sum()
+    np.testing.assert_allclose(
+        implied_probability(fair).sum(axis=-1)[two_way], 1, rtol=1e-9
+    )
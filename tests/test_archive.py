@@ -0,0 +1,151 @@
+import pytest
+
+from rundown.rundown import Rundown
+from rundown.usercontext import user_context
+
+from tests.fakes import load_json
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+ds = pytest.importorskip("pyarrow.dataset")
+
+from rundown.archive import ParquetArchive  # noqa: E402
+from rundown.export import events_columns  # noqa: E402
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[MLB-2021-05-12-None-include5].json"
+
+
+@pytest.fixture(scope="module")
+def events():
+    data = load_json(EVENTS_JSON)
+    with user_context("UTC"):
+        return Rundown("apikey")._parse_events(data)
+
+
+@pytest.fixture(scope="module")
+def period_events():
+    data = load_json(PERIODS_JSON)
+    with user_context("America/Phoenix"):
+        return Rundown("apikey")._parse_events(data)
+
+
+def parquet_files(root):
+    return sorted(root.glob("sport_id=*/date=*/*.parquet"))
+
+
+def test_partitions(tmp_path, events, period_events):
+    with ParquetArchive(tmp_path) as archive:
+        archive.write(events, "opening_lines", captured_at=0)
+        archive.write(period_events, "events")
+        assert parquet_files(tmp_path) == []
+
+    dirs = {f.parent.relative_to(tmp_path).as_posix() for f in parquet_files(tmp_path)}
+    assert dirs == {
+        "sport_id=3/date=2021-04-03",
+        "sport_id=3/date=2021-04-04",
+        "sport_id=3/date=2021-05-12",
+        "sport_id=3/date=2021-05-13",
+    }
+    table = archive.read()
+    n_rows = events.to_arrow().num_rows + period_events.to_arrow().num_rows
+    assert table.num_rows == n_rows
+    assert set(table.column("kind").to_pylist()) == {"opening_lines", "events"}
+
+    opening = archive.read(ds.field("kind") == "opening_lines")
+    assert opening.num_rows == events.to_arrow().num_rows
+    assert opening.column("captured_at")[0].value == 0
+    # Dates are partitioned in UTC, whatever the timezone of event_date.
+    late = archive.read(ds.field("date") == "2021-05-13")
+    assert all(d.startswith("2021-05-12T") for d in late["event_date"].to_pylist())
+
+
+def test_dictionary_encoding(tmp_path, period_events):
+    with ParquetArchive(tmp_path) as archive:
+        archive.write(period_events)
+    path = parquet_files(tmp_path)[0]
+    schema = pq.read_schema(path)
+    assert pa.types.is_dictionary(schema.field("affiliate_name").type)
+    assert pa.types.is_dictionary(schema.field("home_team").type)
+    column = pq.ParquetFile(path).metadata.row_group(0).column(
+        schema.get_field_index("affiliate_name")
+    )
+    assert {"PLAIN_DICTIONARY", "RLE_DICTIONARY"} & set(column.encodings)
+
+
+def test_row_groups_flush_full_partitions(tmp_path, period_events):
+    archive = ParquetArchive(tmp_path, row_group_size=100)
+    archive.write(period_events)
+    files = parquet_files(tmp_path)
+    assert files
+    for f in files:
+        metadata = pq.ParquetFile(f).metadata
+        assert metadata.num_rows >= 100
+        for i in range(metadata.num_row_groups):
+            assert metadata.row_group(i).num_rows <= 100
+
+
+def test_failed_write_keeps_rows(tmp_path, events, monkeypatch):
+    archive = ParquetArchive(tmp_path)
+    archive.write(events)
+    write_table = pq.write_table
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pq, "write_table", fail)
+    with pytest.raises(OSError):
+        archive.flush()
+    assert not list(tmp_path.rglob("*.parquet"))
+
+    monkeypatch.setattr(pq, "write_table", write_table)
+    archive.flush()
+    assert archive.read().num_rows == len(events_columns(events)["event_id"])
+
+
+def test_failed_write_buffers_every_partition(tmp_path, period_events, monkeypatch):
+    archive = ParquetArchive(tmp_path, row_group_size=1)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pq, "write_table", fail)
+    with pytest.raises(OSError):
+        archive.write(period_events)
+    assert len(archive._buffers) > 1
+    monkeypatch.undo()
+
+    archive.flush()
+    assert archive.read().num_rows == len(events_columns(period_events)["event_id"])
+
+
+def test_old_buffers_are_written(tmp_path, events, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("rundown.archive.time.monotonic", lambda: now)
+    archive = ParquetArchive(tmp_path, max_buffer_age=60)
+    archive.write(events)
+    assert not parquet_files(tmp_path)
+
+    now += 60
+    archive.write(events)
+    assert parquet_files(tmp_path)
+
+
+def test_compact(tmp_path, events):
+    archive = ParquetArchive(tmp_path)
+    for i in range(3):
+        archive.write(events, captured_at=i)
+        archive.flush()
+    before = archive.read()
+    n_files = len(parquet_files(tmp_path))
+    n_partitions = len({f.parent for f in parquet_files(tmp_path)})
+    assert n_files == 3 * n_partitions
+
+    assert archive.compact() == n_files
+    assert len(parquet_files(tmp_path)) == n_partitions
+    after = archive.read()
+    assert after.num_rows == before.num_rows
+    assert sorted(after.column("captured_at").to_pylist()) == sorted(
+        before.column("captured_at").to_pylist()
+    )
+    assert archive.compact() == 0
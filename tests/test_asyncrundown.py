@@ -0,0 +1,133 @@
+import asyncio
+
+import httpx
+import pytest
+
+from rundown.resources.events import Events
+from rundown.resources.event import Event
+from rundown.resources.sport import Sport
+from rundown.resources.line import Moneyline
+from rundown.resources.lineperiods import LinePeriods
+from rundown.resources.schedule import Schedule
+
+
+class TestAsyncRundown:
+    """AsyncRundown replays the JSON responses saved by the TestRundown tests."""
+
+    def test_sports(self, async_rundown):
+        data = asyncio.run(async_rundown.sports())
+        assert len(data) > 0
+        assert all(isinstance(el, Sport) for el in data)
+
+    @pytest.mark.parametrize(
+        "sport_id, date, offset, include",
+        [
+            ("MLB", "2021-04-03", None, []),
+            ("MLB", "2021-04-03", None, ["all_periods"]),
+            ("MLB", "2021-05-11", None, []),
+        ],
+    )
+    def test_events(self, async_rundown, sport_id, date, offset, include):
+        events = asyncio.run(
+            async_rundown.events(sport_id, date, *include, offset=offset)
+        )
+        assert isinstance(events, Events)
+        assert len(events.events) > 0
+        for e in events.events:
+            assert isinstance(e, Event)
+            assert e.event_date[-6:] == "-07:00"
+
+    @pytest.mark.parametrize(
+        "line_id, include", [(14526697, []), (14526696, ["all_periods"])]
+    )
+    def test_moneyline(self, async_rundown, line_id, include):
+        data = asyncio.run(async_rundown.moneyline(line_id, *include))
+        if isinstance(data, list):
+            assert len(data) > 0
+            assert all(isinstance(ml, Moneyline) for ml in data)
+        else:
+            assert isinstance(data, LinePeriods)
+
+    def test_bad_event(self, async_rundown):
+        assert asyncio.run(async_rundown.event("foobar")) is None
+
+    @pytest.mark.parametrize(
+        "sport, date_from, limit, expected", [(6, "2021-04-05", 10, 10)]
+    )
+    def test_schedule(self, async_rundown, sport, date_from, limit, expected):
+        data = asyncio.run(async_rundown.schedule(sport, date_from, limit))
+        assert len(data) == expected
+        assert all(isinstance(sched, Schedule) for sched in data)
+
+
+def test_timezone_context_is_per_task(async_rundown, monkeypatch):
+    """Concurrent tasks each parse their response using their own offset."""
+    with open("tests/json/TestRundown.test_dates[6-None-date--07:00].json") as f:
+        content = f.read()
+
+    async def get(url, **params):
+        # Yield control so both requests are in flight before either is parsed.
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=content)
+
+    monkeypatch.setattr(async_rundown, "_get", get)
+
+    async def main():
+        return await asyncio.gather(
+            async_rundown.dates(6, offset=420), async_rundown.dates(6, offset=-300)
+        )
+
+    phoenix, utc_plus_5 = asyncio.run(main())
+    assert all(d.date.endswith("-07:00") for d in phoenix)
+    assert all(d.date.endswith("+05:00") for d in utc_plus_5)
+
+
+def test_events_many_reports_errors_per_item(async_rundown, monkeypatch):
+    with open(
+        "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+    ) as f:
+        content = f.read()
+
+    async def get(url, **params):
+        if url.endswith("2021-04-04"):
+            raise httpx.ConnectError("connection reset")
+        return httpx.Response(200, content=content)
+
+    monkeypatch.setattr(async_rundown, "_get", get)
+
+    results = asyncio.run(
+        async_rundown.events_many(["MLB", "NHL"], ["2021-04-03", "2021-04-04"])
+    )
+    assert len(results) == 4
+    assert isinstance(results[(3, "2021-04-03")], Events)
+    assert isinstance(results[(6, "2021-04-03")], Events)
+    assert isinstance(results[(3, "2021-04-04")], httpx.ConnectError)
+    assert isinstance(results[(6, "2021-04-04")], httpx.ConnectError)
+
+
+def test_iter_events_streams_response(async_rundown):
+    with open(
+        "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include1].json", "rb"
+    ) as f:
+        content = f.read()
+
+    async def chunks():
+        for i in range(0, len(content), 4096):
+            yield content[i:i + 4096]
+
+    def handler(request):
+        assert request.url.path.endswith("/sports/3/events/2021-04-03")
+        return httpx.Response(200, content=chunks())
+
+    async_rundown._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def main():
+        stream = async_rundown.iter_events("MLB", "2021-04-03", "all_periods")
+        async with stream:
+            return [e async for e in stream], stream.delta_last_id
+
+    events, delta_last_id = asyncio.run(main())
+    assert len(events) > 0
+    assert all(isinstance(e, Event) for e in events)
+    assert all(e.event_date.endswith("-07:00") for e in events)
+    assert delta_last_id is not None
@@ -0,0 +1,173 @@
+import threading
+
+import pytest
+
+from rundown.backfill import Backfill, Manifest, WorkUnit, backfill, plan
+from rundown.ratelimit import TokenBucket
+from rundown.resources.events import Events, Meta
+from rundown.utils import utc_shift
+
+
+class FakeRundown:
+    """Returns empty Events, failing the (kind, sport_id, date) units in fail once."""
+
+    def __init__(self, fail=(), timezone="UTC"):
+        self.timezone = timezone
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _validate_offset(self, offset):
+        return utc_shift(self.timezone) if offset is None else offset
+
+    def _validate_sport(self, sport):
+        return {"mlb": 3, "nhl": 6}.get(str(sport).lower(), sport)
+
+    def _call(self, kind, sport_id, date, *include, offset=None, parse="full"):
+        unit = (kind, sport_id, date)
+        with self._lock:
+            self.calls.append((*unit, include))
+            if unit in self.fail:
+                self.fail.remove(unit)
+                raise ConnectionError(unit)
+        meta = Meta(delta_last_id=f"{sport_id}/{date}")
+        return Events.construct(meta=meta, events=[])
+
+    def opening_lines(self, *args, **kwargs):
+        return self._call("opening_lines", *args, **kwargs)
+
+    def closing_lines(self, *args, **kwargs):
+        return self._call("closing_lines", *args, **kwargs)
+
+
+def test_plan():
+    units = plan([3, 6], "2021-02-27", "2021-03-01", ["opening_lines", "closing_lines"])
+    assert len(units) == 3 * 2 * 2
+    assert units[0] == WorkUnit("opening_lines", 3, "2021-02-27")
+    assert units[-1] == WorkUnit("closing_lines", 6, "2021-03-01")
+    assert [u.date for u in units] == sorted(u.date for u in units)
+
+
+@pytest.mark.parametrize(
+    "start, end, kinds",
+    [
+        ("2021-03-02", "2021-03-01", ["closing_lines"]),
+        ("2021-3-1", "2021-03-01", ["closing_lines"]),
+        ("2021-03-01", "2021-03-01", ["foobar"]),
+    ],
+)
+def test_plan_invalid(start, end, kinds):
+    with pytest.raises(ValueError):
+        plan([3], start, end, kinds)
+
+
+def test_sink_gets_every_unit():
+    r = FakeRundown()
+    written = []
+    report = backfill(
+        r,
+        ["MLB", "NHL"],
+        "2021-03-01",
+        "2021-03-10",
+        "scores",
+        kinds=["opening_lines", "closing_lines"],
+        sink=lambda events, kind: written.append((kind, events.meta.delta_last_id)),
+        max_concurrency=4,
+    )
+    assert report.done == 40 and report.skipped == 0 and report.failures == {}
+    assert len(set(written)) == 40
+    assert all(call[3] == ("scores",) for call in r.calls)
+
+
+def test_resume_after_failures(tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    failing = {("closing_lines", 3, "2021-03-02"), ("closing_lines", 3, "2021-03-04")}
+    r = FakeRundown(fail=failing)
+    report = Backfill(
+        r, ["MLB"], "2021-03-01", "2021-03-05", manifest=manifest, checkpoint_every=2
+    ).run()
+    assert report.done == 3
+    assert {tuple(u) for u in report.failures} == failing
+    assert len(manifest.read_text().splitlines()) == 3
+
+    # Only the failed units are requested again.
+    r.calls.clear()
+    report = Backfill(r, ["MLB"], "2021-03-01", "2021-03-05", manifest=manifest).run()
+    assert (report.done, report.skipped) == (2, 3)
+    assert {c[:3] for c in r.calls} == failing
+
+    # Other include parameters are a different backfill.
+    backfill_periods = Backfill(
+        r, ["MLB"], "2021-03-01", "2021-03-05", "all_periods", manifest=manifest
+    )
+    assert len(backfill_periods.pending()) == 5
+    backfill_offset = Backfill(
+        r, ["MLB"], "2021-03-01", "2021-03-05", manifest=manifest, offset=-240
+    )
+    assert len(backfill_offset.pending()) == 5
+
+
+def test_manifest_keys_client_timezone(tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    dates = ("2021-03-01", "2021-03-05")
+    Backfill(FakeRundown(), ["MLB"], *dates, manifest=manifest).run()
+    new_york = FakeRundown(timezone="America/New_York")
+    report = Backfill(new_york, ["MLB"], *dates, manifest=manifest).run()
+    assert (report.done, report.skipped) == (5, 0)
+
+
+def test_manifest_ignores_truncated_line(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    Manifest(path).record([WorkUnit("closing_lines", 3, "2021-03-01")], (), 0)
+    with open(path, "a") as f:
+        f.write('{"kind": "closing_')
+    manifest = Manifest(path)
+    assert (WorkUnit("closing_lines", 3, "2021-03-01"), (), 0) in manifest
+    assert len(manifest.completed) == 1
+
+
+def test_sink_is_flushed_before_recording(tmp_path):
+    manifest = Manifest(tmp_path / "manifest.jsonl")
+
+    class Sink:
+        def __init__(self):
+            self.buffered = 0
+            self.flushed = 0
+
+        def write(self, events, kind):
+            self.buffered += 1
+
+        def flush(self):
+            # Every recorded unit must have been flushed.
+            assert len(manifest.completed) <= self.flushed
+            self.flushed, self.buffered = self.flushed + self.buffered, 0
+
+    sink = Sink()
+    Backfill(
+        FakeRundown(),
+        [3],
+        "2021-03-01",
+        "2021-03-20",
+        sink=sink,
+        manifest=manifest,
+        checkpoint_every=3,
+    ).run()
+    assert sink.flushed == len(manifest.completed) == 20
+
+
+def test_progress_and_rate():
+    progress = []
+    bucket = TokenBucket(1000, capacity=1)
+    report = Backfill(
+        FakeRundown(fail={("closing_lines", 3, "2021-03-03")}),
+        [3],
+        "2021-03-01",
+        "2021-03-05",
+        rate=bucket,
+        progress=progress.append,
+    ).run()
+    assert len(progress) == 5
+    last = progress[-1]
+    assert (last.done, last.failed, last.total, last.eta) == (4, 1, 5, 0)
+    assert last.rate > 0
+    assert report.elapsed >= 4 / 1000
@@ -0,0 +1,72 @@
+import math
+import os
+
+import arrow
+import pytest
+
+from rundown.cache import CachePolicy, ResponseCache
+from rundown.rundown import Rundown
+
+
+@pytest.mark.parametrize(
+    "segments, expected",
+    [
+        (["sports"], 24 * 60 * 60),
+        (["affiliates"], 24 * 60 * 60),
+        (["sports", 6, "teams"], 24 * 60 * 60),
+        (["sports", 6, "closing", "2021-04-03"], math.inf),
+        (["sports", 6, "events", "2021-04-03"], math.inf),
+        (["sports", 6, "events", "foobar"], 10),
+        (["sports", 6, "dates"], 60),
+        (["lines", 14526697, "moneyline"], 60),
+        (["delta"], None),
+    ],
+)
+def test_cache_policy(segments, expected):
+    assert CachePolicy().ttl(*segments) == expected
+
+
+def test_cache_policy_today_is_live():
+    today = arrow.utcnow().format("YYYY-MM-DD")
+    assert CachePolicy(live_ttl=5).ttl("sports", 6, "openers", today) == 5
+
+
+def test_cache_key_ignores_param_order():
+    k1 = ResponseCache.key("url", {"offset": 0, "include": ("scores", "all_periods")})
+    k2 = ResponseCache.key("url", {"include": ["scores", "all_periods"], "offset": 0})
+    assert k1 == k2
+
+
+def test_cache_lru_eviction():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", {"a": 1}, 60)
+    cache.set("b", {"b": 1}, 60)
+    assert cache.get("a") == {"a": 1}
+    # 'b' is now the least recently used.
+    cache.set("c", {"c": 1}, 60)
+    assert cache.get("b") is None
+    assert cache.get("c") == {"c": 1}
+    assert cache.info() == (2, 1, 2, 2)
+
+
+def test_cache_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("rundown.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache()
+    cache.set("a", {"a": 1}, 10)
+    now[0] += 9
+    assert cache.get("a") == {"a": 1}
+    now[0] += 1
+    assert cache.get("a") is None
+    assert cache.info().currsize == 0
+
+
+class TestRundownCache:
+    @pytest.mark.parametrize("vcr_cassette_name", ["TestRundown.test_sports"])
+    @pytest.mark.vcr()
+    def test_rundown_uses_cache(self, vcr_cassette_name):
+        cache = ResponseCache()
+        rundown = Rundown(os.getenv("RAPIDAPI_KEY"), cache=cache)
+        # The cassette holds a single response, so the second call must be a hit.
+        assert rundown.sports() == rundown.sports()
+        assert cache.info().hits == 1
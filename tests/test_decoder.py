@@ -0,0 +1,28 @@
+import pytest
+
+from rundown import decoder
+
+
+@pytest.fixture
+def restore_backend():
+    backend = decoder.backend
+    yield
+    decoder.use_backend(backend)
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_backends_round_trip(restore_backend, backend):
+    pytest.importorskip(backend)
+    decoder.use_backend(backend)
+    data = {"events": [{"event_id": "abc", "score": None, "lines": {"1": 1.5}}]}
+    assert decoder.backend == backend
+    assert decoder.loads(decoder.dumps(data)) == data
+    assert (
+        decoder.dumps(data)
+        == b'{"events":[{"event_id":"abc","score":null,"lines":{"1":1.5}}]}'
+    )
+
+
+def test_unknown_backend_raises(restore_backend):
+    with pytest.raises(ValueError):
+        decoder.use_backend("simplejson")
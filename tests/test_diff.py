@@ -0,0 +1,121 @@
+import copy
+
+import pytest
+
+from rundown.diff import PriceChange, ScoreChange, StatusChange, diff_events
+from rundown.lazy import lazy
+from rundown.resources.events import Events
+from rundown.usercontext import user_context
+
+from tests.fakes import load_json
+
+LINES_JSON = "tests/json/TestRundown.test_events[MLB-2021-05-11-None-include2].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[NBA-2021-05-11-None-include13].json"
+
+
+@pytest.fixture
+def raw():
+    return load_json(LINES_JSON)
+
+
+def published(lines, market, field):
+    """The first sportsbook with a published price for field."""
+    for affiliate_id, sl in lines.items():
+        if sl[market][field] not in (None, 0.0001):
+            return affiliate_id
+    raise LookupError(field)
+
+
+def test_unchanged(raw):
+    assert not any(diff_events(raw, copy.deepcopy(raw)))
+    with user_context("UTC"):
+        events = Events(**raw)
+    assert not any(diff_events(events, events))
+    # Snapshots of different kinds are comparable.
+    assert not any(diff_events(raw, events))
+    assert not any(diff_events(lazy(Events, raw, "UTC"), events))
+
+
+def test_changes(raw):
+    new = copy.deepcopy(raw)
+    removed = new["events"].pop()
+    added = dict(new["events"][0], event_id="added")
+    new["events"].append(added)
+
+    event = new["events"][1]
+    event["score"]["event_status"] = "STATUS_FOOBAR"
+    event["score"]["score_home"] += 1
+    affiliate_id = published(event["lines"], "moneyline", "moneyline_home")
+    moneyline = event["lines"][affiliate_id]["moneyline"]
+    old_price = moneyline["moneyline_home"]
+    moneyline["moneyline_home"] = old_price - 10
+    # Deltas and dates aren't prices.
+    moneyline["moneyline_home_delta"] = 1
+    moneyline["date_updated"] = "2021-05-12T00:00:00Z"
+
+    diff = diff_events(raw, new)
+    assert diff.added == [added]
+    assert diff.removed == [removed]
+    old_score = raw["events"][1]["score"]
+    event_id = event["event_id"]
+    assert diff.status == [
+        StatusChange(event_id, old_score["event_status"], "STATUS_FOOBAR")
+    ]
+    assert diff.scores == [
+        ScoreChange(
+            event_id,
+            (old_score["score_away"], old_score["score_home"]),
+            (old_score["score_away"], old_score["score_home"] + 1),
+        )
+    ]
+    affiliate = event["lines"][affiliate_id]["affiliate"]["affiliate_name"]
+    assert diff.prices == [
+        PriceChange(
+            event_id,
+            affiliate,
+            None,
+            "moneyline",
+            {"moneyline_home": (old_price, old_price - 10)},
+        )
+    ]
+
+    # Resources give the same changes.
+    with user_context("UTC"):
+        old_events, new_events = Events(**raw), Events(**new)
+    model_diff = diff_events(old_events, new_events)
+    assert model_diff.status == diff.status
+    assert model_diff.scores == diff.scores
+    assert model_diff.prices == diff.prices
+    assert [e.event_id for e in model_diff.added] == ["added"]
+
+
+def test_sportsbook_removed(raw):
+    new = copy.deepcopy(raw)
+    event = new["events"][0]
+    affiliate_id = published(event["lines"], "spread", "point_spread_home")
+    spread = event["lines"].pop(affiliate_id)["spread"]
+
+    diff = diff_events(raw, new, markets=["spread"])
+    assert len(diff.prices) == 1
+    change = diff.prices[0]
+    assert change.market == "spread"
+    assert change.changes["point_spread_home"] == (spread["point_spread_home"], None)
+    assert all(new is None for _, new in change.changes.values())
+
+    with pytest.raises(ValueError):
+        diff_events(raw, new, markets=["foobar"])
+
+
+def test_line_periods():
+    raw = load_json(PERIODS_JSON)
+    new = copy.deepcopy(raw)
+    event = new["events"][0]
+    line_periods = next(iter(event["line_periods"].values()))
+    total = line_periods["period_full_game"]["total"]
+    total["total_over"] = 999.5
+
+    diff = diff_events(raw, new)
+    assert [(c.event_id, c.period, c.market) for c in diff.prices] == [
+        (event["event_id"], "period_full_game", "total")
+    ]
+    assert diff.prices[0].changes["total_over"][1] == 999.5
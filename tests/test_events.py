@@ -0,0 +1,90 @@
+import pytest
+
+from tests.fakes import load_events
+
+LINES_JSON = "tests/json/TestRundown.test_events[MLB-2021-05-11-None-include2].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[NBA-2021-05-11-None-include13].json"
+PERIOD = "period_full_game"
+
+
+@pytest.fixture
+def events():
+    return load_events(LINES_JSON)
+
+
+def test_get_event(events):
+    for event in events.events:
+        assert events.get_event(event.event_id) is event
+    assert events.get_event("foobar") is None
+
+
+def test_by_team(events):
+    team_ids = {t.team_id for e in events.events for t in e.teams_normalized}
+    for team_id in team_ids:
+        expected = [
+            e
+            for e in events.events
+            if team_id in [t.team_id for t in e.teams_normalized]
+        ]
+        assert events.by_team(team_id) == expected
+    assert events.by_team(-1) == []
+
+
+def test_by_status(events):
+    statuses = {e.score.event_status for e in events.events}
+    assert len(statuses) > 1
+    for status in statuses:
+        expected = [e for e in events.events if e.score.event_status == status]
+        assert events.by_status(status) == expected
+
+
+def test_by_affiliate(events):
+    name, lines = next(iter(events.events[0].lines.items()))
+    expected = [(e, e.lines[name]) for e in events.events if name in e.lines]
+    assert events.by_affiliate(name) == expected
+    assert events.by_affiliate(lines.affiliate.affiliate_id) == expected
+    assert events.by_affiliate(name, PERIOD) == []
+
+
+def test_by_affiliate_period():
+    events = load_events(PERIODS_JSON)
+    name = next(iter(events.events[0].line_periods))
+    expected = [
+        (e, e.line_periods[name].period_full_game)
+        for e in events.events
+        if name in (e.line_periods or {})
+    ]
+    assert events.by_affiliate(name, PERIOD) == expected
+    assert events.by_affiliate(name) == []
+
+
+def test_indexes_invalidated(events):
+    first, *rest = events.events
+    assert events.get_event(first.event_id) is first
+
+    events.events.remove(first)
+    assert events.get_event(first.event_id) is None
+    events.events.append(first)
+    assert events.get_event(first.event_id) is first
+    assert events.by_team(first.teams_normalized[0].team_id)[-1] is first
+
+    events.events = rest
+    assert events.get_event(first.event_id) is None
+
+    # Changes keeping the length are noticed too.
+    removed = events.events.pop(0)
+    events.events.append(first)
+    assert events.get_event(removed.event_id) is None
+    assert events.get_event(first.event_id) is first
+
+    replaced = events.events[0]
+    moved = replaced.copy(update={"event_id": "moved"})
+    events.events[0] = moved
+    assert events.get_event("moved") is moved
+    assert events.get_event(replaced.event_id) is None
+
+
+def test_indexes_not_exported(events):
+    events.get_event(events.events[0].event_id)
+    assert events.dict() == load_events(LINES_JSON).dict()
+    assert events == load_events(LINES_JSON)
@@ -0,0 +1,121 @@
+
+import pytest
+
+from rundown.export import events_columns, lines_columns, lines_to_arrow
+from rundown.rundown import Rundown
+from rundown.usercontext import user_context
+
+from tests.fakes import load_json
+
+pa = pytest.importorskip("pyarrow")
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[MLB-2021-05-12-None-include5].json"
+MONEYLINE_JSON = "tests/json/TestRundown.test_moneyline[14526697-include0].json"
+MONEYLINE_PERIODS_JSON = "tests/json/TestRundown.test_moneyline[10719638-include5].json"
+SPREAD_JSON = "tests/json/TestRundown.test_spread[10731355-include4].json"
+LINE_PERIODS_JSON = "tests/json/TestAPI.test_lines_all_periods_scores[{}].json"
+
+
+@pytest.fixture(scope="module")
+def rundown():
+    return Rundown("apikey", timezone="UTC")
+
+
+@pytest.mark.parametrize("fname", [EVENTS_JSON, PERIODS_JSON])
+def test_events_to_arrow(rundown, fname):
+    data = load_json(fname)
+    with user_context("UTC"):
+        events = rundown._parse_events(data)
+        raw = rundown._parse_events(data, "raw")
+        lazy = rundown._parse_events(data, "lazy")
+    table = events.to_arrow()
+
+    n_rows = sum(
+        len(e.lines or {}) + 8 * len(e.line_periods or {}) for e in events.events
+    )
+    assert table.num_rows == n_rows
+    assert table.schema.field("affiliate_name").type == pa.dictionary(
+        pa.int32(), pa.string()
+    )
+    assert table.schema.field("moneyline_home").type == pa.float64()
+    # Every parse mode gives the same table.
+    assert table.equals(pa.Table.from_pydict(events_columns(raw), table.schema))
+    assert table.equals(pa.Table.from_pydict(events_columns(lazy), table.schema))
+
+
+def test_events_rows_match_resources(rundown):
+    with user_context("UTC"):
+        events = rundown._parse_events(load_json(PERIODS_JSON))
+    rows = events.to_arrow().to_pylist()
+    i = 0
+    for event in events.events:
+        away = next(t for t in event.teams_normalized if t.is_away)
+        for line_periods in event.line_periods.values():
+            for period in line_periods.__fields__:
+                lines, row = getattr(line_periods, period), rows[i]
+                assert row["event_id"] == event.event_id
+                assert row["away_team"] == away.name
+                assert row["event_status"] == event.score.event_status
+                assert row["period"] == period
+                assert row["affiliate_name"] == lines.affiliate.affiliate_name
+                assert row["moneyline_home"] == lines.moneyline.moneyline_home
+                assert row["total_over"] == lines.total.total_over
+                assert row["spread_date_updated"] == lines.spread.date_updated
+                i += 1
+
+
+def test_events_to_pandas(rundown):
+    pytest.importorskip("pandas")
+    with user_context("UTC"):
+        events = rundown._parse_events(load_json(PERIODS_JSON))
+    df = events.to_pandas()
+    assert len(df) == events.to_arrow().num_rows
+    assert str(df["affiliate_name"].dtype) == "category"
+    assert str(df["line_id"].dtype) == "Int64"
+    assert df["moneyline_home"].isna().any()
+
+
+@pytest.mark.parametrize(
+    "fname, market", [(MONEYLINE_JSON, "moneyline"), (SPREAD_JSON, "spread")]
+)
+def test_lines_to_arrow(rundown, fname, market):
+    data = load_json(fname)
+    with user_context("UTC"):
+        lines = rundown._parse_lines(data, market, ())
+        raw = rundown._parse_lines(data, market, (), "raw")
+    table = lines_to_arrow(lines)
+    assert table.num_rows == len(lines)
+    assert table.column("line_id").to_pylist() == [line.line_id for line in lines]
+    assert ("event_id" in table.column_names) == (market == "spread")
+    assert lines_to_arrow(raw).equals(table)
+
+
+def test_line_periods_to_arrow(rundown):
+    data = load_json(MONEYLINE_PERIODS_JSON)
+    with user_context("UTC"):
+        line_periods = rundown._parse_lines(data, "moneyline", ("all_periods",))
+    table = line_periods.to_arrow()
+    periods = table.column("period").to_pylist()
+    assert len(periods) == sum(len(v) for v in line_periods.dict().values())
+    assert periods[0] == "period_full_game"
+    assert table.column("period_description").null_count == 0
+    first = line_periods.period_full_game[0]
+    assert table.slice(0, 1).to_pylist()[0]["moneyline_home"] == first.moneyline_home
+
+
+@pytest.mark.parametrize(
+    "market, column", [("spread", "point_spread_home"), ("total", "total_over")]
+)
+def test_spread_and_total_periods_to_arrow(rundown, market, column):
+    data = load_json(LINE_PERIODS_JSON.format(market))
+    with user_context("UTC"):
+        line_periods = rundown._parse_lines(data, market, ("all_periods",))
+    table = line_periods.to_arrow()
+    values = [getattr(line, column) for line in line_periods.period_full_game]
+    assert any(value is not None for value in values)
+    assert table.column(column).to_pylist()[:len(values)] == values
+
+
+def test_empty_lines():
+    assert lines_columns([])["line_id"] == []
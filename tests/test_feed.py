@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from rundown.feed import AsyncChangeFeed, ChangeFeed, LineChange
+from rundown.poller import AsyncDeltaPoller, DeltaPoller
+
+from tests.fakes import AsyncFakeRundown, FakeRundown, load_events
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include1].json"
+
+
+@pytest.fixture(scope="module")
+def events():
+    return load_events(EVENTS_JSON)
+
+
+@pytest.fixture(scope="module")
+def period_events():
+    return load_events(PERIODS_JSON)
+
+
+@pytest.fixture
+def feed():
+    return ChangeFeed(DeltaPoller(FakeRundown([]), ["MLB", "NHL"]))
+
+
+def test_unfiltered_subscriber_gets_everything(feed, events):
+    received = []
+    feed.subscribe(received.append)
+    feed.publish(events)
+
+    assert len(received) == 1
+    assert [c.event for c in received[0]] == events.events
+    lines = received[0][0].lines
+    assert len(lines) == 3 * len(events.events[0].lines)
+    assert all(isinstance(lc, LineChange) for lc in lines)
+
+
+def test_filters(feed, events):
+    received = []
+    feed.subscribe(
+        received.append, sports=["MLB"], affiliates=[3, "Bovada"], markets=["spread"]
+    )
+    feed.publish(events)
+
+    for change in received[0]:
+        for lc in change.lines:
+            assert lc.affiliate in ("Pinnacle", "Bovada")
+            assert lc.market == "spread"
+            assert lc.line is change.event.lines[lc.affiliate].spread
+            assert lc.period is None
+
+
+def test_subscribers_of_other_sports_get_nothing(feed, events):
+    received = []
+    feed.subscribe(received.append, sports=["NHL"])
+    feed.publish(events)
+    assert received == []
+
+
+def test_periods_filter(feed, period_events):
+    received = []
+    feed.subscribe(received.append, periods=["period_full_game"])
+    feed.subscribe(received.append, periods=[None])
+    feed.publish(period_events)
+
+    assert len(received) == 1
+    assert {lc.period for c in received[0] for lc in c.lines} == {"period_full_game"}
+
+
+def test_invalid_filters(feed):
+    with pytest.raises(ValueError):
+        feed.subscribe(markets=["foobar"])
+    with pytest.raises(ValueError):
+        feed.subscribe(periods=["period_fifth_period"])
+
+
+def test_iterate_until_unsubscribed(feed, events):
+    subscription = feed.subscribe(markets=["total"])
+    feed.publish(events)
+    feed.publish(events)
+    subscription.unsubscribe()
+    feed.publish(events)
+    assert len(list(subscription)) == 2
+
+
+def test_failing_callback_is_isolated(feed, events, caplog):
+    received = []
+
+    def fail(changes):
+        raise RuntimeError("subscriber bug")
+
+    feed.subscribe(fail)
+    feed.subscribe(received.append)
+    feed.publish(events)
+    assert len(received) == 1
+    assert "subscriber bug" in caplog.text
+
+
+def test_full_queue_drops_oldest(feed, events):
+    subscription = feed.subscribe(markets=["total"], maxsize=2)
+    for _ in range(3):
+        feed.publish(events)
+    subscription.unsubscribe()
+    assert subscription.dropped == 2
+    assert len(list(subscription)) == 1
+
+
+def test_async_feed(events):
+    poller = AsyncDeltaPoller(
+        AsyncFakeRundown([]), ["MLB"], dates=["2021-04-03"], min_interval=0
+    )
+    feed = AsyncChangeFeed(poller)
+
+    async def main():
+        received = []
+
+        async def callback(changes):
+            received.append(changes)
+            feed.stop()
+
+        async def fail(changes):
+            raise RuntimeError("subscriber bug")
+
+        subscription = feed.subscribe(markets=["moneyline"])
+        feed.subscribe(fail)
+        feed.subscribe(callback)
+        await feed.run()
+        return received, [changes async for changes in subscription]
+
+    received, queued = asyncio.run(main())
+    assert len(received) == 1
+    assert len(queued) == 1
+    assert all(lc.market == "moneyline" for c in queued[0] for lc in c.lines)
@@ -0,0 +1,185 @@
+import math
+
+import arrow
+import pytest
+
+from rundown.history import LineHistoryCache, LineSeries, line_histories
+from rundown.rundown import Rundown
+from rundown.usercontext import user_context
+
+from tests.fakes import load_json
+
+LINES_JSON = "tests/json/TestRundown.test_{}[14526697-include0].json"
+LINE_ID = 14526697
+
+
+class FakeRundown(Rundown):
+    """Returns the recorded histories of LINE_ID, and fails for line id 0."""
+
+    def __init__(self):
+        super().__init__("apikey", timezone="America/Phoenix")
+        self.calls = []
+
+    def _build_url_and_get_json(self, _, line_id, market, **params):
+        self.calls.append((market, line_id))
+        if line_id == 0:
+            raise ConnectionError()
+        if line_id != LINE_ID:
+            return {f"{market}s": []}
+        return load_json(LINES_JSON.format(market))
+
+
+class GrowingRundown(FakeRundown):
+    """Returns the first n lines of the recorded history, newest first."""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = load_json(LINES_JSON.format("moneyline"))["moneylines"]
+        self.n = 0
+
+    def _build_url_and_get_json(self, _, line_id, market, **params):
+        self.calls.append((market, line_id))
+        oldest_first = self.lines[::-1][: self.n]
+        return {f"{market}s": oldest_first[::-1]}
+
+
+@pytest.fixture(scope="module")
+def moneylines():
+    with user_context("UTC"):
+        return FakeRundown().moneyline(LINE_ID)
+
+
+@pytest.fixture(scope="module")
+def series(moneylines):
+    return LineSeries.from_lines(LINE_ID, "moneyline", moneylines)
+
+
+def test_series_matches_lines(series, moneylines):
+    assert len(series) == len(moneylines)
+    assert list(series.timestamps) == sorted(series.timestamps)
+    assert "moneyline_home_delta" not in series.columns
+    by_time = {arrow.get(ml.date_updated).timestamp(): ml for ml in moneylines}
+    for i, t in enumerate(series.timestamps):
+        ml = by_time[t]
+        home = series.columns["moneyline_home"][i]
+        if ml.moneyline_home is None:
+            assert math.isnan(home)
+        else:
+            assert home == ml.moneyline_home
+
+
+def test_equal_timestamps():
+    lines = [
+        {"date_updated": "2021-05-11T10:00:00Z", "moneyline_home": None},
+        {"date_updated": "2021-05-11T10:00:00Z", "moneyline_home": -110},
+    ]
+    series = LineSeries.from_lines(1, "moneyline", lines)
+    # The later of lines updated at the same time is in effect.
+    assert series.asof("2021-05-11T10:00:00Z")["moneyline_home"] == -110
+
+
+def test_asof(series, moneylines):
+    first, last = series.timestamps[0], series.timestamps[-1]
+    assert series.asof(first - 1) is None
+    assert series.asof(first)["timestamp"] == first
+    assert series.asof(last + 10**6)["timestamp"] == last
+
+    ml = max(moneylines, key=lambda ml: ml.date_updated)
+    row = series.asof(ml.date_updated)
+    assert row["moneyline_home"] == ml.moneyline_home
+    assert row["moneyline_away"] == ml.moneyline_away
+    # ISO strings in any timezone, and datetimes, are the same time.
+    when = arrow.get(ml.date_updated)
+    assert series.asof(when.to("Asia/Tokyo").isoformat()) == row
+    assert series.asof(when.datetime) == row
+
+
+def test_resample(series):
+    first = series.timestamps[0]
+    hourly = series.resample(3600, start=first - 3600)
+    assert hourly.timestamps[1] == first
+    assert all(math.isnan(v[0]) for v in hourly.columns.values())
+    for t in hourly.timestamps[1:]:
+        row = hourly.asof(t)
+        expected = series.asof(t)
+        assert {k: v for k, v in row.items() if k != "timestamp"} == {
+            k: v for k, v in expected.items() if k != "timestamp"
+        }
+    with pytest.raises(ValueError):
+        series.resample(0)
+
+
+def test_line_histories():
+    r = FakeRundown()
+    histories = line_histories(r, [LINE_ID, 1, 0, LINE_ID], max_concurrency=4)
+
+    assert sorted(r.calls) == sorted(
+        (m, i) for m in ("moneyline", "spread", "total") for i in (LINE_ID, 1, 0)
+    )
+    assert set(histories) == {(m, LINE_ID) for m in ("moneyline", "spread", "total")}
+    assert set(histories.failures) == {(m, 0) for m in ("moneyline", "spread", "total")}
+    spread = histories.get("spread", LINE_ID)
+    assert "point_spread_home_money" in spread.columns
+    snapshot = histories.asof(spread.timestamps[-1])
+    assert snapshot[("spread", LINE_ID)] == spread.asof(spread.timestamps[-1])
+    with pytest.raises(ValueError):
+        line_histories(r, [LINE_ID], ["foobar"])
+
+
+def test_line_history_cache():
+    r = GrowingRundown()
+    cache = LineHistoryCache(r)
+    assert cache.refresh("moneyline", LINE_ID) == []
+    assert cache.last_updated("moneyline", LINE_ID) is None
+
+    r.n = 4
+    first = cache.refresh("moneyline", LINE_ID)
+    assert [ml.date_updated for ml in first] == sorted(ml.date_updated for ml in first)
+    assert len(first) == 4
+    assert cache.refresh("moneyline", LINE_ID) == []
+
+    r.n = 10
+    new = cache.refresh("moneyline", LINE_ID)
+    assert len(new) == 6
+    assert cache.history("moneyline", LINE_ID) == first + new
+    assert cache.history("moneyline", LINE_ID) == sorted(
+        FakeRundown().moneyline(LINE_ID), key=lambda ml: ml.date_updated
+    )
+    series = cache.series("moneyline", LINE_ID)
+    assert len(series) == 10
+    assert cache.last_updated("moneyline", LINE_ID) == series.timestamps[-1]
+
+    # A line updated at the same time as the last one is new, and a repeat is not.
+    latest = dict(r.lines[0], moneyline_home=-200)
+    r.lines.insert(0, latest)
+    r.n = 11
+    new = cache.refresh("moneyline", LINE_ID)
+    assert [ml.moneyline_home for ml in new] == [-200]
+    assert cache.refresh("moneyline", LINE_ID) == []
+    assert len(cache.series("moneyline", LINE_ID)) == 11
+
+    cache.discard("moneyline", LINE_ID)
+    assert ("moneyline", LINE_ID) not in cache
+    with pytest.raises(ValueError):
+        cache.refresh("foobar", LINE_ID)
+
+
+def test_line_history_cache_raw():
+    r = GrowingRundown()
+    r.n = 10
+    cache = LineHistoryCache(r, parse="raw")
+    lines = cache.refresh("moneyline", LINE_ID)
+    assert all(isinstance(line, dict) for line in lines)
+    assert lines == sorted(
+        FakeRundown().moneyline(LINE_ID, parse="raw"),
+        key=lambda ml: ml["date_updated"],
+    )
+    with pytest.raises(ValueError):
+        LineHistoryCache(r, parse="foobar")
+
+
+def test_extend_older_line(series):
+    with pytest.raises(ValueError):
+        LineSeries.from_lines(LINE_ID, "moneyline", []).extend(
+            [{"date_updated": "2021-05-11T10:00:00Z"}]
+        ).extend([{"date_updated": "2021-05-11T09:00:00Z"}])
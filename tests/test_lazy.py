@@ -0,0 +1,114 @@
+import copy
+
+import pytest
+from pydantic import ValidationError
+
+from rundown.lazy import Lazy, normalize
+from rundown.resources.event import SportsbookLines
+from rundown.resources.events import Events
+from rundown.resources.line import Moneyline
+from rundown.rundown import Rundown
+from rundown.static.static import sportsbook_dict
+from rundown.usercontext import user_context
+
+from tests.fakes import load_json
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include1].json"
+MONEYLINE_JSON = "tests/json/TestRundown.test_moneyline[14526697-include0].json"
+
+
+def assert_matches(raw, resource):
+    for name, value in resource.dict().items():
+        assert raw[name] == value
+
+
+@pytest.fixture
+def rundown():
+    return Rundown("apikey", timezone="America/Phoenix")
+
+
+@pytest.mark.parametrize("fname", [EVENTS_JSON, PERIODS_JSON])
+def test_lazy_fields_match_full(rundown, fname):
+    data = load_json(fname)
+    with user_context("America/Phoenix"):
+        expected = rundown._parse_events(data)
+        events = rundown._parse_events(data, "lazy")
+
+    assert isinstance(events, Lazy)
+    assert events.meta.delta_last_id == expected.meta.delta_last_id
+    # Validation happens on access, outside the timezone context of the request.
+    for lazy_event, event in zip(events.events, expected.events):
+        assert lazy_event.event_date == event.event_date
+        assert lazy_event.model() == event
+        for name, lines in (event.lines or {}).items():
+            assert lazy_event.lines[name].moneyline.model() == lines.moneyline
+        for name, line_periods in (event.line_periods or {}).items():
+            full_game = lazy_event.line_periods[name].period_full_game
+            assert full_game.spread.model() == line_periods.period_full_game.spread
+
+
+def test_lazy_validates_once_on_access(rundown):
+    data = load_json(EVENTS_JSON)
+    with user_context("UTC"):
+        event = rundown._parse_events(data, "lazy").events[0]
+
+    assert "lines" not in event.__dict__
+    lines = event.lines["Pinnacle"]
+    assert isinstance(lines, Lazy) and lines.resource is SportsbookLines
+    assert isinstance(lines.line_id, int)
+    assert lines.moneyline is lines.moneyline
+    assert isinstance(lines.moneyline.model(), Moneyline)
+    assert event.lines is event.lines
+    with pytest.raises(AttributeError):
+        event.foobar
+
+
+def test_lazy_raises_validation_errors():
+    raw = {"line_id": "foobar", "date_updated": "2021-04-03T17:05:01Z"}
+    lazy = Lazy(Moneyline, raw, "UTC")
+    assert lazy.date_updated == "2021-04-03T17:05:01+00:00"
+    with pytest.raises(ValidationError):
+        lazy.line_id
+    with pytest.raises(ValidationError):
+        lazy.format
+
+
+def test_raw_matches_full(rundown):
+    data = load_json(EVENTS_JSON)
+    original = copy.deepcopy(data)
+    with user_context("America/Phoenix"):
+        expected = Events(**data)
+        raw = rundown._parse_events(data, "raw")
+
+    # The decoded response may be cached, so it must not change.
+    assert data == original
+    event, raw_event = expected.events[0], raw["events"][0]
+    assert raw_event["event_date"] == event.event_date
+    for affiliate_id, lines in raw_event["lines"].items():
+        expected_lines = event.lines[sportsbook_dict.get(affiliate_id, affiliate_id)]
+        assert_matches(lines["moneyline"], expected_lines.moneyline)
+
+
+def test_raw_lines(rundown):
+    data = load_json(MONEYLINE_JSON)
+    with user_context("UTC"):
+        expected = rundown._parse_lines(data, "moneyline", ())
+        raw = rundown._parse_lines(data, "moneyline", (), "raw")
+    assert len(raw) == len(expected)
+    for raw_ml, ml in zip(raw, expected):
+        assert_matches(raw_ml, ml)
+
+
+def test_normalize_not_published():
+    raw = {"moneyline_home": 0.0001, "moneyline_away": -110, "line_id": 0.0001}
+    assert normalize(raw) == {
+        "moneyline_home": None,
+        "moneyline_away": -110,
+        "line_id": 0.0001,
+    }
+
+
+def test_bad_parse_mode(rundown):
+    with pytest.raises(ValueError):
+        rundown._parse_sports({"sports": []}, "foobar")
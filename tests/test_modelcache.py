@@ -0,0 +1,72 @@
+import copy
+
+import pytest
+
+from rundown.modelcache import ModelCache
+from rundown.resources.events import Events
+from rundown.usercontext import user_context
+
+from tests.fakes import load_json
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include1].json"
+
+
+@pytest.mark.parametrize("fname", [EVENTS_JSON, PERIODS_JSON])
+def test_matches_events(fname):
+    data = load_json(fname)
+    with user_context("America/Phoenix"):
+        expected = Events(**data)
+        events = ModelCache().parse_events(data)
+    assert events == expected
+
+
+def test_unchanged_events_are_reused():
+    data = load_json(EVENTS_JSON)
+    cache = ModelCache()
+    with user_context("UTC"):
+        first = cache.parse_events(data)
+        second = cache.parse_events(copy.deepcopy(data))
+
+    n = len(data["events"])
+    assert all(a is b for a, b in zip(first.events, second.events))
+    assert cache.info()[:2] == (n, n)
+    assert cache.event_hit_rate == 0.5
+
+
+def test_changed_event_reuses_unchanged_lines():
+    data = load_json(EVENTS_JSON)
+    cache = ModelCache()
+    with user_context("UTC"):
+        first = cache.parse_events(data)
+        changed = copy.deepcopy(data)
+        changed["events"][0]["lines"]["3"]["moneyline"]["moneyline_home"] = -110
+        second = cache.parse_events(changed)
+
+    assert second.events[0] is not first.events[0]
+    assert second.events[0].lines["Pinnacle"].moneyline.moneyline_home == -110
+    assert second.events[0].lines["Bovada"] is first.events[0].lines["Bovada"]
+    n_lines = len(data["events"][0]["lines"])
+    assert cache.line_hits == n_lines - 1
+    assert second.events[1:] == first.events[1:]
+
+
+def test_timezone_is_part_of_fingerprint():
+    data = load_json(EVENTS_JSON)
+    cache = ModelCache()
+    with user_context("UTC"):
+        utc = cache.parse_events(data)
+    with user_context("America/Phoenix"):
+        phoenix = cache.parse_events(data)
+    assert utc.events[0].event_date != phoenix.events[0].event_date
+    assert cache.event_hits == 0
+
+
+def test_lru_eviction():
+    data = load_json(EVENTS_JSON)
+    cache = ModelCache(maxsize=5)
+    with user_context("UTC"):
+        cache.parse_events(data)
+    assert cache.info().currsize == 5
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 0, 5, 0)
@@ -0,0 +1,109 @@
+
+import pytest
+
+from rundown.oddsbook import OddsBook, OddsBookSnapshot, _Layers
+from rundown.resources.event import SportsbookLinePeriod
+from rundown.resources.events import Events
+from rundown.resources.line import Moneyline
+from rundown.usercontext import user_context
+
+from tests.fakes import load_json
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+PERIODS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include1].json"
+EVENT_ID = "688da5e628cf4923a87f9cd9956446f9"
+
+
+def parse(data):
+    with user_context("UTC"):
+        return Events(**data)
+
+
+@pytest.fixture
+def book():
+    return OddsBook(parse(load_json(EVENTS_JSON)))
+
+
+def test_queries(book):
+    assert len(book) == 15
+    assert EVENT_ID in book
+    ml = book.moneyline(EVENT_ID, "Pinnacle")
+    assert isinstance(ml, Moneyline)
+    # Sportsbooks may also be given by ID.
+    assert book.moneyline(EVENT_ID, 3) is ml
+    assert book.spread(EVENT_ID, "Pinnacle") is book.lines(EVENT_ID, 3).spread
+    assert book.total(EVENT_ID, "foobar") is None
+    assert book.moneyline("foobar", "Pinnacle") is None
+
+
+def test_line_periods():
+    book = OddsBook(parse(load_json(PERIODS_JSON)))
+    lines = book.lines(EVENT_ID, "Pinnacle", "period_full_game")
+    assert isinstance(lines, SportsbookLinePeriod)
+    assert book.lines(EVENT_ID, "Pinnacle") is None
+
+
+def test_delta_merges_lines_per_sportsbook(book):
+    data = load_json(EVENTS_JSON)
+    event = data["events"][0]
+    event["lines"] = {"3": event["lines"]["3"]}
+    event["lines"]["3"]["moneyline"]["line_id"] = 42
+    data["meta"]["delta_last_id"] = "next"
+    pinnacle_before = book.moneyline(EVENT_ID, "Pinnacle")
+    other_before = book.moneyline(EVENT_ID, 10)
+
+    assert book.apply(parse({"meta": data["meta"], "events": [event]})) == {EVENT_ID}
+    assert book.delta_last_id == "next"
+    assert book.moneyline(EVENT_ID, "Pinnacle").line_id == 42
+    assert book.moneyline(EVENT_ID, "Pinnacle") is not pinnacle_before
+    # Lines of sportsbooks missing from the delta are kept.
+    assert book.moneyline(EVENT_ID, 10) is other_before
+    assert len(book.event(EVENT_ID).lines) == 15
+
+
+def test_snapshot_is_isolated(book):
+    snapshot = book.snapshot()
+    assert isinstance(snapshot, OddsBookSnapshot)
+    before = snapshot.moneyline(EVENT_ID, "Pinnacle")
+
+    book.discard([EVENT_ID])
+    assert EVENT_ID not in book
+    assert book.moneyline(EVENT_ID, "Pinnacle") is None
+    assert snapshot.moneyline(EVENT_ID, "Pinnacle") is before
+    assert len(snapshot) == 15
+
+
+def test_apply_after_snapshot_does_not_copy_book(book):
+    data = load_json(EVENTS_JSON)
+    snapshot = book.snapshot()
+    lines_before = snapshot._lines._layers[0]
+
+    book.apply(parse({"meta": data["meta"], "events": data["events"][:1]}))
+    # The entries the snapshot sees are shared, and the update is written on top.
+    assert book._lines._layers[0] is lines_before
+    assert len(book._lines._layers[-1]) == len(book._line_keys(book.event(EVENT_ID)))
+    assert len(book) == len(snapshot) == 15
+
+
+def test_layers_match_dict():
+    layers, expected, snapshots = _Layers(), {}, []
+    for i in range(200):
+        layers[i % 50] = i
+        expected[i % 50] = i
+        if i % 3 == 0:
+            assert layers.pop(i % 7, None) == expected.pop(i % 7, None)
+        if i % 5 == 0:
+            snapshots.append((layers.snapshot(), dict(expected)))
+
+    assert dict((k, layers.get(k)) for k in layers) == expected
+    assert len(layers) == len(expected)
+    assert len(layers._layers) <= 8
+    for snapshot, snapshot_expected in snapshots:
+        assert {k: snapshot.get(k) for k in snapshot} == snapshot_expected
+        assert len(snapshot) == len(snapshot_expected)
+
+
+def test_clear(book):
+    book.clear()
+    assert len(book) == 0
+    assert book.delta_last_id is None
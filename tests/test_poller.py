@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from rundown.poller import AsyncDeltaPoller, DeltaPoller
+
+from tests.fakes import AsyncFakeRundown, FakeRundown, load_events
+
+DELTA_JSON = "tests/json/TestRundown.test_events_delta[11eb-95cd-8fb13b78-8369-8c223045627f-None-include0].json"  # noqa E501
+
+
+def test_first_poll_is_full_refresh():
+    r = FakeRundown([])
+    poller = DeltaPoller(r, ["MLB"], dates=["2021-04-03"])
+    events = poller.poll()
+
+    assert r.calls == [("events", 3, "2021-04-03")]
+    assert len(events.events) > 0
+    assert poller.last_id == events.meta.delta_last_id
+    assert poller.full_refreshes == 1
+
+
+def test_poll_follows_delta_last_id():
+    delta = load_events(DELTA_JSON)
+    r = FakeRundown([delta])
+    poller = DeltaPoller(r, ["MLB"], dates=["2021-04-03"])
+    seed_id = poller.poll().meta.delta_last_id
+
+    assert poller.poll() is delta
+    assert r.calls[-1] == ("delta", seed_id, 3)
+    assert poller.last_id == delta.meta.delta_last_id
+
+
+def test_expired_delta_falls_back_to_refresh():
+    r = FakeRundown([None])
+    poller = DeltaPoller(r, ["MLB"], dates=["2021-04-03"])
+    poller.poll()
+    events = poller.poll()
+
+    assert r.calls[-1][0] == "events"
+    assert len(events.events) > 0
+    assert poller.full_refreshes == 2
+
+
+def test_interval_backs_off_without_changes():
+    r = FakeRundown([])
+    poller = DeltaPoller(
+        r, ["MLB"], dates=["2021-04-03"], min_interval=1, max_interval=3, backoff=2
+    )
+    poller.poll()
+    intervals = []
+    for _ in range(3):
+        poller.poll()
+        intervals.append(poller.interval)
+    assert intervals == [2, 3, 3]
+
+
+def test_several_sports_are_filtered():
+    delta = load_events(DELTA_JSON)
+    r = FakeRundown([delta])
+    poller = DeltaPoller(r, ["MLB", "NHL"], dates=["2021-04-03"])
+    poller.poll()
+    events = poller.poll()
+
+    assert r.calls[-1][2] is None
+    assert all(e.sport_id in (3, 6) for e in events.events)
+
+
+def test_checkpoint_resumes_without_refresh(tmp_path):
+    checkpoint = tmp_path / "poller.json"
+    r = FakeRundown([])
+    first = DeltaPoller(r, ["MLB"], dates=["2021-04-03"], checkpoint=checkpoint)
+    first.poll()
+
+    r = FakeRundown([])
+    resumed = DeltaPoller(r, ["MLB"], dates=["2021-04-03"], checkpoint=checkpoint)
+    assert resumed.last_id == first.last_id
+    resumed.poll()
+    assert r.calls == [("delta", first.last_id, 3)]
+
+    # A checkpoint for other sports is ignored.
+    other = DeltaPoller(r, ["NHL"], checkpoint=checkpoint)
+    assert other.last_id is None
+
+
+def test_iteration_stops():
+    poller = DeltaPoller(FakeRundown([]), ["MLB"], min_interval=0)
+    polled = []
+    for events in poller:
+        polled.append(events)
+        if len(polled) == 3:
+            poller.stop()
+    assert len(polled) == 3
+
+
+def test_async_poller():
+    delta = load_events(DELTA_JSON)
+    poller = AsyncDeltaPoller(
+        AsyncFakeRundown([delta]), ["MLB"], dates=["2021-04-03"], min_interval=0
+    )
+
+    async def main():
+        polled = []
+        async for events in poller:
+            polled.append(events)
+            if len(polled) == 2:
+                poller.stop()
+        return polled
+
+    polled = asyncio.run(main())
+    assert polled[1] is delta
+    assert poller.last_id == delta.meta.delta_last_id
+
+
+def test_requires_a_sport():
+    with pytest.raises(ValueError):
+        DeltaPoller(FakeRundown([]), [])
+
+
+def test_requires_a_date():
+    with pytest.raises(ValueError):
+        DeltaPoller(FakeRundown([]), ["MLB"], dates=[])
@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+from rundown.ratelimit import TokenBucket, FileTokenBucket
+from rundown.rundown import _Base
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("rundown.ratelimit.time.time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=["memory", "file"])
+def bucket(request, clock, tmp_path):
+    if request.param == "memory":
+        return TokenBucket(2, capacity=2)
+    return FileTokenBucket(tmp_path / "bucket.json", 2, capacity=2)
+
+
+def test_burst_then_rate(bucket, clock):
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1
+    clock[0] += 1
+    assert bucket.reserve() == 0.5
+
+
+def test_exhausted_quota_waits_for_reset(bucket, clock):
+    headers = {
+        "X-RateLimit-requests-Remaining": "0",
+        "X-RateLimit-requests-Reset": "60",
+    }
+    bucket.update(headers)
+    assert bucket.reserve() == 60
+    clock[0] += 60
+    assert bucket.reserve() == 0
+
+
+def test_pace_quota(clock):
+    bucket = TokenBucket(10, capacity=1, pace_quota=True)
+    headers = {
+        "X-RateLimit-requests-Remaining": "100",
+        "X-RateLimit-requests-Reset": "200",
+    }
+    bucket.update(headers)
+    assert bucket.reserve() == 0
+    # Remaining quota allows one request every 2 seconds until the reset.
+    assert bucket.reserve() == 2
+
+
+def test_file_buckets_share_state(clock, tmp_path):
+    b1 = FileTokenBucket(tmp_path / "bucket.json", 1)
+    b2 = FileTokenBucket(tmp_path / "bucket.json", 1)
+    assert b1.reserve() == 0
+    assert b2.reserve() == 1
+
+
+def test_provider_rate_limiters():
+    rapidapi = _Base.factory("rapidapi", "apikey").rate_limiter()
+    rundown = _Base.factory("rundown", "apikey").rate_limiter()
+    assert rapidapi.rate != rundown.rate
+    assert rapidapi.remaining_header == "X-RateLimit-requests-Remaining"
+    assert rundown.remaining_header == "X-RateLimit-Remaining"
+
+
+def test_rundown_get_is_rate_limited(rundown, monkeypatch):
+    res = requests.Response()
+    res.status_code = 200
+    res.headers.update(
+        {"X-RateLimit-requests-Remaining": "0", "X-RateLimit-requests-Reset": "5"}
+    )
+    sleeps = []
+    monkeypatch.setattr("rundown.rundown.time.sleep", sleeps.append)
+    monkeypatch.setattr(rundown._session, "get", lambda *a, **kw: res)
+    rundown._rate_limiter = TokenBucket(1)
+
+    rundown._get("url")
+    rundown._get("url")
+    assert sleeps[0] == 0
+    assert 4 < sleeps[1] <= 5
+
+
+def test_async_rundown_runs_file_bucket_in_thread(async_rundown, monkeypatch, tmp_path):
+    threaded = []
+
+    async def to_thread(func, *args):
+        threaded.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr("rundown.asyncrundown.asyncio.to_thread", to_thread)
+    async_rundown._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    )
+    async_rundown._rate_limiter = FileTokenBucket(tmp_path / "bucket.json", 1)
+
+    asyncio.run(async_rundown._get("https://example.com"))
+    assert threaded == ["reserve", "update"]
+
+
+def test_file_bucket_requires_fcntl(monkeypatch, tmp_path):
+    monkeypatch.setattr("rundown.ratelimit.fcntl", None)
+    with pytest.raises(NotImplementedError):
+        FileTokenBucket(tmp_path / "bucket.json", 1)
@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+from rundown.retry import RetryPolicy
+
+
+def make_response(status_code, headers=None, content=b"{}"):
+    res = requests.Response()
+    res.status_code = status_code
+    res.headers.update(headers or {})
+    res._content = content
+    res._content_consumed = True
+    return res
+
+
+@pytest.mark.parametrize("attempt, limit", [(0, 0.5), (1, 1), (2, 2), (10, 30)])
+def test_backoff_is_jittered_and_capped(attempt, limit):
+    policy = RetryPolicy()
+    delays = [policy.backoff(attempt) for _ in range(50)]
+    assert all(0 <= d <= limit for d in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.parametrize(
+    "retry_after, expected", [("3", 3), ("0", 0), ("Wed, 21 Oct 2015 07:28:00 GMT", 0)]
+)
+def test_backoff_respects_retry_after(retry_after, expected):
+    assert RetryPolicy().backoff(0, retry_after) == expected
+
+
+def test_backoff_caps_retry_after():
+    policy = RetryPolicy(retry_after_max=60)
+    assert policy.backoff(0, "60") == 60
+    assert policy.backoff(0, "3600") is None
+    assert policy.backoff(0, "Wed, 21 Oct 2099 07:28:00 GMT") is None
+    # Without Retry-After, backoff_max caps the delay.
+    assert policy.backoff(10) <= policy.backoff_max
+
+
+def test_backoff_ignores_bad_retry_after():
+    assert RetryPolicy(backoff_factor=1).backoff(0, "foobar") <= 1
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("rundown.rundown.time.sleep", sleeps.append)
+    return sleeps
+
+
+def test_get_retries_until_success(rundown, monkeypatch, sleeps):
+    responses = [
+        make_response(429, {"Retry-After": "2"}),
+        make_response(502),
+        make_response(200, content=b'{"sports": []}'),
+    ]
+    monkeypatch.setattr(rundown._session, "get", lambda *a, **kw: responses.pop(0))
+
+    assert rundown._get("url").json() == {"sports": []}
+    assert len(sleeps) == 2
+    assert sleeps[0] == 2
+
+
+def test_get_raises_when_retries_exhausted(rundown, monkeypatch, sleeps):
+    monkeypatch.setattr(rundown._session, "get", lambda *a, **kw: make_response(503))
+    rundown._retry = RetryPolicy(total=2)
+
+    with pytest.raises(requests.HTTPError):
+        rundown._get("url")
+    assert len(sleeps) == 2
+
+
+def test_get_raises_when_retry_after_is_too_long(rundown, monkeypatch, sleeps):
+    res = make_response(429, {"Retry-After": "86400"})
+    monkeypatch.setattr(rundown._session, "get", lambda *a, **kw: res)
+
+    with pytest.raises(requests.HTTPError):
+        rundown._get("url")
+    assert sleeps == []
+
+
+def test_get_retries_connection_errors(rundown, monkeypatch, sleeps):
+    def get(*args, **kwargs):
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(rundown._session, "get", get)
+
+    with pytest.raises(requests.ConnectionError):
+        rundown._get("url")
+    assert len(sleeps) == 3
+
+
+def test_get_does_not_retry_not_found(rundown, monkeypatch, sleeps):
+    monkeypatch.setattr(rundown._session, "get", lambda *a, **kw: make_response(404))
+    assert rundown._get("url").status_code == 404
+    assert sleeps == []
+
+
+def test_async_get_retries(async_rundown, monkeypatch):
+    statuses = [500, 429, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), headers={"Retry-After": "0"})
+
+    async_rundown._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    res = asyncio.run(async_rundown._get("https://example.com"))
+    assert res.status_code == 200
+
+
+def test_async_get_raises_when_retries_exhausted(async_rundown):
+    def handler(request):
+        return httpx.Response(502, headers={"Retry-After": "0"})
+
+    async_rundown._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(async_rundown._get("https://example.com"))
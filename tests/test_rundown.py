@@ -1,9 +1,12 @@
+import json
+import os
+
 import pytest
 import arrow
 from deepdiff import DeepDiff
 from pydantic import ValidationError
 
-from rundown.rundown import _Base, _RundownBase, _RapidAPIBase
+from rundown.rundown import Rundown, _Base, _RundownBase, _RapidAPIBase
 from rundown.resources.events import Events
 from rundown.resources.sportsbook import Sportsbook
 from rundown.resources.team import BaseTeam
@@ -13,6 +16,7 @@ from rundown.resources.line import Moneyline, Spread, Total
 from rundown.resources.sport import Sport
 from rundown.resources.date import Date, Epoch
 from rundown.resources.schedule import Schedule
+from rundown.usercontext import user_context
 
 
 def test_auth_factory():
@@ -390,6 +394,51 @@ class TestRundown:
         for e in events.events:
             assert isinstance(e, Event)
 
+    @pytest.mark.parametrize(
+        "vcr_cassette_name", ["TestAPI.test_offset_returns_different_events"]
+    )
+    @pytest.mark.vcr()
+    def test_events_many(self, vcr_cassette_name):
+        # The rundown fixture saves each response to the same file, which would be
+        # written by every thread, so the client is built without it.
+        rundown = Rundown(os.getenv("RAPIDAPI_KEY"), timezone="America/Phoenix")
+        # The cassette has no recording for 2021-05-13, so that request fails.
+        dates = ["2021-05-11", "2021-05-12", "2021-05-13"]
+        results = rundown.events_many(["MLB"], dates, offset=-11 * 60)
+        assert list(results) == [(3, d) for d in dates]
+        assert isinstance(results[(3, "2021-05-11")], Events)
+        assert isinstance(results[(3, "2021-05-12")], Events)
+        assert isinstance(results[(3, "2021-05-13")], Exception)
+
+    @pytest.mark.parametrize(
+        "vcr_cassette_name, method",
+        [
+            ("TestRundown.test_events[MLB-2021-04-03-None-include1]", "events"),
+            (
+                "TestRundown.test_opening_lines[MLB-2021-04-03-None-include1]",
+                "opening_lines",
+            ),
+            (
+                "TestRundown.test_closing_lines[MLB-2021-04-03-None-include1]",
+                "closing_lines",
+            ),
+        ],
+    )
+    @pytest.mark.vcr()
+    def test_iter_events(self, rundown, vcr_cassette_name, method):
+        """Streamed events match the events parsed from the whole response."""
+        with open(f"tests/json/{vcr_cassette_name}.json") as f:
+            data = json.load(f)
+        with user_context(rundown.timezone):
+            expected = Events(**data)
+
+        stream = getattr(rundown, f"iter_{method}")("MLB", "2021-04-03", "all_periods")
+        with stream:
+            assert stream.delta_last_id is None
+            events = list(stream)
+        assert events == expected.events
+        assert stream.delta_last_id == expected.meta.delta_last_id
+
     @pytest.mark.parametrize(
         "sport, date",
         [(6, "2000-05-11"), (42, "2021-05-11"), (42, "2000-05-11")],
@@ -0,0 +1,112 @@
+import pytest
+
+from rundown.scanner import PriceScanner, decimal_odds
+
+from tests.fakes import load_events
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-05-12-None-include5].json"
+PERIOD = "period_full_game"
+
+
+@pytest.fixture(scope="module")
+def events():
+    return load_events(EVENTS_JSON)
+
+
+@pytest.fixture
+def scanner():
+    return PriceScanner(periods=[PERIOD])
+
+
+def full_game(event):
+    return {a: lp.period_full_game for a, lp in event.line_periods.items()}
+
+
+def with_moneyline(event, affiliate, **prices):
+    """Copy of event with only affiliate's full game moneyline, updated by prices."""
+    line_periods = event.line_periods[affiliate]
+    lines = line_periods.period_full_game
+    lines = lines.copy(update={"moneyline": lines.moneyline.copy(update=prices)})
+    line_periods = line_periods.copy(update={PERIOD: lines})
+    return event.copy(update={"line_periods": {affiliate: line_periods}})
+
+
+def test_best_matches_full_scan(scanner, events):
+    scanner.update(events)
+    for event in events.events:
+        prices = [
+            (lines.moneyline.moneyline_home, affiliate)
+            for affiliate, lines in full_game(event).items()
+            if lines.moneyline.moneyline_home is not None
+        ]
+        best = scanner.best(event.event_id, "moneyline", "home", PERIOD, n=3)
+        expected = sorted(prices, key=lambda p: (-decimal_odds(p[0]), p[1]))[:3]
+        assert [(q.price, q.affiliate) for q in best] == expected
+
+
+def test_spreads_are_keyed_by_points(events):
+    scanner = PriceScanner(markets=["spread"], periods=[PERIOD])
+    scanner.update(events)
+    event = events.events[0]
+    spreads = [lines.spread for lines in full_game(event).values()]
+    points = {s.point_spread_home for s in spreads if s.point_spread_home_money}
+    for p in points:
+        best = scanner.best(event.event_id, "spread", "home", PERIOD, points=p, n=20)
+        assert best and all(q.points == p for q in best)
+
+    best = scanner.best(event.event_id, "spread", "home", PERIOD, n=99)
+    assert len(best) == sum(1 for s in spreads if s.point_spread_home_money)
+    assert [q.decimal for q in best] == sorted((q.decimal for q in best), reverse=True)
+
+
+def test_arbitrage(events):
+    scanner = PriceScanner(markets=["moneyline"], periods=[PERIOD])
+    event = events.events[0]
+    a, b = list(event.line_periods)[:2]
+    scanner.update([with_moneyline(event, a, moneyline_home=150, moneyline_away=-300)])
+    changed = scanner.update(
+        [with_moneyline(event, b, moneyline_home=-300, moneyline_away=150)]
+    )
+    assert changed == {(event.event_id, PERIOD, "moneyline", None)}
+
+    (arb,) = scanner.arbitrages()
+    assert arb[:4] == (event.event_id, PERIOD, "moneyline", None)
+    assert [(q.affiliate, q.price) for q in arb.quotes] == [(b, 150), (a, 150)]
+    assert arb.margin == pytest.approx(0.25)
+    assert scanner.arbitrages(min_margin=0.3) == []
+
+    # A delta moving one sportsbook's line closes the arbitrage.
+    scanner.update([with_moneyline(event, b, moneyline_home=-300, moneyline_away=-200)])
+    assert scanner.arbitrages() == []
+    assert scanner.best(event.event_id, "moneyline", "away", PERIOD)[0].affiliate == b
+
+
+def test_unpublished_prices_are_removed(scanner, events):
+    event = events.events[0]
+    a = list(event.line_periods)[0]
+    scanner.update([with_moneyline(event, a, moneyline_home=500, moneyline_away=-900)])
+    assert scanner.best(event.event_id, "moneyline", "home", PERIOD)[0].price == 500
+    scanner.update([with_moneyline(event, a, moneyline_home=None, moneyline_away=None)])
+    assert scanner.best(event.event_id, "moneyline", "home", PERIOD) == []
+
+
+def test_discard_and_clear(scanner, events):
+    scanner.update(events)
+    first, second = events.events[0].event_id, events.events[1].event_id
+    scanner.discard([first])
+    assert scanner.best(first, "total", "over", PERIOD) == []
+    assert scanner.best(second, "total", "over", PERIOD) != []
+    scanner.clear()
+    assert scanner.best(second, "total", "over", PERIOD) == []
+
+
+def test_unchanged_lines_change_nothing(scanner, events):
+    assert scanner.update(events)
+    assert scanner.update(events) == set()
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        PriceScanner(markets=["foobar"])
+    with pytest.raises(ValueError):
+        PriceScanner(periods=["period_fifth_period"])
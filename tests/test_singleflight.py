@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+import requests
+
+from rundown.rundown import Rundown
+from rundown.singleflight import SingleFlight, AsyncSingleFlight
+
+EVENTS_JSON = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include0].json"
+
+
+def test_single_flight_shares_result():
+    sf = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: sf.do("key", fn), range(5)))
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    # The next call after the flight lands makes a new call.
+    sf.do("key", fn)
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_exception():
+    sf = SingleFlight()
+    started = threading.Event()
+
+    def fn():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError()
+
+    def follower():
+        started.wait()
+        return sf.do("key", lambda: "not called")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(sf.do, "key", fn)
+        waiter = executor.submit(follower)
+        with pytest.raises(ValueError):
+            leader.result()
+        with pytest.raises(ValueError):
+            waiter.result()
+
+
+def test_async_single_flight_shares_result():
+    sf = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def main():
+        return await asyncio.gather(*[sf.do("key", fn) for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_async_single_flight_survives_cancelled_leader():
+    sf = AsyncSingleFlight()
+    result = object()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        return result
+
+    async def main():
+        leader = asyncio.ensure_future(sf.do("key", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(sf.do("key", fn))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) is result
+
+
+def test_rundown_coalesces_events(monkeypatch):
+    rundown = Rundown("apikey", timezone="America/Phoenix")
+    with open(EVENTS_JSON, "rb") as f:
+        content = f.read()
+    calls = []
+
+    def get(url, **params):
+        calls.append(url)
+        time.sleep(0.05)
+        res = requests.Response()
+        res.status_code = 200
+        res._content = content
+        return res
+
+    monkeypatch.setattr(rundown, "_get", get)
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(rundown.events, "MLB", "2021-04-03") for _ in range(5)
+        ]
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_async_rundown_coalesces_events(async_rundown, monkeypatch):
+    with open(EVENTS_JSON, "rb") as f:
+        content = f.read()
+    calls = []
+
+    async def get(url, **params):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=content)
+
+    monkeypatch.setattr(async_rundown, "_get", get)
+
+    async def main():
+        return await asyncio.gather(
+            async_rundown.events("MLB", "2021-04-03"),
+            async_rundown.events("MLB", "2021-04-03"),
+            async_rundown.events("MLB", "2021-04-03", offset=0),
+        )
+
+    e1, e2, e3 = asyncio.run(main())
+    # The call with a different offset is a different request.
+    assert len(calls) == 2
+    assert e1 is e2
+    assert e1 is not e3
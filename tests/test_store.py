@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+from rundown.asyncrundown import AsyncRundown
+from rundown.resources.events import Events
+from rundown.rundown import Rundown
+from rundown.store import HistoricalStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = HistoricalStore(tmp_path / "history.db")
+    yield s
+    s.close()
+
+
+@pytest.mark.parametrize(
+    "segments, expected",
+    [
+        (["sports", 3, "closing", "2021-04-03"], True),
+        (["sports", 3, "closing", "foobar"], False),
+        (["sports", 3, "events", "2021-04-03"], False),
+        (["sports", 3, "openers", "2021-04-03"], False),
+        (["lines", 14526697, "moneyline"], False),
+        (["events", "3bd014c6b6ce2931653a057ba89237ef"], False),
+        (["delta"], False),
+    ],
+)
+def test_storable(store, segments, expected):
+    assert store.storable(segments) == expected
+
+
+def test_line_histories_are_opt_in(tmp_path):
+    store = HistoricalStore(tmp_path / "history.db", ["closing", "moneyline"])
+    assert store.storable(["lines", 14526697, "moneyline"])
+    assert not store.storable(["lines", 14526697, "spread"])
+    store.close()
+
+
+def test_put_and_get(store):
+    segments = ("sports", 3, "closing", "2021-04-03")
+    params = {"offset": 420, "include": ("all_periods",)}
+    data = {"meta": {"delta_last_id": "foo"}, "events": []}
+    store.put(segments, params, data)
+
+    assert len(store) == 1
+    assert store.get(segments, params) == data
+    # Different offsets cover different events.
+    assert store.get(segments, {"offset": 0, "include": ("all_periods",)}) is None
+
+
+def test_async_rundown_uses_store_in_thread(store, monkeypatch):
+    threaded = []
+    to_thread = asyncio.to_thread
+
+    async def record(func, *args):
+        threaded.append(func.__name__)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr("rundown.asyncrundown.asyncio.to_thread", record)
+    data = {"meta": {"delta_last_id": "foo"}, "events": []}
+    r = AsyncRundown("apikey", timezone="America/Phoenix", store=store)
+
+    async def main():
+        await r.aclose()
+        r._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=json.dumps(data))
+            )
+        )
+        segments = ("sports", 3, "closing", "2021-04-03")
+        url = r._build_url(*segments)
+        first = await r._fetch_json(segments, url, {"offset": 420})
+        second = await r._fetch_json(segments, url, {"offset": 420})
+        await r.aclose()
+        return first, second
+
+    assert asyncio.run(main()) == (data, data)
+    assert threaded == ["_get_cached_json", "_cache_json", "_get_cached_json"]
+
+
+def test_verify(store):
+    store.put(("lines", 1, "moneyline"), {}, {"moneylines": []})
+    store.put(("lines", 2, "moneyline"), {}, {"moneylines": []})
+    assert store.verify() == []
+
+    with store._db:
+        store._db.execute("UPDATE responses SET data = x'00' WHERE line_id = 2")
+    assert store.verify(repair=True) == ["lines/2/moneyline?"]
+    assert len(store) == 1
+
+
+def test_corrupt_response_is_a_miss(store):
+    store.put(("lines", 1, "total"), {}, {"totals": []})
+    with store._db:
+        store._db.execute("UPDATE responses SET checksum = 'foo'")
+    assert store.get(("lines", 1, "total"), {}) is None
+    assert len(store) == 0
+
+
+class TestRundownStore:
+    @pytest.mark.parametrize(
+        "vcr_cassette_name",
+        ["TestRundown.test_closing_lines[MLB-2021-04-03-None-include0]"],
+    )
+    @pytest.mark.vcr()
+    def test_warm_up(self, store, vcr_cassette_name):
+        rundown = Rundown(
+            os.getenv("RAPIDAPI_KEY"), timezone="America/Phoenix", store=store
+        )
+        assert store.warm_up(rundown, ["MLB"], ["2021-04-03"]) == []
+        assert len(store) == 1
+
+        # The cassette holds a single response, so this must be read from the store.
+        events = rundown.closing_lines("MLB", "2021-04-03")
+        assert isinstance(events, Events)
+        assert len(events.events) > 0
+
+    def test_warm_up_requires_matching_store(self, rundown, store):
+        with pytest.raises(ValueError):
+            store.warm_up(rundown, ["MLB"], ["2021-04-03"])
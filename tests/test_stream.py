@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from rundown.resources.event import Event
+from rundown.resources.events import Events
+from rundown.stream import (
+    AsyncEventStream,
+    EventStream,
+    aiter_items,
+    dict_items,
+    iter_items,
+)
+from rundown.usercontext import user_context
+
+JSON_FILE = "tests/json/TestRundown.test_events[MLB-2021-04-03-None-include1].json"
+
+
+@pytest.fixture(scope="module")
+def content():
+    with open(JSON_FILE, "rb") as f:
+        return f.read()
+
+
+def chunked(content, size):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+@pytest.mark.parametrize("size", [13, 4096, 10**9])
+def test_iter_items_matches_json(content, size):
+    data = json.loads(content)
+    items = list(iter_items(chunked(content, size)))
+    assert items == list(dict_items(data))
+    assert items[0] == ("meta", data["meta"])
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (b' { "events" : [ ] , "count": 12345 } ', [("count", 12345)]),
+        (b'{"events": null}', [("events", None)]),
+        (b'{"a": "\xc3\xa9", "events": [{"b": 1}]}', [("a", "é"), ("event", {"b": 1})]),
+        (b"{}", []),
+    ],
+)
+def test_iter_items_edge_cases(content, expected):
+    assert list(iter_items(chunked(content, 1))) == expected
+
+
+@pytest.mark.parametrize(
+    "content", [b"", b"[]", b'{"events": [{"a": 1}', b'{"a": 1} {', b'{"a" 1}']
+)
+def test_iter_items_rejects_bad_responses(content):
+    with pytest.raises(ValueError):
+        list(iter_items(chunked(content, 3)))
+
+
+def test_event_stream_matches_events(content):
+    with user_context("America/Phoenix"):
+        expected = Events(**json.loads(content))
+
+    stream = EventStream(iter_items(chunked(content, 4096)), "America/Phoenix")
+    assert stream.delta_last_id is None
+    events = list(stream)
+    assert events == expected.events
+    assert all(isinstance(e, Event) for e in events)
+    assert stream.delta_last_id == expected.meta.delta_last_id
+    assert list(stream) == []
+
+
+def test_event_stream_close_stops_iteration(content):
+    items = iter_items(chunked(content, 4096))
+    with EventStream(items, "UTC") as stream:
+        next(stream)
+    with pytest.raises(StopIteration):
+        next(stream)
+
+
+def test_async_event_stream(content):
+    async def chunks():
+        for chunk in chunked(content, 4096):
+            yield chunk
+
+    async def main():
+        async with AsyncEventStream(aiter_items(chunks()), "UTC") as stream:
+            return [e async for e in stream], stream.delta_last_id
+
+    events, delta_last_id = asyncio.run(main())
+    assert len(events) == len(json.loads(content)["events"])
+    assert delta_last_id is not None
@@ -1,6 +1,15 @@
+import time
+
+import arrow
 import pytest
 
-from rundown.utils import utc_offset, utc_shift_to_tz
+from rundown.utils import (
+    _next_transition,
+    _offsets,
+    utc_offset,
+    utc_shift_to_tz,
+    is_past_date,
+)
 
 
 @pytest.mark.parametrize(
@@ -28,3 +37,37 @@ def test_utc_offset(tz, expected):
 def test_utc_offset_formatted(offset, expected):
     # Use only timezones with no daylight savings so tests will always pass.
     assert utc_shift_to_tz(offset) == expected
+
+
+@pytest.mark.parametrize(
+    "days, expected", [(-365, True), (-2, True), (-1, False), (0, False), (1, False)]
+)
+def test_is_past_date(days, expected):
+    date = arrow.utcnow().shift(days=days).format("YYYY-MM-DD")
+    assert is_past_date(date) == expected
+
+
+def test_is_past_date_malformed():
+    assert not is_past_date("foobar")
+
+
+def test_next_transition():
+    tz = arrow.parser.TzinfoParser.parse("America/New_York")
+    start = arrow.get("2021-03-01").timestamp()
+    assert _next_transition(tz, start) == arrow.get("2021-03-14T07:00:00").timestamp()
+    # Phoenix has no DST, so the offset is checked again at the end of the horizon.
+    phoenix = arrow.parser.TzinfoParser.parse("America/Phoenix")
+    assert _next_transition(phoenix, start) == start + 400 * 24 * 60 * 60
+
+
+def test_utc_offset_cached_until_transition(monkeypatch):
+    now = arrow.get("2021-03-14T06:59:00").timestamp()
+    monkeypatch.setattr(time, "time", lambda: now)
+    monkeypatch.setitem(_offsets, "America/New_York", (0, now + 1))
+    # The cached entry hasn't expired.
+    assert utc_offset("America/New_York") == 0
+
+    now += 60
+    assert utc_offset("America/New_York") == -4 * 60
+    expires = arrow.get("2021-11-07T06:00:00").timestamp()
+    assert _offsets["America/New_York"][1] == expires
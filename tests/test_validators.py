@@ -0,0 +1,38 @@
+import arrow
+import pytest
+
+from rundown.resources.validators import _change_timezone, change_timezone
+from rundown.usercontext import user_context
+
+
+@pytest.mark.parametrize(
+    "dt_str",
+    [
+        "2021-05-11T23:10:00Z",
+        "2021-05-11T11:13:29.660455Z",
+        "2021-04-03T17:05:01.123Z",
+        "2021-04-03T17:05:01.123456+02:00",
+        "2021-04-03T17:05:01",
+        "2021-04-03 17:05:01",
+        "2021-04-03",
+    ],
+)
+@pytest.mark.parametrize("tz", ["UTC", "America/Phoenix", "America/New_York", "-07:00"])
+def test_change_timezone_matches_arrow(dt_str, tz):
+    with user_context(tz):
+        assert change_timezone(dt_str) == str(arrow.get(dt_str).to(tz))
+
+
+def test_change_timezone_is_memoized():
+    _change_timezone.cache_clear()
+    with user_context("America/Phoenix"):
+        change_timezone("2021-05-11T23:10:00Z")
+        assert change_timezone("2021-05-11T23:10:00Z") == "2021-05-11T16:10:00-07:00"
+    with user_context("UTC"):
+        assert change_timezone("2021-05-11T23:10:00Z") == "2021-05-11T23:10:00+00:00"
+    assert _change_timezone.cache_info()[:2] == (1, 2)
+
+
+def test_change_timezone_invalid():
+    with user_context("UTC"), pytest.raises(arrow.parser.ParserError):
+        change_timezone("foobar")